@@ -5,8 +5,10 @@ import logging
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 
-from .const import DOMAIN, PLATFORMS
+from .const import CONF_SHARD_SIZE, CONF_SHARDED, DEFAULT_SHARD_SIZE, DOMAIN, PLATFORMS
 from .coordinator import EasylogCloudCoordinator
+from .registry import async_acquire_client, async_release_client
+from .services import async_setup_services
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -15,25 +17,50 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Easylog Cloud from a config entry."""
     hass.data.setdefault(DOMAIN, {})
 
+    username = entry.data["username"]
+    password = entry.data["password"]
     coordinator = EasylogCloudCoordinator(
         hass,
-        username=entry.data["username"],
-        password=entry.data["password"],
+        username=username,
+        password=password,
+        options=entry.options,
+        api_client=async_acquire_client(hass, username, password),
     )
 
-    await coordinator.async_config_entry_first_refresh()
+    try:
+        await coordinator.async_config_entry_first_refresh()
+    except Exception:
+        async_release_client(hass, username)
+        raise
 
     hass.data[DOMAIN][entry.entry_id] = coordinator
 
+    entry.async_on_unload(entry.add_update_listener(async_update_options))
+
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     return True
 
 
+async def async_update_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Apply changed options to the running coordinator."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    if coordinator.sharded != entry.options.get(
+        CONF_SHARDED, False
+    ) or coordinator.shard_size != entry.options.get(
+        CONF_SHARD_SIZE, DEFAULT_SHARD_SIZE
+    ):
+        # The shards are built at setup
+        await hass.config_entries.async_reload(entry.entry_id)
+        return
+    coordinator.apply_options(entry.options)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
         hass.data[DOMAIN].pop(entry.entry_id)
+        async_release_client(hass, entry.data["username"])
     return unload_ok
 
 
@@ -50,4 +77,5 @@ HAEasylogCloudDataUpdateCoordinator = EasylogCloudCoordinator
 async def async_setup(hass: HomeAssistant, config: dict) -> bool:
     """Set up the EasyLog Cloud component."""
     hass.data.setdefault(DOMAIN, {})
+    async_setup_services(hass)
     return True
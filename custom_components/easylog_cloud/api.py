@@ -1,188 +1,769 @@
 """API client for EasyLog Cloud integration (stub)."""
 
+import asyncio
 import datetime
+import json
 import logging
 import re
+import time
 
+import aiohttp
 from bs4 import BeautifulSoup
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.util import dt as dt_util
 import xmltodict
 
+from .concurrency import AimdConcurrency, RequestHedger
+from .const import (
+    CONF_ACCOUNT_BUDGET,
+    CONF_AUTH_TIMEOUT,
+    CONF_CYCLE_TIMEOUT,
+    CONF_DISCOVERY_TIMEOUT,
+    CONF_DISCOVERY_TTL,
+    CONF_FETCH_CONCURRENCY,
+    CONF_HEDGE_REQUESTS,
+    CONF_POLL_INTERVAL,
+    CONF_STATUS_TIMEOUT,
+    CONF_TIME_BUDGETED,
+    CYCLE_BUDGET_SHARE,
+    DEFAULT_AUTH_TIMEOUT,
+    DEFAULT_CYCLE_TIMEOUT,
+    DEFAULT_DISCOVERY_TIMEOUT,
+    DEFAULT_DISCOVERY_TTL,
+    DEFAULT_FETCH_CONCURRENCY,
+    DEFAULT_POLL_INTERVAL,
+    DEFAULT_STATUS_TIMEOUT,
+    RATE_LIMIT_ACCOUNT_BUDGET,
+    SESSION_MAX_AGE,
+)
+from .plan import label_key
+from .quarantine import DeviceQuarantine
+from .ratelimit import RateLimitedError, parse_retry_after
+
 _LOGGER = logging.getLogger(__name__)
 
+_SERVER_ERRORS = range(500, 600)
+
+# Errors of a single status request, which fail only that device
+_DEVICE_ERRORS = (asyncio.TimeoutError, aiohttp.ClientError)
+
+_PASSWORD_FIELD = "ctl00$cph1$password"
+
+# One argument of a devicesArr constructor: a quoted string, whose escaped
+# quotes and commas belong to it, or a bare value up to the next comma
+_JS_ARGUMENT = re.compile(r"\s*('(?:[^'\\]|\\.)*'|(?:[^,\\]|\\.)*?)\s*(,|$)", re.DOTALL)
+_JS_ESCAPE = re.compile(r"\\(.)", re.DOTALL)
+
+
+def _split_js_arguments(text):
+    """Split constructor arguments, keeping quoted commas in their field."""
+    fields = []
+    pos = 0
+    while True:
+        match = _JS_ARGUMENT.match(text, pos)
+        fields.append(match.group(1))
+        if not match.group(2):
+            return fields
+        pos = match.end()
+
+
+def _js_string(field):
+    """Return the value of a quoted argument, unescaped, or a bare one as is."""
+    if len(field) > 1 and field[0] == field[-1] == "'":
+        return _JS_ESCAPE.sub(r"\1", field[1:-1])
+    return field
+
+
+class SessionExpiredError(Exception):
+    """easylogcloud.com answered with its sign-in form, the session is gone."""
+
+    def __init__(self, authenticated_at):
+        super().__init__("EasyLog Cloud session expired")
+        # The login the expired request was sent with
+        self.authenticated_at = authenticated_at
+
 
 class HAEasylogCloudApiClient:
-    def __init__(self, hass, username, password):
+    def __init__(self, hass, username, password, transport=None):
         self._username = username
         self._password = password
-        self._session = async_get_clientsession(hass)
+        # Home Assistant's session, or an offline one from transport.py
+        self._session = transport or async_get_clientsession(hass)
         self._cookies = None
         self.account_name = None
+        self.last_error = None
+        self.discovery_ttl = DEFAULT_DISCOVERY_TTL
+        self.fetch_concurrency = DEFAULT_FETCH_CONCURRENCY
+        self.account_budget = RATE_LIMIT_ACCOUNT_BUDGET
+        self.concurrency = AimdConcurrency(DEFAULT_FETCH_CONCURRENCY)
+        self.hedger = RequestHedger()
+        self.quarantine = DeviceQuarantine()
+        self.cycle_timeout = DEFAULT_CYCLE_TIMEOUT
+        self.poll_interval = DEFAULT_POLL_INTERVAL
+        self.time_budgeted = False
+        # Status requests cancelled by the watchdog, or that timed out or
+        # lost their connection, so far
+        self.cancelled_fetches = 0
+        self.failed_requests = 0
+        # Per cycle filter, the devices its last cycle did not reach
+        self.carry_over = {}
+        self._last_status = {}
+        self._auth_timeout = aiohttp.ClientTimeout(total=DEFAULT_AUTH_TIMEOUT)
+        self._discovery_timeout = aiohttp.ClientTimeout(total=DEFAULT_DISCOVERY_TIMEOUT)
+        self._status_timeout = aiohttp.ClientTimeout(total=DEFAULT_STATUS_TIMEOUT)
+        self._device_list = None
+        self._discovered_at = None
+        self._authenticated_at = None
+        # __VIEWSTATE and __VIEWSTATEGENERATOR of the login form
+        self._form_tokens = None
+        # Shared by every config entry of the account, see registry.py
+        self.result_window = 0
+        self._inflight = {}
+        self._recent = {}
+        # Sign-in and discovery shared by concurrent cycles
+        self._steps = {}
+        # Per-device callbacks of the callers sharing an in-flight cycle
+        self._stream_callbacks = {}
+        # Cross-account device status cache, see registry.DeviceStatusCache
+        self.status_cache = None
+        # Limiter shared by all accounts, see ratelimit.RateLimiter
+        self.rate_limiter = None
+
+    @property
+    def discovered_devices(self):
+        """Return the device list from the last successful discovery."""
+        return self._device_list or []
+
+    @property
+    def session_expires_in(self):
+        """Return the seconds the current login is good for, or None."""
+        if self._authenticated_at is None:
+            return None
+        return self._authenticated_at + SESSION_MAX_AGE - time.monotonic()
 
-    async def async_get_devices_data(self):
+    def apply_options(self, options):
+        """Apply the tuning options of a config entry."""
+        self.discovery_ttl = options.get(CONF_DISCOVERY_TTL, DEFAULT_DISCOVERY_TTL)
+        self.fetch_concurrency = max(
+            1, options.get(CONF_FETCH_CONCURRENCY, DEFAULT_FETCH_CONCURRENCY)
+        )
+        if self.fetch_concurrency != self.concurrency.initial:
+            self.concurrency = AimdConcurrency(self.fetch_concurrency)
+        self.cycle_timeout = options.get(CONF_CYCLE_TIMEOUT, DEFAULT_CYCLE_TIMEOUT)
+        self.poll_interval = options.get(CONF_POLL_INTERVAL, DEFAULT_POLL_INTERVAL)
+        self.time_budgeted = options.get(CONF_TIME_BUDGETED, False)
+        self._auth_timeout = aiohttp.ClientTimeout(
+            total=options.get(CONF_AUTH_TIMEOUT, DEFAULT_AUTH_TIMEOUT)
+        )
+        self._discovery_timeout = aiohttp.ClientTimeout(
+            total=options.get(CONF_DISCOVERY_TIMEOUT, DEFAULT_DISCOVERY_TIMEOUT)
+        )
+        self._status_timeout = aiohttp.ClientTimeout(
+            total=options.get(CONF_STATUS_TIMEOUT, DEFAULT_STATUS_TIMEOUT)
+        )
+        self.hedger.enabled = options.get(CONF_HEDGE_REQUESTS, False)
+        self.account_budget = options.get(
+            CONF_ACCOUNT_BUDGET, RATE_LIMIT_ACCOUNT_BUDGET
+        )
+
+    async def async_get_devices_data(
+        self,
+        skip_devices=None,
+        skip_channels=None,
+        include_devices=None,
+        on_device=None,
+    ):
+        """Fetch a snapshot of every device and its channel readings.
+
+        Devices in ``skip_devices`` (or missing from a non-empty
+        ``include_devices``) are not polled, and channels whose label key is
+        in ``skip_channels[device_id]`` are not converted.
+
+        Concurrent callers asking for the same snapshot share one cycle, and
+        a successful snapshot is reused for ``result_window`` seconds.
+
+        ``on_device`` is called with each device's data as soon as its status
+        is decoded, while the rest of the cycle carries on.
+        """
+        skip_devices = skip_devices or set()
+        skip_channels = skip_channels or {}
+        key = (
+            frozenset(skip_devices),
+            frozenset((dev, frozenset(keys)) for dev, keys in skip_channels.items()),
+            frozenset(include_devices or ()),
+        )
+        recent = self._recent.get(key)
+        if recent and time.monotonic() - recent[0] < self.result_window:
+            self.last_error = None
+            return recent[1]
+        if (task := self._inflight.get(key)) is None:
+            task = asyncio.ensure_future(
+                self._async_poll(key, skip_devices, skip_channels, include_devices)
+            )
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        if on_device is not None:
+            self._stream_callbacks.setdefault(key, []).append(on_device)
         try:
-            await self.authenticate()
-            html = await self.fetch_devices_page()
-            devices_js = self._extract_devices_arr_from_html(html)
-            device_list = self._extract_device_list(devices_js, html)
-            if not device_list:
-                _LOGGER.error(
-                    "No devices found in device_list! devices_js: %s", devices_js
+            # Cycles for other filters may run meanwhile, so each caller gets
+            # the error of its own cycle
+            result, self.last_error = await asyncio.shield(task)
+        finally:
+            if on_device is not None:
+                self._stream_callbacks[key].remove(on_device)
+                if not self._stream_callbacks[key]:
+                    del self._stream_callbacks[key]
+        return result
+
+    async def async_discover_devices(self):
+        """Sign in if needed and return the account's device list."""
+        try:
+            await self._async_ensure_session()
+            return await self._async_discover_devices()
+        except Exception:
+            self._authenticated_at = None
+            raise
+
+    async def async_refresh_devices(self, device_ids, skip_channels=None):
+        """Fetch the current status of only the given devices.
+
+        Quarantine and the shared status cache are bypassed, the caller
+        wants fresh readings now. Unknown devices are ignored.
+        """
+        skip_channels = skip_channels or {}
+        try:
+            await self._async_ensure_session()
+            devices = {d["id"]: d for d in await self._async_discover_devices()}
+        except Exception:
+            self._authenticated_at = None
+            raise
+        results = await asyncio.gather(
+            *(
+                self._async_fetch_device(
+                    devices[device_id], skip_channels.get(device_id, ())
                 )
-            # Now fetch live data for each device
-            live_devices = []
-            for device in device_list:
-                device_id = device["id"]
-                url = f"https://www.easylogcloud.com/devicedata.asmx/currentStatus?index=1&sensorId={device_id}"
-                headers = {"Accept": "application/json"}
-                async with self._session.get(
-                    url, cookies=self._cookies, headers=headers
-                ) as resp:
-                    try:
-                        data = await resp.json()
-                    except Exception:
-                        text = await resp.text()
-                        try:
-                            data = xmltodict.parse(text)
-                        except Exception:
-                            _LOGGER.error(
-                                "API did not return JSON or valid XML. Response text: %s",
-                                text,
-                            )
-                            continue
-                        # Try to extract JSON from inside the XML (common for .NET web services)
-                        # Look for a key like 'string' or similar
-                        if isinstance(data, dict) and "string" in data:
-                            import json
-
-                            try:
-                                data = json.loads(data["string"])
-                            except Exception:
-                                _LOGGER.error(
-                                    "Failed to parse JSON from XML 'string' node: %s",
-                                    data["string"],
-                                )
-                                continue
-                d = data.get("d") or data.get("deviceStatus") or {}
-                if not d:
-                    _LOGGER.error(
-                        "No data returned from API for device %s! Response: %s",
-                        device_id,
-                        data,
-                    )
-                # Build device data structure
-                mac_addr = device.get("MAC Address") or {"value": ""}
-                firmware = device.get("Firmware Version") or {"value": ""}
-                ssid = device.get("SSID") or {"value": ""}
-                wifi_signal = device.get("WiFi Signal") or {"value": ""}
-                # Parse lastCommFormatted to a datetime object if possible
-                last_comm = d.get("lastCommFormatted", "")
-                if isinstance(last_comm, str) and last_comm:
-                    try:
-                        dt = datetime.datetime.strptime(last_comm, "%d/%m/%Y %H:%M:%S")
-                        last_comm_dt = dt_util.as_local(dt)
-                    except Exception:
-                        last_comm_dt = None
+                for device_id in device_ids
+                if device_id in devices
+            )
+        )
+        for device in results:
+            if device is not None:
+                self._last_status[device["id"]] = device
+        return [device for device in results if device is not None]
+
+    async def async_prewarm(self, lead):
+        """Get ready for a cycle that starts in ``lead`` seconds.
+
+        Signs in again if the session would be too old by then, otherwise
+        sends a HEAD request so a pooled connection is open and the cycle
+        goes straight to data requests. Failures are left to the cycle.
+        """
+        try:
+            if (
+                self._authenticated_at is None
+                or time.monotonic() + lead - self._authenticated_at >= SESSION_MAX_AGE
+            ):
+                await self._async_single_flight("login", self.authenticate)
+                return
+            await self._async_throttle()
+            response = await self._session.head(
+                "https://www.easylogcloud.com/", timeout=self._auth_timeout
+            )
+            self._check_throttled(response)
+            response.release()
+        except Exception as e:
+            _LOGGER.debug("Pre-warming the EasyLog Cloud session failed: %s", e)
+
+    async def _async_poll(self, key, skip_devices, skip_channels, include_devices):
+        """Run one polling cycle; return its snapshot and error, if any."""
+        started = time.monotonic()
+        fetches = {}
+        failed_requests = self.failed_requests
+        carry_over = self.carry_over.get(key, ())
+        try:
+            await self._async_ensure_session()
+
+            async def _fetch(device):
+                skipped = skip_channels.get(device["id"], ())
+                if self.status_cache is None:
+                    result = await self._async_fetch_device(device, skipped)
                 else:
-                    last_comm_dt = None
-                device_data = {
-                    "id": device_id,
-                    "name": d.get("sensorName", device["name"]),
-                    "model": device["model"],
-                    "MAC Address": {"value": mac_addr.get("value", ""), "unit": ""},
-                    "Firmware Version": {
-                        "value": d.get("firmwareVersion", firmware.get("value", "")),
-                        "unit": "",
-                    },
-                    "SSID": {"value": ssid.get("value", ""), "unit": ""},
-                    "WiFi Signal": {
-                        "value": d.get("rssi", wifi_signal.get("value", "")),
-                        "unit": None,
-                    },
-                    "Last Updated": {"value": last_comm_dt, "unit": ""},
-                }
-                # Add channels
-                channels = []
-                if "channels" in d:
-                    if (
-                        isinstance(d["channels"], dict)
-                        and "channelDetails" in d["channels"]
-                    ):
-                        details = d["channels"]["channelDetails"]
-                        if isinstance(details, list):
-                            channels = details
-                        else:
-                            channels = [details]
-                    elif isinstance(d["channels"], list):
-                        channels = d["channels"]
-                for channel in channels:
-                    label = channel.get("channelLabel", "")
-                    value = channel.get("reading", "")
-                    unit = channel.get("unit", "")
-                    # Convert to int if possible
-                    try:
-                        value = int(value)
-                    except (ValueError, TypeError):
-                        try:
-                            value = float(value)
-                        except (ValueError, TypeError):
-                            value = None
-                    # Convert invalid values like '--.--' to None
-                    if value in [
-                        "--.--",
-                        "---",
-                        "N/A",
-                        "",
-                    ]:  # pragma: no cover - defensive
-                        value = None
-                    device_data[label] = {"value": value, "unit": unit}
-                # Defensive check: ensure 'Last Updated' is always a datetime or None
-                if not (
-                    device_data["Last Updated"]["value"] is None
-                    or hasattr(device_data["Last Updated"]["value"], "tzinfo")
-                ):
-                    device_data["Last Updated"][
-                        "value"
-                    ] = None  # pragma: no cover - safety net
-                live_devices.append(device_data)
-            if not live_devices:
+                    result = await self.status_cache.async_fetch(
+                        self,
+                        (device["id"], frozenset(skipped)),
+                        lambda: self._async_fetch_device(device, skipped),
+                    )
+                if result is not None:
+                    for on_device in list(self._stream_callbacks.get(key, ())):
+                        on_device(result)
+                return result
+
+            def _start_fetches(device_list):
+                # Fetch live data for each device, as many at a time as the
+                # adaptive concurrency limit allows
+                targets, _ = self._select_devices(
+                    device_list, skip_devices, include_devices, carry_over
+                )
+                for device in targets:
+                    if device["id"] not in fetches:
+                        fetches[device["id"]] = asyncio.ensure_future(_fetch(device))
+
+            # Devices known from the cached list are fetched while the device
+            # page is downloaded and parsed; new ones join when it is done
+            discovery = asyncio.ensure_future(self._async_discover_devices())
+            _start_fetches(self._device_list or [])
+            device_list = await discovery
+            _start_fetches(device_list)
+            targets, resting = self._select_devices(
+                device_list, skip_devices, include_devices, carry_over
+            )
+            vanished = [
+                fetches.pop(device_id)
+                for device_id in set(fetches) - {d["id"] for d in targets}
+            ]
+            await self._async_cancel(vanished)
+            tasks = [fetches[device["id"]] for device in targets]
+            done, cancelled = await self._async_collect(tasks, started)
+            if cancelled:
+                self.carry_over[key] = [
+                    device["id"]
+                    for device, task in zip(targets, tasks)
+                    if task not in done
+                ]
+            else:
+                self.carry_over.pop(key, None)
+            for device, task in zip(targets, tasks):
+                if task in done and task.result() is not None:
+                    self._last_status[device["id"]] = task.result()
+            # Devices not reached in time keep their last known status
+            results = [
+                task.result() if task in done else self._last_status.get(device["id"])
+                for device, task in zip(targets, tasks)
+            ] + resting
+            live_devices = [device for device in results if device is not None]
+            if not live_devices and targets:
                 _LOGGER.error("No live devices found! device_list: %s", device_list)
+                if not cancelled and self.failed_requests == failed_requests:
+                    # Most likely an expired session, sign in again next cycle
+                    self._authenticated_at = None
             _LOGGER.debug(
                 "API client update complete. Found %d devices with data",
                 len(live_devices),
             )
-            return live_devices
+            now = time.monotonic()
+            self._recent = {
+                other: recent
+                for other, recent in self._recent.items()
+                if now - recent[0] < self.result_window
+            }
+            self._recent[key] = (now, live_devices)
+            return live_devices, None
+        except RateLimitedError as e:
+            # The login is fine, the limiter holds the next requests back
+            _LOGGER.warning("Failed to fetch device data: %s", e)
+            await self._async_cancel(fetches.values())
+            return [], e
         except Exception as e:
             _LOGGER.error("Failed to fetch device data: %s", e)
-            return []
+            self._authenticated_at = None
+            await self._async_cancel(fetches.values())
+            return [], e
+
+    def _select_devices(self, device_list, skip_devices, include_devices, carry_over):
+        """Split the devices to poll into this cycle's targets and resting ones.
+
+        Returns the devices to fetch, those in ``carry_over`` (not reached by
+        the last cycle) first, and the last known status of quarantined
+        devices whose retry is not due yet.
+        """
+        wanted = [
+            device
+            for device in device_list
+            if device["id"] not in skip_devices
+            and (not include_devices or device["id"] in include_devices)
+        ]
+        targets = [d for d in wanted if self.quarantine.is_due(d["id"])]
+        resting = [
+            self._last_status.get(d["id"])
+            for d in wanted
+            if not self.quarantine.is_due(d["id"])
+        ]
+        # Round robin
+        carried = {device_id: i for i, device_id in enumerate(carry_over)}
+        targets.sort(key=lambda device: carried.get(device["id"], len(carried)))
+        return targets, resting
+
+    @staticmethod
+    async def _async_cancel(tasks):
+        """Cancel tasks and wait for them to finish."""
+        tasks = [task for task in tasks if not task.done()]
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.wait(tasks)
+
+    @property
+    def cycle_budget(self):
+        """Return the seconds a polling cycle may take."""
+        if self.time_budgeted:
+            return min(self.cycle_timeout, self.poll_interval * CYCLE_BUDGET_SHARE)
+        return self.cycle_timeout
+
+    async def _async_collect(self, tasks, started):
+        """Wait for the status fetches until the cycle runs out of time.
+
+        Fetches still outstanding when ``cycle_budget`` seconds have passed
+        since ``started`` are cancelled, and so are all outstanding ones when
+        the server answers one with 429. Returns the finished fetches and the
+        number of fetches cut short. Any other error of a fetch fails the
+        cycle.
+        """
+        if not tasks:
+            return set(), 0
+        remaining = self.cycle_budget - (time.monotonic() - started)
+        done, pending = await asyncio.wait(
+            tasks,
+            timeout=max(0, remaining),
+            return_when=asyncio.FIRST_EXCEPTION,
+        )
+        await self._async_cancel(pending)
+        throttled = {
+            task for task in done if isinstance(task.exception(), RateLimitedError)
+        }
+        for task in tasks:
+            if task in done and task not in throttled and task.exception() is not None:
+                raise task.exception()
+        if pending:
+            self.cancelled_fetches += len(pending)
+        if throttled:
+            _LOGGER.warning(
+                "Rate limited by EasyLog Cloud, cancelled %d of %d status requests",
+                len(pending),
+                len(tasks),
+            )
+        elif pending:
+            _LOGGER.warning(
+                "Update cycle ran over %ss, cancelled %d of %d status requests",
+                self.cycle_budget,
+                len(pending),
+                len(tasks),
+            )
+        return done - throttled, len(pending) + len(throttled)
+
+    async def _async_ensure_session(self):
+        """Sign in unless a recent login can be reused."""
+        if (
+            self._authenticated_at is None
+            or time.monotonic() - self._authenticated_at >= SESSION_MAX_AGE
+        ):
+            await self._async_single_flight("login", self.authenticate)
+
+    async def _async_renew_session(self, authenticated_at):
+        """Sign in again after a request made with that login was refused.
+
+        Requests sent before a newer login are not a reason to drop it, they
+        are just repeated with it.
+        """
+        if self._authenticated_at == authenticated_at:
+            self._authenticated_at = None
+        await self._async_ensure_session()
+
+    async def _async_discover_devices(self):
+        """Return the account's device list, scraping it at most once per TTL."""
+        if (
+            self._device_list
+            and time.monotonic() - self._discovered_at < self.discovery_ttl
+        ):
+            return self._device_list
+        return await self._async_single_flight("discovery", self._async_scrape_devices)
+
+    async def _async_scrape_devices(self):
+        html = await self.fetch_devices_page()
+        devices_js = self._extract_devices_arr_from_html(html)
+        device_list = self._extract_device_list(devices_js, html)
+        if not device_list:
+            _LOGGER.error("No devices found in device_list! devices_js: %s", devices_js)
+        self.remember_devices(device_list)
+        return device_list
+
+    async def _async_single_flight(self, step, run):
+        """Run ``run`` once for all cycles that need ``step`` at the same time.
+
+        Cycles for different filters run side by side; without this each of
+        them would sign in or scrape the device page on its own.
+        """
+        if (task := self._steps.get(step)) is None:
+            task = self._steps[step] = asyncio.ensure_future(run())
+            task.add_done_callback(lambda _: self._steps.pop(step, None))
+        return await asyncio.shield(task)
+
+    def remember_devices(self, device_list):
+        """Cache a scraped device list for the discovery TTL."""
+        if device_list:
+            self._device_list = device_list
+            self._discovered_at = time.monotonic()
+
+    async def _async_fetch_device(self, device, skipped_labels=()):
+        """Fetch and decode the live status of one device, or None."""
+        device_id = device["id"]
+        await self._async_throttle()
+        async with self.concurrency:
+            start = time.monotonic()
+            healthy = False
+            try:
+                healthy, data = await self.hedger.async_run(
+                    lambda: self._async_request_status(device_id),
+                    lambda: self._async_request_status(device_id, throttle=True),
+                )
+            except _DEVICE_ERRORS as e:
+                _LOGGER.warning("Status request for device %s failed: %r", device_id, e)
+                self.failed_requests += 1
+                data = None
+            finally:
+                self.concurrency.record(time.monotonic() - start, healthy)
+        if data is None or not healthy:
+            self.quarantine.record(device_id, False)
+            return None
+        d = data.get("d") or data.get("deviceStatus") or {}
+        if not d:
+            # Quarantined devices are expected to come back empty
+            _LOGGER.log(
+                (
+                    logging.DEBUG
+                    if device_id in self.quarantine.quarantined
+                    else logging.ERROR
+                ),
+                "No data returned from API for device %s! Response: %s",
+                device_id,
+                data,
+            )
+        # Build device data structure
+        mac_addr = device.get("MAC Address") or {"value": ""}
+        firmware = device.get("Firmware Version") or {"value": ""}
+        ssid = device.get("SSID") or {"value": ""}
+        wifi_signal = device.get("WiFi Signal") or {"value": ""}
+        # Parse lastCommFormatted to a datetime object if possible
+        last_comm = d.get("lastCommFormatted", "")
+        if isinstance(last_comm, str) and last_comm:
+            try:
+                dt = datetime.datetime.strptime(last_comm, "%d/%m/%Y %H:%M:%S")
+                last_comm_dt = dt_util.as_local(dt)
+            except Exception:
+                last_comm_dt = None
+        else:
+            last_comm_dt = None
+        device_data = {
+            "id": device_id,
+            "name": d.get("sensorName", device["name"]),
+            "model": device["model"],
+            "MAC Address": {"value": mac_addr.get("value", ""), "unit": ""},
+            "Firmware Version": {
+                "value": d.get("firmwareVersion", firmware.get("value", "")),
+                "unit": "",
+            },
+            "SSID": {"value": ssid.get("value", ""), "unit": ""},
+            "WiFi Signal": {
+                "value": d.get("rssi", wifi_signal.get("value", "")),
+                "unit": None,
+            },
+            "Last Updated": {"value": last_comm_dt, "unit": ""},
+        }
+        device_data.update(self._parse_channels(d, skipped_labels))
+        # Defensive check: ensure 'Last Updated' is always a datetime or None
+        if not (
+            device_data["Last Updated"]["value"] is None
+            or hasattr(device_data["Last Updated"]["value"], "tzinfo")
+        ):
+            device_data["Last Updated"]["value"] = None  # pragma: no cover - safety net
+        self.quarantine.record(device_id, bool(d), device_data["Last Updated"]["value"])
+        return device_data
+
+    async def _async_request_status(self, device_id, throttle=False):
+        """Request a device's currentStatus; return (server healthy, data).
+
+        When the server has dropped the session, signs in again and repeats
+        the request once.
+        """
+        if throttle:
+            await self._async_throttle()
+        try:
+            return await self._async_get_status(device_id)
+        except SessionExpiredError as e:
+            await self._async_renew_session(e.authenticated_at)
+        await self._async_throttle()
+        return await self._async_get_status(device_id)
+
+    async def _async_get_status(self, device_id):
+        authenticated_at = self._authenticated_at
+        url = f"https://www.easylogcloud.com/devicedata.asmx/currentStatus?index=1&sensorId={device_id}"
+        headers = {"Accept": "application/json"}
+        async with self._session.get(
+            url, cookies=self._cookies, headers=headers, timeout=self._status_timeout
+        ) as resp:
+            self._check_throttled(resp)
+            healthy = resp.status not in _SERVER_ERRORS
+            try:
+                data = await resp.json()
+            except Exception:
+                text = await resp.text()
+                if _PASSWORD_FIELD in text:
+                    raise SessionExpiredError(authenticated_at)
+                data = self._parse_status_xml(text)
+        return healthy, data
+
+    @staticmethod
+    def _parse_status_xml(text):
+        """Decode a currentStatus answered as XML, or return None."""
+        try:
+            data = xmltodict.parse(text)
+        except Exception:
+            _LOGGER.error(
+                "API did not return JSON or valid XML. Response text: %s",
+                text,
+            )
+            return None
+        # Try to extract JSON from inside the XML (common for .NET web services)
+        # Look for a key like 'string' or similar
+        if isinstance(data, dict) and "string" in data:
+            try:
+                data = json.loads(data["string"])
+            except Exception:
+                _LOGGER.error(
+                    "Failed to parse JSON from XML 'string' node: %s",
+                    data["string"],
+                )
+                return None
+        return data
+
+    @staticmethod
+    def _parse_channels(d, skipped_labels=()):
+        """Coerce the channel readings of a currentStatus to numbers."""
+        parsed = {}
+        channels = []
+        if "channels" in d:
+            if isinstance(d["channels"], dict) and "channelDetails" in d["channels"]:
+                details = d["channels"]["channelDetails"]
+                if isinstance(details, list):
+                    channels = details
+                else:
+                    channels = [details]
+            elif isinstance(d["channels"], list):
+                channels = d["channels"]
+        for channel in channels:
+            label = channel.get("channelLabel", "")
+            if skipped_labels and label_key(label) in skipped_labels:
+                continue
+            value = channel.get("reading", "")
+            unit = channel.get("unit", "")
+            # Convert to int if possible
+            try:
+                value = int(value)
+            except (ValueError, TypeError):
+                try:
+                    value = float(value)
+                except (ValueError, TypeError):
+                    value = None
+            # Convert invalid values like '--.--' to None
+            if value in [
+                "--.--",
+                "---",
+                "N/A",
+                "",
+            ]:  # pragma: no cover - defensive
+                value = None
+            parsed[label] = {"value": value, "unit": unit}
+        return parsed
+
+    async def _async_throttle(self):
+        """Wait for the shared rate limiter before sending a request."""
+        if self.rate_limiter is not None:
+            await self.rate_limiter.async_acquire(
+                self._username.strip().lower(), budget=self.account_budget
+            )
+
+    def _check_throttled(self, resp):
+        """Raise and pause all traffic when the server answers 429."""
+        if resp.status != 429:
+            return
+        retry_after = parse_retry_after(resp.headers.get("Retry-After"))
+        if self.rate_limiter is not None:
+            self.rate_limiter.pause(retry_after)
+        raise RateLimitedError(retry_after)
 
     async def authenticate(self):
         login_url = "https://www.easylogcloud.com/"
-        response = await self._session.get(login_url)
+        if self._form_tokens is not None:
+            # The form tokens rarely change, try them before fetching the page
+            post_resp = await self._async_post_login(login_url, self._form_tokens)
+            if not await self._async_login_rejected(post_resp):
+                self._accept_login(post_resp)
+                return
+            _LOGGER.debug("Cached login form tokens were rejected, fetching new ones")
+            self._form_tokens = None
+
+        await self._async_throttle()
+        response = await self._session.get(login_url, timeout=self._auth_timeout)
+        self._check_throttled(response)
         html = await response.text()
         soup = BeautifulSoup(html, "html.parser")
 
         viewstate = soup.find("input", {"name": "__VIEWSTATE"})["value"]
         viewstategen = soup.find("input", {"name": "__VIEWSTATEGENERATOR"})["value"]
-
-        payload = {
+        self._form_tokens = {
             "__VIEWSTATE": viewstate,
             "__VIEWSTATEGENERATOR": viewstategen,
+        }
+        self._accept_login(await self._async_post_login(login_url, self._form_tokens))
+
+    async def _async_post_login(self, login_url, form_tokens):
+        payload = {
+            **form_tokens,
             "ctl00$cph1$username1": self._username,
-            "ctl00$cph1$password": self._password,
+            _PASSWORD_FIELD: self._password,
             "ctl00$cph1$rememberme": "on",
             "ctl00$cph1$signin": "Sign In",
         }
+        await self._async_throttle()
+        post_resp = await self._session.post(
+            login_url, data=payload, timeout=self._auth_timeout
+        )
+        self._check_throttled(post_resp)
+        return post_resp
 
-        post_resp = await self._session.post(login_url, data=payload)
+    @staticmethod
+    async def _async_login_rejected(post_resp):
+        """Return True when the server refused the posted form tokens.
+
+        Stale tokens fail ASP.NET's view state validation with an error
+        status, or come back as the sign-in form again.
+        """
+        if post_resp.status in range(400, 600):
+            return True
+        return _PASSWORD_FIELD in await post_resp.text()
+
+    def _accept_login(self, post_resp):
         self._cookies = post_resp.cookies
+        self._authenticated_at = time.monotonic()
         _LOGGER.debug("Login status: %s", post_resp.status)
 
     async def fetch_devices_page(self):
+        try:
+            return await self._async_get_devices_page()
+        except SessionExpiredError as e:
+            await self._async_renew_session(e.authenticated_at)
+        return await self._async_get_devices_page()
+
+    async def _async_get_devices_page(self):
         url = "https://www.easylogcloud.com/devices.aspx"
-        response = await self._session.get(url, cookies=self._cookies)
+        authenticated_at = self._authenticated_at
+        await self._async_throttle()
+        response = await self._session.get(
+            url, cookies=self._cookies, timeout=self._discovery_timeout
+        )
+        self._check_throttled(response)
         html = await response.text()
+        if _PASSWORD_FIELD in html:
+            raise SessionExpiredError(authenticated_at)
         return html
 
     def _extract_devices_arr_from_html(self, html: str) -> str:
@@ -204,7 +785,7 @@ class HAEasylogCloudApiClient:
             # _LOGGER.error("Device block: %s", block)
             # Now parse block as before
             parts = re.split(r",\s*\[new Channel", block, maxsplit=1)
-            device_fields = re.split(r"(?<!\\),", parts[0], maxsplit=50)
+            device_fields = _split_js_arguments(parts[0])
             # Check for required indexes before using them
             required_indexes = [0, 2, 4, 5, 16, 17, 28, 34]
             if len(device_fields) < max(required_indexes) + 1:
@@ -213,19 +794,17 @@ class HAEasylogCloudApiClient:
                 )  # pragma: no cover - defensive log
                 continue  # pragma: no cover - defensive
             try:
-                device_id = int(device_fields[0].strip())
-                model = device_fields[2].strip("' ")
-                name = device_fields[4].strip("' ")
-                mac = device_fields[5].strip("' ") if len(device_fields) > 5 else ""
+                device_id = int(device_fields[0])
+                model = _js_string(device_fields[2])
+                name = _js_string(device_fields[4])
+                mac = _js_string(device_fields[5]) if len(device_fields) > 5 else ""
                 firmware = (
-                    device_fields[16].strip("' ") if len(device_fields) > 16 else ""
-                )
-                ssid = device_fields[17].strip("' ") if len(device_fields) > 17 else ""
-                wifi_signal = (
-                    device_fields[28].strip() if len(device_fields) > 28 else ""
+                    _js_string(device_fields[16]) if len(device_fields) > 16 else ""
                 )
+                ssid = _js_string(device_fields[17]) if len(device_fields) > 17 else ""
+                wifi_signal = device_fields[28] if len(device_fields) > 28 else ""
                 last_sync_raw = (
-                    device_fields[34].strip("' ") if len(device_fields) > 34 else ""
+                    _js_string(device_fields[34]) if len(device_fields) > 34 else ""
                 )
                 try:
                     dt = datetime.datetime.strptime(last_sync_raw, "%d/%m/%Y %H:%M:%S")
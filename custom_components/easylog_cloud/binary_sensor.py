@@ -1,72 +1,59 @@
 from __future__ import annotations
 
-from homeassistant.components.binary_sensor import (
-    BinarySensorDeviceClass,
-    BinarySensorEntity,
-)
+from homeassistant.components.binary_sensor import BinarySensorEntity
+from homeassistant.core import callback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN
+from .const import BINARY_SENSOR, DOMAIN
+from .labels import get_label_metadata, to_binary_state
+from .plan import unique_id
 
 
 async def async_setup_entry(hass, entry, async_add_entities):
     coordinator = hass.data[DOMAIN][entry.entry_id]
-    entities = []
 
-    for device in coordinator.data:
-        for label, data in device.items():
-            if label in {"id", "name", "model"}:
-                continue
-            if isinstance(data, dict) and "value" in data:
-                if _is_binary(data):
-                    entities.append(
-                        EasylogCloudBinarySensor(coordinator, device, label, data)
-                    )
+    @callback
+    def _add_entities(planned):
+        async_add_entities(
+            [
+                EasylogCloudBinarySensor(
+                    coordinator.coordinator_for(device["id"]), device, label, data
+                )
+                for device, label, data in planned
+            ]
+        )
 
-    async_add_entities(entities)
-
-
-def _is_binary(data: dict) -> bool:
-    try:
-        val = data.get("value")
-        if isinstance(val, str):
-            return val.lower() in {"true", "false", "on", "off", "1", "0"}
-        if isinstance(val, (int, float)):
-            return val in {0, 1}
-    except Exception:
-        pass
-    return False
+    entry.async_on_unload(
+        coordinator.async_register_platform(BINARY_SENSOR, _add_entities)
+    )
 
 
 class EasylogCloudBinarySensor(CoordinatorEntity, BinarySensorEntity):
     def __init__(self, coordinator, device, label, data):
         super().__init__(coordinator)
         self.device = device
+        self.device_id = device["id"]
         self.label = label
         self._attr_name = f"{device['name']} {label}"
-        self._attr_unique_id = f"{device['id']}_{label.lower().replace(' ', '_')}"
-        self._attr_device_class = self._guess_device_class(label)
-
-    def _guess_device_class(self, label):
-        label = label.lower()
-        if "motion" in label:
-            return BinarySensorDeviceClass.MOTION
-        if "contact" in label or "door" in label:
-            return BinarySensorDeviceClass.DOOR
-        if "window" in label:
-            return BinarySensorDeviceClass.WINDOW
-        if "battery" in label:
-            return BinarySensorDeviceClass.BATTERY
-        if "power" in label:
-            return BinarySensorDeviceClass.POWER
-        return None
+        self._attr_unique_id = unique_id(device["id"], label)
+        self._attr_device_class = get_label_metadata(label).binary_device_class
+        self._convert = to_binary_state
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        # Streamed updates of this device only, see async_update_device
+        self.async_on_remove(
+            self.coordinator.async_add_device_listener(
+                self.device_id, self._handle_coordinator_update
+            )
+        )
 
     @property
     def is_on(self):
-        val = self.device.get(self.label, {}).get("value")
-        if isinstance(val, str):
-            return val.lower() in {"true", "on", "1"}
-        return bool(val)
+        # Always look up the latest device data from the coordinator
+        index = self.coordinator.device_index(self.device_id)
+        device = {} if index is None else self.coordinator.data[index]
+        return self._convert(device.get(self.label, {}).get("value"))
 
     @property
     def device_info(self):
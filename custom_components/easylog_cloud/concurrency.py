@@ -0,0 +1,169 @@
+"""Adaptive concurrency and hedging for EasyLog Cloud status requests."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from collections.abc import Awaitable, Callable
+import heapq
+import itertools
+import logging
+import time
+from typing import TypeVar
+
+from .const import (
+    AIMD_LATENCY_SPIKE,
+    AIMD_MAX_CONCURRENCY,
+    HEDGE_MAX_RATIO,
+    HEDGE_MIN_SAMPLES,
+    HEDGE_PERCENTILE,
+    HEDGE_WINDOW,
+)
+from .ratelimit import request_priority
+
+_T = TypeVar("_T")
+
+_LOGGER = logging.getLogger(__name__)
+
+# Weight of the newest sample in the latency moving average
+_EWMA_ALPHA = 0.2
+
+
+class AimdConcurrency:
+    """Additive-increase / multiplicative-decrease limit on parallel requests.
+
+    Every healthy response grows the limit by ``1 / limit`` (about one slot
+    per round of requests). A failure or a response slower than
+    ``AIMD_LATENCY_SPIKE`` times the average latency halves it, at most
+    once per average latency so one bad burst counts as a single signal.
+
+    Waiting requests hold a future in a heap, ordered by the lane of
+    ``request_priority`` and then by arrival, so a refresh asked for by the
+    user goes ahead of queued background polls. Only as many of them are
+    woken as there are free slots.
+    """
+
+    def __init__(self, initial: int, maximum: int = AIMD_MAX_CONCURRENCY) -> None:
+        self.initial = initial
+        self.maximum = max(1, maximum, initial)
+        self._limit = float(min(max(1, initial), self.maximum))
+        self._in_flight = 0
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+        self._counter = itertools.count()
+        self.latency: float | None = None
+        self._last_decrease = 0.0
+
+    @property
+    def limit(self) -> int:
+        """Return the number of requests currently allowed in parallel."""
+        return int(self._limit)
+
+    async def __aenter__(self) -> AimdConcurrency:
+        if self._waiters or self._in_flight >= self.limit:
+            future = asyncio.get_running_loop().create_future()
+            heapq.heappush(
+                self._waiters,
+                (request_priority.get(), next(self._counter), future),
+            )
+            try:
+                await future
+            except asyncio.CancelledError:
+                if future.done() and not future.cancelled():
+                    # Woken and cancelled at once, the slot is not used
+                    self._release()
+                raise
+        else:
+            self._in_flight += 1
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self._release()
+
+    def _release(self) -> None:
+        self._in_flight -= 1
+        self._wake()
+
+    def _wake(self) -> None:
+        """Hand the free slots to the first waiting requests."""
+        while self._waiters and self._in_flight < self.limit:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                self._in_flight += 1
+                future.set_result(None)
+
+    def record(self, latency: float, healthy: bool) -> None:
+        """Adjust the limit after a request finished."""
+        spike = self.latency is not None and latency > self.latency * AIMD_LATENCY_SPIKE
+        if healthy and not spike:
+            self._limit = min(self.maximum, self._limit + 1 / self._limit)
+        else:
+            now = time.monotonic()
+            if now - self._last_decrease >= (self.latency or 0):
+                self._last_decrease = now
+                self._limit = max(1.0, self._limit / 2)
+                _LOGGER.debug(
+                    "Status fetch concurrency lowered to %d (%s, %.2fs)",
+                    self.limit,
+                    "slow" if healthy else "failed",
+                    latency,
+                )
+        if healthy:
+            self.latency = (
+                latency
+                if self.latency is None
+                else self.latency + _EWMA_ALPHA * (latency - self.latency)
+            )
+        self._wake()
+
+
+class RequestHedger:
+    """Send a second request when the first one is slower than usual.
+
+    The hedge fires once a request has run longer than ``HEDGE_PERCENTILE``
+    of the recent latencies, and whichever request answers first wins. At
+    most ``HEDGE_MAX_RATIO`` of the recent requests are hedged.
+    """
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.hedges = 0
+        self._latencies: deque[float] = deque(maxlen=HEDGE_WINDOW)
+        self._hedged: deque[bool] = deque(maxlen=HEDGE_WINDOW)
+
+    def delay(self) -> float | None:
+        """Return after how many seconds to hedge, or None to not hedge."""
+        if not self.enabled or len(self._latencies) < HEDGE_MIN_SAMPLES:
+            return None
+        if sum(self._hedged) >= HEDGE_MAX_RATIO * len(self._hedged):
+            return None
+        ordered = sorted(self._latencies)
+        return ordered[min(len(ordered) - 1, len(ordered) * HEDGE_PERCENTILE // 100)]
+
+    async def async_run(
+        self,
+        request: Callable[[], Awaitable[_T]],
+        hedge: Callable[[], Awaitable[_T]],
+    ) -> _T:
+        """Run ``request``, racing it against ``hedge`` if it is slow."""
+        start = time.monotonic()
+        delay = self.delay()
+        tasks = {asyncio.ensure_future(request())}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            self._hedged.append(not done)
+            if not done:
+                self.hedges += 1
+                _LOGGER.debug("Hedging status request after %.2fs", delay)
+                tasks.add(asyncio.ensure_future(hedge()))
+            while True:
+                done, tasks = await asyncio.wait(
+                    tasks, return_when=asyncio.FIRST_COMPLETED
+                )
+                winner = next((t for t in done if t.exception() is None), None)
+                if winner is not None or not tasks:
+                    result = (winner or done.pop()).result()
+                    self._latencies.append(time.monotonic() - start)
+                    return result
+        finally:
+            for task in tasks:
+                task.cancel()
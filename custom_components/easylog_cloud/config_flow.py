@@ -3,12 +3,46 @@ from __future__ import annotations
 import logging
 
 from homeassistant import config_entries
+from homeassistant.core import callback
+import homeassistant.helpers.config_validation as cv
 import voluptuous as vol
 
 from .api import (  # noqa: E402  (import after top-level for tests)
     HAEasylogCloudApiClient,
 )
-from .const import CONF_PASSWORD, CONF_USERNAME, DOMAIN
+from .const import (
+    CONF_ACCOUNT_BUDGET,
+    CONF_AUTH_TIMEOUT,
+    CONF_CYCLE_TIMEOUT,
+    CONF_DISCOVERY_TIMEOUT,
+    CONF_DISCOVERY_TTL,
+    CONF_FETCH_CONCURRENCY,
+    CONF_HEDGE_REQUESTS,
+    CONF_INCLUDE_DEVICES,
+    CONF_MAX_BACKOFF,
+    CONF_PASSWORD,
+    CONF_POLL_INTERVAL,
+    CONF_REFRESH_COOLDOWN,
+    CONF_SHARD_SIZE,
+    CONF_SHARDED,
+    CONF_STATUS_TIMEOUT,
+    CONF_STREAM_UPDATES,
+    CONF_TIME_BUDGETED,
+    CONF_USERNAME,
+    DATA_VALIDATED_CLIENTS,
+    DEFAULT_AUTH_TIMEOUT,
+    DEFAULT_CYCLE_TIMEOUT,
+    DEFAULT_DISCOVERY_TIMEOUT,
+    DEFAULT_DISCOVERY_TTL,
+    DEFAULT_FETCH_CONCURRENCY,
+    DEFAULT_MAX_BACKOFF,
+    DEFAULT_POLL_INTERVAL,
+    DEFAULT_SHARD_SIZE,
+    DEFAULT_STATUS_TIMEOUT,
+    DOMAIN,
+    RATE_LIMIT_ACCOUNT_BUDGET,
+    REFRESH_COOLDOWN,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -18,6 +52,12 @@ class EasylogCloudConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
     def __init__(self):
         self._errors = {}
+        self._api_client = None
+
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry):
+        return EasylogCloudOptionsFlow(config_entry)
 
     async def async_step_user(self, user_input=None):
         self._errors = {}
@@ -27,6 +67,10 @@ class EasylogCloudConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 user_input[CONF_USERNAME], user_input[CONF_PASSWORD]
             )
             if valid:
+                # Hand the signed-in client to the entry so setup skips a login
+                self.hass.data.setdefault(DATA_VALIDATED_CLIENTS, {})[
+                    user_input[CONF_USERNAME]
+                ] = self._api_client
                 return self.async_create_entry(
                     title=name or user_input[CONF_USERNAME],  # fallback to email
                     data=user_input,
@@ -56,7 +100,9 @@ class EasylogCloudConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             await api_client.authenticate()
             html = await api_client.fetch_devices_page()
             devices_js = api_client._extract_devices_arr_from_html(html)
-            api_client._extract_device_list(devices_js, html)
+            device_list = api_client._extract_device_list(devices_js, html)
+            api_client.remember_devices(device_list)
+            self._api_client = api_client
 
             if api_client.account_name:
                 return True, api_client.account_name
@@ -64,3 +110,73 @@ class EasylogCloudConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         except Exception as e:
             _LOGGER.error("Credential test failed: %s", e)
             return False, None
+
+
+class EasylogCloudOptionsFlow(config_entries.OptionsFlow):
+    """Performance tuning options.
+
+    All options apply without a reload, except the sharding options which
+    reload the entry to rebuild its coordinators.
+    """
+
+    def __init__(self, config_entry):
+        self.config_entry = config_entry
+
+    async def async_step_init(self, user_input=None):
+        if user_input is not None:
+            return self.async_create_entry(title="", data=user_input)
+
+        options = self.config_entry.options
+        include = [str(d) for d in options.get(CONF_INCLUDE_DEVICES, [])]
+        devices = {device_id: f"Device {device_id}" for device_id in include}
+        coordinator = self.hass.data.get(DOMAIN, {}).get(self.config_entry.entry_id)
+        if coordinator is not None:
+            for device in coordinator.api_client.discovered_devices:
+                devices[str(device["id"])] = device["name"]
+
+        def _seconds(key, default, minimum):
+            return {
+                vol.Required(key, default=options.get(key, default)): vol.All(
+                    vol.Coerce(int), vol.Range(min=minimum)
+                )
+            }
+
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    **_seconds(CONF_POLL_INTERVAL, DEFAULT_POLL_INTERVAL, 10),
+                    **_seconds(CONF_DISCOVERY_TTL, DEFAULT_DISCOVERY_TTL, 0),
+                    **_seconds(CONF_FETCH_CONCURRENCY, DEFAULT_FETCH_CONCURRENCY, 1),
+                    **_seconds(CONF_AUTH_TIMEOUT, DEFAULT_AUTH_TIMEOUT, 1),
+                    **_seconds(CONF_DISCOVERY_TIMEOUT, DEFAULT_DISCOVERY_TIMEOUT, 1),
+                    **_seconds(CONF_STATUS_TIMEOUT, DEFAULT_STATUS_TIMEOUT, 1),
+                    **_seconds(CONF_CYCLE_TIMEOUT, DEFAULT_CYCLE_TIMEOUT, 5),
+                    **_seconds(CONF_MAX_BACKOFF, DEFAULT_MAX_BACKOFF, 10),
+                    **_seconds(CONF_ACCOUNT_BUDGET, RATE_LIMIT_ACCOUNT_BUDGET, 0),
+                    **_seconds(CONF_REFRESH_COOLDOWN, REFRESH_COOLDOWN, 0),
+                    vol.Required(
+                        CONF_TIME_BUDGETED,
+                        default=options.get(CONF_TIME_BUDGETED, False),
+                    ): bool,
+                    vol.Required(
+                        CONF_HEDGE_REQUESTS,
+                        default=options.get(CONF_HEDGE_REQUESTS, False),
+                    ): bool,
+                    vol.Required(
+                        CONF_STREAM_UPDATES,
+                        default=options.get(CONF_STREAM_UPDATES, False),
+                    ): bool,
+                    vol.Required(
+                        CONF_SHARDED, default=options.get(CONF_SHARDED, False)
+                    ): bool,
+                    vol.Required(
+                        CONF_SHARD_SIZE,
+                        default=options.get(CONF_SHARD_SIZE, DEFAULT_SHARD_SIZE),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+                    vol.Optional(CONF_INCLUDE_DEVICES, default=include): (
+                        cv.multi_select(devices)
+                    ),
+                }
+            ),
+        )
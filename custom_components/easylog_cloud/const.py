@@ -1,9 +1,82 @@
 DOMAIN = "easylog_cloud"
 CONF_USERNAME = "username"
 CONF_PASSWORD = "password"
-PLATFORMS = ["sensor"]
 STARTUP_MESSAGE = "Starting EasyLog Cloud integration"
 BINARY_SENSOR = "binary_sensor"
 SENSOR = "sensor"
 SWITCH = "switch"
+PLATFORMS = [SENSOR, BINARY_SENSOR]
 DEFAULT_NAME = "easylog_cloud"
+# Consecutive device lists a device may be missing from before it is removed
+DEVICE_RETIRE_AFTER = 3
+# Seconds a login is reused before the client signs in again
+SESSION_MAX_AGE = 300
+# hass.data key holding clients validated by the config flow, by username
+DATA_VALIDATED_CLIENTS = f"{DOMAIN}_validated_clients"
+# hass.data key holding the API client shared by all entries of an account
+DATA_CLIENTS = f"{DOMAIN}_clients"
+# hass.data key holding the device status cache shared by all accounts
+DATA_DEVICE_STATUS = f"{DOMAIN}_device_status"
+# hass.data key holding the rate limiter shared by all accounts
+DATA_RATE_LIMITER = f"{DOMAIN}_rate_limiter"
+# Requests per second (and burst) to easylogcloud.com across all accounts
+RATE_LIMIT_PER_SECOND = 10
+RATE_LIMIT_BURST = 20
+# Requests per minute a single account may make by default, 0 for no limit
+RATE_LIMIT_ACCOUNT_BUDGET = 300
+# Seconds to back off after a 429 without a usable Retry-After header
+DEFAULT_RETRY_AFTER = 60
+# Ceiling of the adaptive status fetch concurrency
+AIMD_MAX_CONCURRENCY = 16
+# A response this many times slower than average counts as congestion
+AIMD_LATENCY_SPIKE = 3
+# Hedged status requests: percentile of recent latencies that triggers a
+# hedge, share of requests that may be hedged, samples kept and needed
+HEDGE_PERCENTILE = 95
+HEDGE_MAX_RATIO = 0.1
+HEDGE_WINDOW = 200
+HEDGE_MIN_SAMPLES = 20
+# Share of the poll interval a time-budgeted cycle may use
+CYCLE_BUDGET_SHARE = 0.8
+# Consecutive failed or empty status responses before a device is quarantined
+QUARANTINE_AFTER = 3
+# Seconds since its last communication after which a device counts as offline
+QUARANTINE_OFFLINE_AFTER = 86400
+# Seconds between status requests for a quarantined device
+QUARANTINE_INTERVAL = 900
+# Seconds an account's snapshot is reused by its other config entries
+SHARED_RESULT_WINDOW = 30
+# Seconds within which manual refresh requests are collapsed into one, by default
+REFRESH_COOLDOWN = 10
+# Seconds before a scheduled poll to sign in again or open a connection
+PREWARM_LEAD = 5
+
+# Services
+SERVICE_REFRESH_DEVICE = "refresh_device"
+
+# Options (performance tuning)
+CONF_POLL_INTERVAL = "poll_interval"
+CONF_DISCOVERY_TTL = "discovery_ttl"
+CONF_FETCH_CONCURRENCY = "fetch_concurrency"
+CONF_AUTH_TIMEOUT = "auth_timeout"
+CONF_DISCOVERY_TIMEOUT = "discovery_timeout"
+CONF_STATUS_TIMEOUT = "status_timeout"
+CONF_CYCLE_TIMEOUT = "cycle_timeout"
+CONF_TIME_BUDGETED = "time_budgeted"
+CONF_MAX_BACKOFF = "max_backoff"
+CONF_INCLUDE_DEVICES = "include_devices"
+CONF_HEDGE_REQUESTS = "hedge_requests"
+CONF_SHARDED = "sharded"
+CONF_STREAM_UPDATES = "stream_updates"
+CONF_SHARD_SIZE = "shard_size"
+CONF_ACCOUNT_BUDGET = "account_budget"
+CONF_REFRESH_COOLDOWN = "refresh_cooldown"
+DEFAULT_POLL_INTERVAL = 60
+DEFAULT_DISCOVERY_TTL = 900
+DEFAULT_FETCH_CONCURRENCY = 4
+DEFAULT_AUTH_TIMEOUT = 30
+DEFAULT_DISCOVERY_TIMEOUT = 30
+DEFAULT_STATUS_TIMEOUT = 15
+DEFAULT_CYCLE_TIMEOUT = 45
+DEFAULT_MAX_BACKOFF = 900
+DEFAULT_SHARD_SIZE = 1
@@ -1,31 +1,542 @@
 from __future__ import annotations
 
-from datetime import timedelta
+import asyncio
+from collections.abc import Callable, Mapping
+from datetime import datetime, timedelta
 import logging
+from typing import Any
 
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr, entity_registry as er
+from homeassistant.helpers.debounce import Debouncer
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
 from .api import HAEasylogCloudApiClient
-from .const import DOMAIN
+from .const import (
+    CONF_DISCOVERY_TTL,
+    CONF_INCLUDE_DEVICES,
+    CONF_MAX_BACKOFF,
+    CONF_POLL_INTERVAL,
+    CONF_REFRESH_COOLDOWN,
+    CONF_SHARD_SIZE,
+    CONF_SHARDED,
+    CONF_STREAM_UPDATES,
+    DEFAULT_DISCOVERY_TTL,
+    DEFAULT_MAX_BACKOFF,
+    DEFAULT_POLL_INTERVAL,
+    DEFAULT_SHARD_SIZE,
+    DEVICE_RETIRE_AFTER,
+    DOMAIN,
+    PREWARM_LEAD,
+    REFRESH_COOLDOWN,
+    SESSION_MAX_AGE,
+)
+from .plan import EntityPlan, PlannedEntity, build_entity_plan, parse_unique_id
+from .ratelimit import PRIORITY_BACKGROUND, request_priority
 
 _LOGGER = logging.getLogger(__name__)
 
 
-class EasylogCloudCoordinator(DataUpdateCoordinator):
-    def __init__(self, hass: HomeAssistant, username: str, password: str) -> None:
+class _RefreshDebouncer(Debouncer):
+    """Collapse manual refresh requests into one cycle per cooldown.
+
+    A request runs at once when the coordinator is idle. While a cycle is
+    in flight, requests wait for the end of the cooldown and are folded
+    into a single cycle there, instead of queueing one right behind it.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, cooldown: float, busy: Callable[[], bool]
+    ) -> None:
+        super().__init__(hass, _LOGGER, cooldown=cooldown, immediate=True)
+        self._busy = busy
+
+    async def async_call(self) -> None:
+        self.immediate = not self._busy()
+        await super().async_call()
+
+
+class _DeviceListCoordinator(DataUpdateCoordinator):
+    """Coordinator whose data is a list of devices.
+
+    Devices are indexed by id, and entities may listen to a single device,
+    so one device's fresh status can be published without the others.
+    Subclasses return the snapshot from ``_async_update_devices``.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        name: str,
+        update_interval: timedelta,
+        refresh_cooldown: float = REFRESH_COOLDOWN,
+    ) -> None:
+        self.updating = False
+        self.refresh_debouncer = _RefreshDebouncer(
+            hass, refresh_cooldown, lambda: self.updating
+        )
         super().__init__(
             hass,
             _LOGGER,
-            name=DOMAIN,
-            update_interval=timedelta(minutes=1),
+            name=name,
+            update_interval=update_interval,
+            request_refresh_debouncer=self.refresh_debouncer,
+        )
+        self._device_listeners: dict[int, list[CALLBACK_TYPE]] = {}
+        self._index: dict[int, int] = {}
+        self._index_source: list[dict[str, Any]] | None = None
+
+    def device_index(self, device_id: int) -> int | None:
+        """Return the position of a device in the snapshot, or None."""
+        if self._index_source is not self.data:
+            self._index = {device["id"]: i for i, device in enumerate(self.data or [])}
+            self._index_source = self.data
+        return self._index.get(device_id)
+
+    @callback
+    def async_add_device_listener(
+        self, device_id: int, update_callback: CALLBACK_TYPE
+    ) -> CALLBACK_TYPE:
+        """Listen for the updates of a single device."""
+        listeners = self._device_listeners.setdefault(device_id, [])
+        listeners.append(update_callback)
+
+        @callback
+        def _remove() -> None:
+            listeners.remove(update_callback)
+            if not listeners:
+                del self._device_listeners[device_id]
+
+        return _remove
+
+    @callback
+    def async_update_device(self, device: dict[str, Any]) -> None:
+        """Replace a known device's status and notify only its listeners."""
+        if (index := self.device_index(device["id"])) is None:
+            return
+        self.data[index] = device
+        for update_callback in list(self._device_listeners.get(device["id"], ())):
+            update_callback()
+
+    async def _async_update_data(self) -> list[dict[str, Any]]:
+        self.updating = True
+        try:
+            return await self._async_update_devices()
+        finally:
+            self.updating = False
+
+
+class EasylogCloudCoordinator(_DeviceListCoordinator):
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        username: str,
+        password: str,
+        options: Mapping[str, Any] | None = None,
+        api_client: HAEasylogCloudApiClient | None = None,
+    ) -> None:
+        super().__init__(
+            hass, name=DOMAIN, update_interval=timedelta(seconds=DEFAULT_POLL_INTERVAL)
         )
-        self.api_client = HAEasylogCloudApiClient(hass, username, password)
+        self.api_client = api_client or HAEasylogCloudApiClient(
+            hass, username, password
+        )
+        options = options or {}
+        # Sharded mode: this coordinator only discovers devices and merges
+        # the snapshots of per-group shard coordinators that poll them
+        self.sharded: bool = options.get(CONF_SHARDED, False)
+        self.shard_size: int = max(1, options.get(CONF_SHARD_SIZE, DEFAULT_SHARD_SIZE))
+        self.shards: list[EasylogCloudShardCoordinator] = []
+        self._shard_of: dict[int, EasylogCloudShardCoordinator] = {}
+        self.include_devices: set[int] = set()
+        self.stream_updates = False
+        self._poll_interval = timedelta(seconds=DEFAULT_POLL_INTERVAL)
+        self.shard_interval = self._poll_interval
+        self._max_backoff = timedelta(seconds=DEFAULT_MAX_BACKOFF)
+        self._failures = 0
+        self.apply_options(options)
         self._cookies = None
         self.account_name = None
+        self._entity_plan: EntityPlan | None = None
+        self._entity_plan_source = None
+        self._platform_callbacks: dict[str, Callable[[list[PlannedEntity]], None]] = {}
+        self._known_entities: set[tuple[str, int, str]] = set()
+        self._device_misses: dict[int, int] = {}
+        self._checked_discovery: list[dict[str, Any]] | None = None
+        self._unsub_entity_sync: CALLBACK_TYPE | None = None
+        self._unsub_prewarm: CALLBACK_TYPE | None = None
+        self._unsub_session_renewal: CALLBACK_TYPE | None = None
+        # Devices/channels whose entities are all disabled are not polled
+        self.skip_devices: set[int] = set()
+        self.skip_channels: dict[int, set[str]] = {}
+        if self.config_entry is not None:
+            self.config_entry.async_on_unload(
+                hass.bus.async_listen(
+                    er.EVENT_ENTITY_REGISTRY_UPDATED, self._async_update_poll_filter
+                )
+            )
+            self._async_update_poll_filter()
+
+    @callback
+    def apply_options(self, options: Mapping[str, Any]) -> None:
+        """Apply the tuning options of the config entry without a reload."""
+        self._poll_interval = self.shard_interval = timedelta(
+            seconds=options.get(CONF_POLL_INTERVAL, DEFAULT_POLL_INTERVAL)
+        )
+        self.refresh_debouncer.cooldown = options.get(
+            CONF_REFRESH_COOLDOWN, REFRESH_COOLDOWN
+        )
+        if self.sharded:
+            # Shards poll the readings; this coordinator only rediscovers
+            self._poll_interval = max(
+                self.shard_interval,
+                timedelta(
+                    seconds=options.get(CONF_DISCOVERY_TTL, DEFAULT_DISCOVERY_TTL)
+                ),
+            )
+            for shard in self.shards:
+                shard.update_interval = self.shard_interval
+                shard.refresh_debouncer.cooldown = self.refresh_debouncer.cooldown
+        self._max_backoff = timedelta(
+            seconds=options.get(CONF_MAX_BACKOFF, DEFAULT_MAX_BACKOFF)
+        )
+        self.include_devices = {
+            int(device_id) for device_id in options.get(CONF_INCLUDE_DEVICES, [])
+        }
+        self.stream_updates = options.get(CONF_STREAM_UPDATES, False)
+        self.update_interval = self._backoff_interval()
+        self.api_client.apply_options(options)
+
+    def _backoff_interval(self) -> timedelta:
+        """Return the poll interval stretched by the current failure streak."""
+        if not self._failures:
+            return self._poll_interval
+        return min(
+            self._poll_interval * 2**self._failures,
+            max(self._max_backoff, self._poll_interval),
+        )
+
+    @property
+    def entity_plan(self) -> EntityPlan:
+        """Return the entity plan for the current snapshot, building it once."""
+        if self._entity_plan is None or self._entity_plan_source is not self.data:
+            self._entity_plan = build_entity_plan(self.data)
+            self._entity_plan_source = self.data
+        return self._entity_plan
+
+    @callback
+    def async_register_platform(
+        self, platform: str, add_entities: Callable[[list[PlannedEntity]], None]
+    ) -> CALLBACK_TYPE:
+        """Feed a platform the planned entities it has not created yet.
+
+        ``add_entities`` is called immediately for the current snapshot and
+        then after every refresh, but only with entities that are new.
+        """
+        self._platform_callbacks[platform] = add_entities
+        if self._unsub_entity_sync is None:
+            self._unsub_entity_sync = self.async_add_listener(self._async_sync_entities)
+        for device_id in self.entity_plan.devices:
+            self._device_misses.setdefault(device_id, 0)
+        self._async_add_new_entities(platform)
+
+        @callback
+        def _unregister() -> None:
+            self._platform_callbacks.pop(platform, None)
+            if not self._platform_callbacks and self._unsub_entity_sync:
+                self._unsub_entity_sync()
+                self._unsub_entity_sync = None
+
+        return _unregister
+
+    @callback
+    def _async_add_new_entities(self, platform: str) -> None:
+        new = []
+        for planned in getattr(self.entity_plan, platform):
+            key = (platform, planned.device["id"], planned.label)
+            if key not in self._known_entities:
+                self._known_entities.add(key)
+                new.append(planned)
+        if new:
+            _LOGGER.debug("Adding %d new %s entities", len(new), platform)
+            self._platform_callbacks[platform](new)
+
+    @callback
+    def _async_sync_entities(self) -> None:
+        """Add entities for new devices/labels and retire removed devices."""
+        plan = self.entity_plan
+        if plan.devices:
+            # A failed or empty cycle says nothing about which devices exist
+            for platform in list(self._platform_callbacks):
+                self._async_add_new_entities(platform)
+            for device_id in plan.devices:
+                self._device_misses.setdefault(device_id, 0)
+        self._async_retire_removed_devices()
+
+    @callback
+    def _async_retire_removed_devices(self) -> None:
+        """Retire devices the account's device list no longer contains.
+
+        Only the discovered device list counts: devices filtered out by the
+        options, skipped by the watchdog or quarantine, or whose status could
+        not be read are still on the account. Each new list is checked once.
+        """
+        discovered = self.api_client.discovered_devices
+        if not discovered or discovered is self._checked_discovery:
+            return
+        self._checked_discovery = discovered
+        present = {device["id"] for device in discovered}
+        for device_id in list(self._device_misses):
+            if device_id in present:
+                self._device_misses[device_id] = 0
+                continue
+            self._device_misses[device_id] += 1
+            if self._device_misses[device_id] >= DEVICE_RETIRE_AFTER:
+                self._async_retire_device(device_id)
+
+    @callback
+    def _async_retire_device(self, device_id: int) -> None:
+        """Forget a device that has been removed from the account."""
+        _LOGGER.info("Device %s is no longer on the account, removing it", device_id)
+        del self._device_misses[device_id]
+        self._known_entities = {
+            key for key in self._known_entities if key[1] != device_id
+        }
+        if self.config_entry is None:
+            return
+        dev_reg = dr.async_get(self.hass)
+        if device := dev_reg.async_get_device({(DOMAIN, device_id)}):
+            dev_reg.async_update_device(
+                device.id, remove_config_entry_id=self.config_entry.entry_id
+            )
 
-    async def _async_update_data(self):
-        return await self.api_client.async_get_devices_data()
+    @callback
+    def _async_update_poll_filter(self, event: Event | None = None) -> None:
+        """Recompute which devices and channels have no enabled entities."""
+        if (
+            event is not None
+            and event.data["action"] == "update"
+            and "disabled_by" not in event.data.get("changes", {})
+        ):
+            return
+        enabled: dict[int, set[str]] = {}
+        disabled: dict[int, set[str]] = {}
+        for entry in er.async_entries_for_config_entry(
+            er.async_get(self.hass), self.config_entry.entry_id
+        ):
+            if (parsed := parse_unique_id(entry.unique_id)) is None:
+                continue
+            device_id, key = parsed
+            target = disabled if entry.disabled_by else enabled
+            target.setdefault(device_id, set()).add(key)
+        self.skip_devices = set(disabled) - set(enabled)
+        # A sensor and a binary sensor of the same label share their key, a
+        # channel is only skipped when neither of them is enabled
+        self.skip_channels = {
+            device_id: keys - enabled[device_id]
+            for device_id, keys in disabled.items()
+            if device_id in enabled and keys - enabled[device_id]
+        }
+        _LOGGER.debug(
+            "Skipping %d devices and channels on %d devices with disabled entities",
+            len(self.skip_devices),
+            len(self.skip_channels),
+        )
+
+    async def _handle_refresh_interval(self, _now: datetime) -> None:
+        """Run scheduled polls in the background lane of the rate limiter."""
+        token = request_priority.set(PRIORITY_BACKGROUND)
+        try:
+            await super()._handle_refresh_interval(_now)
+        finally:
+            request_priority.reset(token)
+
+    @callback
+    def _schedule_refresh(self) -> None:
+        """Schedule the next poll, and the pre-warm shortly before it.
+
+        Shards are not pre-warmed; the login they share is renewed on its
+        own schedule, see ``_schedule_session_renewal``.
+        """
+        super()._schedule_refresh()
+        self._schedule_session_renewal()
+        self._cancel_prewarm()
+        if self._unsub_refresh is None or self.update_interval <= timedelta(
+            seconds=PREWARM_LEAD * 2
+        ):
+            return
+        self._unsub_prewarm = async_call_later(
+            self.hass,
+            self.update_interval.total_seconds() - PREWARM_LEAD,
+            self._async_prewarm,
+        )
+
+    @callback
+    def _unschedule_refresh(self) -> None:
+        super()._unschedule_refresh()
+        self._cancel_prewarm()
+        self._cancel_session_renewal()
+
+    @callback
+    def _cancel_prewarm(self) -> None:
+        if self._unsub_prewarm is not None:
+            self._unsub_prewarm()
+            self._unsub_prewarm = None
+
+    async def _async_prewarm(self, _now: datetime) -> None:
+        self._cancel_prewarm()
+        token = request_priority.set(PRIORITY_BACKGROUND)
+        try:
+            await self.api_client.async_prewarm(PREWARM_LEAD)
+        finally:
+            request_priority.reset(token)
+
+    @callback
+    def _schedule_session_renewal(self) -> None:
+        """Sign in again shortly before the account's login expires.
+
+        Timed from the last login, whichever poll made it, so shard polls
+        never have to sign in first. Accounts polled less often than once
+        per session sign in ahead of each poll of this coordinator instead.
+        """
+        self._cancel_session_renewal()
+        expires_in = self.api_client.session_expires_in
+        if (
+            expires_in is None
+            or expires_in <= PREWARM_LEAD
+            or self.shard_interval.total_seconds() >= SESSION_MAX_AGE
+        ):
+            return
+        self._unsub_session_renewal = async_call_later(
+            self.hass, expires_in - PREWARM_LEAD, self._async_renew_session
+        )
+
+    @callback
+    def _cancel_session_renewal(self) -> None:
+        if self._unsub_session_renewal is not None:
+            self._unsub_session_renewal()
+            self._unsub_session_renewal = None
+
+    async def _async_renew_session(self, _now: datetime) -> None:
+        # A shard poll may have scheduled the next one meanwhile
+        self._cancel_session_renewal()
+        token = request_priority.set(PRIORITY_BACKGROUND)
+        try:
+            await self.api_client.async_prewarm(PREWARM_LEAD)
+        finally:
+            request_priority.reset(token)
+        self._schedule_session_renewal()
+
+    @callback
+    def coordinator_for(self, device_id: int) -> _DeviceListCoordinator:
+        """Return the coordinator whose updates carry a device's readings."""
+        return self._shard_of.get(device_id, self)
+
+    @callback
+    def _async_device_updated(self, device: dict[str, Any]) -> None:
+        """Publish one device's fresh status before its cycle completes.
+
+        Only the entities of that device are notified. New devices wait for
+        the end of the cycle, when entities for them are created.
+        """
+        self.coordinator_for(device["id"]).async_update_device(device)
+
+    async def async_refresh_devices(self, device_ids: set[int]) -> None:
+        """Fetch only the given devices now and merge them into the snapshot."""
+        for device in await self.api_client.async_refresh_devices(
+            device_ids, self.skip_channels
+        ):
+            self._async_device_updated(device)
+
+    @property
+    def _on_device(self) -> Callable[[dict[str, Any]], None] | None:
+        return self._async_device_updated if self.stream_updates else None
+
+    async def _async_update_shards(self) -> list[dict[str, Any]]:
+        """Discover devices, adjust the shards and merge their snapshots."""
+        try:
+            devices = await self.api_client.async_discover_devices()
+        except Exception as err:
+            raise UpdateFailed(
+                f"Error discovering EasyLog Cloud devices: {err}"
+            ) from err
+        device_ids = [
+            device["id"]
+            for device in devices
+            if not self.include_devices or device["id"] in self.include_devices
+        ]
+        for device_id in set(self._shard_of) - set(device_ids):
+            shard = self._shard_of.pop(device_id)
+            shard.device_ids.remove(device_id)
+            if not shard.device_ids:
+                self.shards.remove(shard)
+                await shard.async_shutdown()
+        new_shards = []
+        for device_id in device_ids:
+            if device_id in self._shard_of:
+                continue
+            # Fill the newest shard first so existing groups stay stable
+            if not new_shards or len(new_shards[-1].device_ids) >= self.shard_size:
+                shard = EasylogCloudShardCoordinator(self)
+                self.shards.append(shard)
+                new_shards.append(shard)
+            new_shards[-1].device_ids.append(device_id)
+            self._shard_of[device_id] = new_shards[-1]
+        await asyncio.gather(*(shard.async_refresh() for shard in new_shards))
+        return self._merge_shards()
+
+    def _merge_shards(self) -> list[dict[str, Any]]:
+        return [device for shard in self.shards for device in shard.data or []]
+
+    @callback
+    def _async_shard_updated(self, shard: EasylogCloudShardCoordinator) -> None:
+        """Replace a shard's devices in the merged snapshot, in place.
+
+        The shard's entities listen to the shard itself. Devices it gained
+        or lost are merged at the next discovery, which is also when
+        entities are added or retired.
+        """
+        for device in shard.data or []:
+            if (index := self.device_index(device["id"])) is not None:
+                self.data[index] = device
+        # The shard may have signed in again
+        self._schedule_session_renewal()
+
+    async def async_shutdown(self) -> None:
+        """Stop this coordinator and its shards."""
+        self._cancel_prewarm()
+        self._cancel_session_renewal()
+        await super().async_shutdown()
+        for shard in self.shards:
+            await shard.async_shutdown()
+
+    async def _async_update_devices(self) -> list[dict[str, Any]]:
+        try:
+            if self.sharded:
+                data = await self._async_update_shards()
+            else:
+                data = await self._async_poll_devices()
+        except Exception:
+            self._failures += 1
+            self.update_interval = self._backoff_interval()
+            raise
+        self._failures = 0
+        self.update_interval = self._poll_interval
+        return data
+
+    async def _async_poll_devices(self) -> list[dict[str, Any]]:
+        data = await self.api_client.async_get_devices_data(
+            skip_devices=self.skip_devices,
+            skip_channels=self.skip_channels,
+            include_devices=self.include_devices,
+            on_device=self._on_device,
+        )
+        if self.api_client.last_error is not None:
+            raise UpdateFailed(
+                f"Error communicating with EasyLog Cloud: {self.api_client.last_error}"
+            )
+        return data
 
     async def authenticate(self):
         """Authenticate using the API client."""
@@ -45,3 +556,48 @@ class EasylogCloudCoordinator(DataUpdateCoordinator):
         devices = self.api_client._extract_device_list(devices_js, html)
         self.account_name = self.api_client.account_name
         return devices
+
+
+class EasylogCloudShardCoordinator(_DeviceListCoordinator):
+    """Polls one group of devices in sharded mode.
+
+    Each shard has its own interval and failure state, so a slow or failing
+    device only delays the entities of its own group. Shards share the
+    account's API client, and with it the session and rate limits.
+    """
+
+    def __init__(self, parent: EasylogCloudCoordinator) -> None:
+        super().__init__(
+            parent.hass,
+            name=f"{DOMAIN} shard",
+            update_interval=parent.shard_interval,
+            refresh_cooldown=parent.refresh_debouncer.cooldown,
+        )
+        self.parent = parent
+        self.device_ids: list[int] = []
+        # Also keeps the refresh timer of the shard running
+        self.async_add_listener(lambda: parent._async_shard_updated(self))
+
+    async def _handle_refresh_interval(self, _now: datetime) -> None:
+        """Run scheduled polls in the background lane of the rate limiter."""
+        token = request_priority.set(PRIORITY_BACKGROUND)
+        try:
+            await super()._handle_refresh_interval(_now)
+        finally:
+            request_priority.reset(token)
+
+    async def _async_update_devices(self) -> list[dict[str, Any]]:
+        device_ids = set(self.device_ids) - self.parent.skip_devices
+        if not device_ids:
+            return []
+        api_client = self.parent.api_client
+        data = await api_client.async_get_devices_data(
+            skip_channels=self.parent.skip_channels,
+            include_devices=device_ids,
+            on_device=self.parent._on_device,
+        )
+        if api_client.last_error is not None:
+            raise UpdateFailed(
+                f"Error communicating with EasyLog Cloud: {api_client.last_error}"
+            )
+        return data
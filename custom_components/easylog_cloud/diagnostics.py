@@ -0,0 +1,47 @@
+"""Diagnostics support for EasyLog Cloud."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import CONF_PASSWORD, CONF_USERNAME, DOMAIN
+
+TO_REDACT = {CONF_USERNAME, CONF_PASSWORD}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    api_client = coordinator.api_client
+    return {
+        "entry": {
+            "data": async_redact_data(dict(entry.data), TO_REDACT),
+            "options": dict(entry.options),
+        },
+        "polling": {
+            "update_interval": coordinator.update_interval.total_seconds(),
+            "last_update_success": coordinator.last_update_success,
+            "devices": len(coordinator.data or []),
+            "discovered_devices": len(api_client.discovered_devices),
+            "skipped_devices": sorted(coordinator.skip_devices),
+            "quarantined_devices": sorted(api_client.quarantine.quarantined),
+            "shards": len(coordinator.shards),
+        },
+        "status_fetch": {
+            "concurrency": api_client.concurrency.limit,
+            "max_concurrency": api_client.concurrency.maximum,
+            "average_latency": api_client.concurrency.latency,
+            "hedging": api_client.hedger.enabled,
+            "hedge_delay": api_client.hedger.delay(),
+            "hedged_requests": api_client.hedger.hedges,
+            "cancelled_by_watchdog": api_client.cancelled_fetches,
+            "cycle_budget": api_client.cycle_budget,
+            "carried_over": sum(map(len, api_client.carry_over.values())),
+        },
+    }
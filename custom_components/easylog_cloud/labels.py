@@ -0,0 +1,172 @@
+"""Label metadata registry for EasyLog Cloud entities."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from functools import lru_cache
+import logging
+from typing import Any
+
+from homeassistant.components.binary_sensor import BinarySensorDeviceClass
+from homeassistant.components.sensor import SensorDeviceClass, SensorStateClass
+from homeassistant.helpers.entity import EntityCategory
+
+_LOGGER = logging.getLogger(__name__)
+
+# Ordered (keywords, device class) rules; the first matching rule wins
+_SENSOR_DEVICE_CLASSES = (
+    (("temp",), SensorDeviceClass.TEMPERATURE),
+    (("humidity",), SensorDeviceClass.HUMIDITY),
+    (("co2", "carbon dioxide"), SensorDeviceClass.CO2),
+    (("pressure",), SensorDeviceClass.PRESSURE),
+    (("signal",), SensorDeviceClass.SIGNAL_STRENGTH),
+    (("last updated",), SensorDeviceClass.TIMESTAMP),
+)
+
+_BINARY_DEVICE_CLASSES = (
+    (("motion",), BinarySensorDeviceClass.MOTION),
+    (("contact", "door"), BinarySensorDeviceClass.DOOR),
+    (("window",), BinarySensorDeviceClass.WINDOW),
+    (("battery",), BinarySensorDeviceClass.BATTERY),
+    (("power",), BinarySensorDeviceClass.POWER),
+)
+
+# Binary device classes of labels that name an on/off state. Battery and
+# power are left out, those labels usually carry a level or a measurement
+_BINARY_STATE_CLASSES = frozenset(
+    {
+        BinarySensorDeviceClass.MOTION,
+        BinarySensorDeviceClass.DOOR,
+        BinarySensorDeviceClass.WINDOW,
+    }
+)
+
+# No standard device class for VOC, particulates, or air quality in HA as of 2024
+_NUMERIC_KEYWORDS = ("voc", "particulate", "pm2.5", "pm10", "air quality", "aqi")
+
+_DIAGNOSTIC_LABELS = frozenset(
+    {"firmware version", "mac address", "ssid", "wi-fi signal", "wifi signal"}
+)
+
+# HA requires a plain % for humidity sensors
+_HUMIDITY_UNIT_ALIASES = {"%RH": "%", "RH%": "%"}
+
+_BINARY_ON = frozenset({"true", "on", "1"})
+_BINARY_STRINGS = frozenset({"true", "false", "on", "off", "1", "0"})
+
+
+def _to_value(value: Any) -> Any:
+    """Pass a reading through, mapping the unknown marker to None."""
+    return None if value == "unknown" else value
+
+
+def _to_float(value: Any) -> float | None:
+    """Coerce a reading to float, or None when it is not numeric."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        if value not in (None, "unknown"):
+            _LOGGER.warning("Value is not numeric: %s", value)
+        return None
+
+
+def _to_timestamp(value: Any) -> datetime | None:
+    """Coerce a reading to an aware datetime, or None."""
+    if isinstance(value, datetime):
+        return value
+    if not isinstance(value, str) or value == "unknown":
+        return None
+    try:
+        dt = datetime.fromisoformat(value)
+    except ValueError:
+        _LOGGER.warning("Failed to parse timestamp value '%s'", value)
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt
+
+
+def is_binary_reading(data: dict) -> bool:
+    """Return True when a reading looks like an on/off value."""
+    try:
+        val = data.get("value")
+        if isinstance(val, str):
+            return val.lower() in _BINARY_STRINGS
+        if isinstance(val, (int, float)):
+            return val in {0, 1}
+    except Exception:
+        pass
+    return False
+
+
+def to_binary_state(value: Any) -> bool:
+    """Coerce a reading to a binary sensor state."""
+    if isinstance(value, str):
+        return value.lower() in _BINARY_ON
+    return bool(value)
+
+
+@dataclass(frozen=True)
+class LabelMetadata:
+    """Everything the platforms need to know about a reading label."""
+
+    device_class: SensorDeviceClass | None = None
+    state_class: SensorStateClass | None = None
+    entity_category: EntityCategory | None = None
+    binary_device_class: BinarySensorDeviceClass | None = None
+    binary_state: bool = False
+    numeric: bool = False
+    has_unit: bool = False
+    unit_aliases: dict[str, str] = field(default_factory=dict)
+    converter: Callable[[Any], Any] = _to_value
+
+    def native_unit(self, raw_unit: str | None) -> str | None:
+        """Return the unit HA should display for a raw EasyLog unit."""
+        if not self.has_unit:
+            return None
+        return self.unit_aliases.get(raw_unit, raw_unit)
+
+
+def _match(label: str, rules):
+    for keywords, device_class in rules:
+        if any(k in label for k in keywords):
+            return device_class
+    return None
+
+
+@lru_cache(maxsize=None)
+def get_label_metadata(label: str) -> LabelMetadata:
+    """Resolve (and cache) the metadata for a reading label."""
+    lowered = label.lower()
+    device_class = _match(lowered, _SENSOR_DEVICE_CLASSES)
+    numeric = any(k in lowered for k in _NUMERIC_KEYWORDS)
+    binary_device_class = _match(lowered, _BINARY_DEVICE_CLASSES)
+
+    if device_class == SensorDeviceClass.TIMESTAMP:
+        converter = _to_timestamp
+    elif numeric:
+        converter = _to_float
+    else:
+        converter = _to_value
+
+    return LabelMetadata(
+        device_class=device_class,
+        state_class=SensorStateClass.MEASUREMENT if numeric else None,
+        entity_category=(
+            EntityCategory.DIAGNOSTIC if lowered in _DIAGNOSTIC_LABELS else None
+        ),
+        binary_device_class=binary_device_class,
+        binary_state=(
+            binary_device_class in _BINARY_STATE_CLASSES
+            and device_class is None
+            and not numeric
+        ),
+        numeric=numeric,
+        has_unit=device_class is not None or numeric,
+        unit_aliases=(
+            _HUMIDITY_UNIT_ALIASES if device_class == SensorDeviceClass.HUMIDITY else {}
+        ),
+        converter=converter,
+    )
@@ -0,0 +1,76 @@
+"""Entity plan shared by all EasyLog Cloud platforms."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, NamedTuple
+
+from .const import BINARY_SENSOR, SENSOR
+from .labels import get_label_metadata
+
+# Keys of a device snapshot that describe the device rather than a reading
+DEVICE_KEYS = frozenset({"id", "name", "model"})
+
+
+class PlannedEntity(NamedTuple):
+    """A single (device, label) pair a platform should expose."""
+
+    device: dict[str, Any]
+    label: str
+    data: Any
+
+
+@dataclass
+class EntityPlan:
+    """Which labels of a snapshot become which kind of entity."""
+
+    sensor: list[PlannedEntity] = field(default_factory=list)
+    binary_sensor: list[PlannedEntity] = field(default_factory=list)
+    # No label is planned as a switch until the API can drive one
+    switch: list[PlannedEntity] = field(default_factory=list)
+    devices: dict[Any, dict[str, Any]] = field(default_factory=dict)
+
+
+def label_key(label: str) -> str:
+    """Return the unique-id suffix used for a reading label."""
+    return label.lower().replace(" ", "_")
+
+
+def unique_id(device_id: Any, label: str) -> str:
+    """Return the entity unique id for a device reading."""
+    return f"{device_id}_{label_key(label)}"
+
+
+def parse_unique_id(value: str) -> tuple[int, str] | None:
+    """Split an entity unique id back into (device id, label key)."""
+    device_id, _, key = value.partition("_")
+    try:
+        return int(device_id), key
+    except ValueError:
+        return None
+
+
+def label_platforms(label: str) -> tuple[str, ...]:
+    """Return the platforms a reading label is exposed on.
+
+    Every label is a sensor; labels naming an on/off state also get a
+    binary sensor. Only the label decides, never its reading, so entities
+    do not move between platforms when a value changes.
+    """
+    if get_label_metadata(label).binary_state:
+        return (SENSOR, BINARY_SENSOR)
+    return (SENSOR,)
+
+
+def build_entity_plan(devices: list[dict[str, Any]] | None) -> EntityPlan:
+    """Walk a coordinator snapshot once and sort every label by platform."""
+    plan = EntityPlan()
+    for device in devices or []:
+        plan.devices[device["id"]] = device
+        for label, data in device.items():
+            if label in DEVICE_KEYS:
+                continue
+            planned = PlannedEntity(device, label, data)
+            for platform in label_platforms(label):
+                getattr(plan, platform).append(planned)
+    return plan
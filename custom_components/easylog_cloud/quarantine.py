@@ -0,0 +1,64 @@
+"""Slow retry lane for failing or long-offline EasyLog Cloud devices."""
+
+from __future__ import annotations
+
+from datetime import datetime
+import logging
+import time
+
+from homeassistant.util import dt as dt_util
+
+from .const import QUARANTINE_AFTER, QUARANTINE_INTERVAL, QUARANTINE_OFFLINE_AFTER
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class DeviceQuarantine:
+    """Track device health and decide which devices to poll this cycle.
+
+    A device is quarantined after ``QUARANTINE_AFTER`` consecutive failed
+    or empty status responses, or as soon as its last communication is
+    older than ``QUARANTINE_OFFLINE_AFTER``. Quarantined devices are only
+    polled every ``QUARANTINE_INTERVAL`` seconds and are released by the
+    first fresh status they report.
+    """
+
+    def __init__(self) -> None:
+        self._failures: dict[int, int] = {}
+        self._retry_at: dict[int, float] = {}
+
+    @property
+    def quarantined(self) -> set[int]:
+        """Return the ids of the quarantined devices."""
+        return set(self._retry_at)
+
+    def is_due(self, device_id: int) -> bool:
+        """Return True when the device should be polled this cycle."""
+        retry_at = self._retry_at.get(device_id)
+        return retry_at is None or time.monotonic() >= retry_at
+
+    def record(
+        self, device_id: int, healthy: bool, last_comm: datetime | None = None
+    ) -> None:
+        """Update a device's health after a status request."""
+        offline = (
+            last_comm is not None
+            and (dt_util.utcnow() - last_comm).total_seconds()
+            > QUARANTINE_OFFLINE_AFTER
+        )
+        if healthy and not offline:
+            self._failures.pop(device_id, None)
+            if self._retry_at.pop(device_id, None) is not None:
+                _LOGGER.info("Device %s reports again, polling it normally", device_id)
+            return
+        failures = self._failures[device_id] = self._failures.get(device_id, 0) + 1
+        if not offline and failures < QUARANTINE_AFTER:
+            return
+        if device_id not in self._retry_at:
+            _LOGGER.warning(
+                "Device %s is %s, polling it every %d seconds until it reports",
+                device_id,
+                "offline" if offline else f"failing ({failures} times in a row)",
+                QUARANTINE_INTERVAL,
+            )
+        self._retry_at[device_id] = time.monotonic() + QUARANTINE_INTERVAL
@@ -0,0 +1,192 @@
+"""Rate limiting for all traffic to easylogcloud.com."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from contextvars import ContextVar
+from email.utils import parsedate_to_datetime
+import heapq
+import itertools
+import logging
+import time
+from typing import NamedTuple
+
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    DEFAULT_RETRY_AFTER,
+    RATE_LIMIT_ACCOUNT_BUDGET,
+    RATE_LIMIT_BURST,
+    RATE_LIMIT_PER_SECOND,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Lanes, lower is served first
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 1
+
+# Lane of the requests made by the current task, see async_acquire
+request_priority: ContextVar[int] = ContextVar(
+    "easylog_cloud_request_priority", default=PRIORITY_INTERACTIVE
+)
+
+_BUDGET_WINDOW = 60.0
+
+
+class RateLimitedError(Exception):
+    """easylogcloud.com answered 429 Too Many Requests."""
+
+    def __init__(self, retry_after: float) -> None:
+        super().__init__(f"Rate limited by EasyLog Cloud, retry in {retry_after:.0f}s")
+        self.retry_after = retry_after
+
+
+def parse_retry_after(value: str | None) -> float:
+    """Return the seconds to wait for a Retry-After header value."""
+    if not value:
+        return DEFAULT_RETRY_AFTER
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return DEFAULT_RETRY_AFTER
+    return max(0.0, (retry_at - dt_util.utcnow()).total_seconds())
+
+
+class RateLimiter:
+    """Token bucket shared by every EasyLog Cloud account.
+
+    Requests wait for a token from the global bucket and must fit within
+    their account's per-minute budget. Waiting requests are served by lane,
+    then in arrival order; an account that is out of budget does not hold
+    up the others.
+
+    Each waiting request holds a future in a heap, and only the head of the
+    heap is looked at when a token comes free. Requests of an account out
+    of budget are parked until its budget window moves on.
+    """
+
+    def __init__(
+        self,
+        rate: float = RATE_LIMIT_PER_SECOND,
+        burst: int = RATE_LIMIT_BURST,
+        account_budget: int = RATE_LIMIT_ACCOUNT_BUDGET,
+    ) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.account_budget = account_budget
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._sent: dict[str, deque[float]] = {}
+        self._queue: list[_Ticket] = []
+        self._parked: dict[str, list[_Ticket]] = {}
+        self._parked_timers: dict[str, asyncio.TimerHandle] = {}
+        self._timer: asyncio.TimerHandle | None = None
+        self._counter = itertools.count()
+
+    def pause(self, seconds: float) -> None:
+        """Hold all requests for ``seconds``, e.g. after a 429 response."""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        _LOGGER.warning("EasyLog Cloud asked to back off for %.0f seconds", seconds)
+        self._dispatch()
+
+    async def async_acquire(
+        self, account: str, priority: int | None = None, budget: int | None = None
+    ) -> None:
+        """Wait until a request for ``account`` may be sent.
+
+        ``budget`` is the account's requests per minute, 0 for no limit;
+        the limiter's ``account_budget`` when not given.
+        """
+        if priority is None:
+            priority = request_priority.get()
+        ticket = _Ticket(
+            priority,
+            next(self._counter),
+            account,
+            self.account_budget if budget is None else budget,
+            asyncio.get_running_loop().create_future(),
+        )
+        heapq.heappush(self._queue, ticket)
+        self._dispatch()
+        try:
+            await ticket.future
+        except asyncio.CancelledError:
+            # Let the next request have the place
+            self._dispatch()
+            raise
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _budget_wait(self, account: str, budget: int, now: float) -> float:
+        sent = self._sent.get(account)
+        if not sent or not budget:
+            return 0.0
+        while sent and now - sent[0] >= _BUDGET_WINDOW:
+            sent.popleft()
+        if len(sent) < budget:
+            return 0.0
+        return sent[0] + _BUDGET_WINDOW - now
+
+    def _dispatch(self) -> None:
+        """Hand out tokens to the head of the queue while there are any."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        now = time.monotonic()
+        self._refill(now)
+        while self._queue:
+            ticket = self._queue[0]
+            if ticket.future.done():
+                heapq.heappop(self._queue)
+                continue
+            if self._paused_until > now:
+                self._schedule(self._paused_until - now)
+                return
+            if (wait := self._budget_wait(ticket.account, ticket.budget, now)) > 0:
+                self._park(heapq.heappop(self._queue), wait)
+                continue
+            if self._tokens < 1:
+                self._schedule((1 - self._tokens) / self.rate)
+                return
+            heapq.heappop(self._queue)
+            self._tokens -= 1
+            self._sent.setdefault(ticket.account, deque()).append(now)
+            ticket.future.set_result(None)
+
+    def _schedule(self, delay: float) -> None:
+        self._timer = asyncio.get_running_loop().call_later(delay, self._dispatch)
+
+    def _park(self, ticket: _Ticket, wait: float) -> None:
+        """Hold a request of an account that is out of budget."""
+        self._parked.setdefault(ticket.account, []).append(ticket)
+        if ticket.account not in self._parked_timers:
+            self._parked_timers[ticket.account] = asyncio.get_running_loop().call_later(
+                wait, self._unpark, ticket.account
+            )
+
+    def _unpark(self, account: str) -> None:
+        """Queue an account's parked requests again once its budget allows."""
+        if timer := self._parked_timers.pop(account, None):
+            timer.cancel()
+        for ticket in self._parked.pop(account, []):
+            heapq.heappush(self._queue, ticket)
+        self._dispatch()
+
+
+class _Ticket(NamedTuple):
+    """A waiting request; ordered by lane, then arrival."""
+
+    priority: int
+    seq: int
+    account: str
+    budget: int
+    future: asyncio.Future
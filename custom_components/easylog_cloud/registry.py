@@ -0,0 +1,142 @@
+"""Reference-counted API clients shared by config entries of one account."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+import logging
+import time
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+
+from .api import HAEasylogCloudApiClient
+from .const import (
+    DATA_CLIENTS,
+    DATA_DEVICE_STATUS,
+    DATA_RATE_LIMITER,
+    DATA_VALIDATED_CLIENTS,
+    SHARED_RESULT_WINDOW,
+)
+from .ratelimit import RateLimiter
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class _SharedClient:
+    client: HAEasylogCloudApiClient
+    refs: int = 0
+
+
+class DeviceStatusCache:
+    """Latest status of every device, shared by all accounts.
+
+    A device visible from several accounts is fetched once: a client reuses
+    a recent status another client fetched, or waits for a fetch already in
+    flight and falls back to its own session when that one fails. A fetch
+    is cancelled once every client waiting for it has been cancelled.
+    """
+
+    def __init__(self, window: float = SHARED_RESULT_WINDOW) -> None:
+        self.window = window
+        self._results: dict[Any, tuple[float, object, dict]] = {}
+        self._inflight: dict[Any, tuple[object, asyncio.Future]] = {}
+        self._waiters: dict[asyncio.Future, int] = {}
+
+    async def async_fetch(
+        self,
+        client: object,
+        key: Any,
+        fetch: Callable[[], Awaitable[dict | None]],
+    ) -> dict | None:
+        """Return the status for ``key``, calling ``fetch`` only if needed."""
+        cached = self._results.get(key)
+        if (
+            cached
+            and cached[1] is not client
+            and time.monotonic() - cached[0] < self.window
+        ):
+            return cached[2]
+        inflight = self._inflight.get(key)
+        if inflight and inflight[0] is not client:
+            try:
+                if (result := await self._async_wait(inflight[1])) is not None:
+                    return result
+            except Exception:
+                pass  # retried with our own session below
+            _LOGGER.debug("Shared fetch of %s failed, retrying with own session", key)
+
+        task = asyncio.ensure_future(fetch())
+        self._inflight[key] = (client, task)
+        task.add_done_callback(lambda _: self._forget(key, task))
+        result = await self._async_wait(task)
+        if result is not None:
+            self._results[key] = (time.monotonic(), client, result)
+        return result
+
+    async def _async_wait(self, task: asyncio.Future) -> dict | None:
+        """Wait for a fetch, cancelling it when its last waiter goes away."""
+        self._waiters[task] = self._waiters.get(task, 0) + 1
+        try:
+            return await asyncio.shield(task)
+        finally:
+            self._waiters[task] -= 1
+            if not self._waiters[task]:
+                del self._waiters[task]
+                task.cancel()
+
+    def _forget(self, key: Any, task: asyncio.Future) -> None:
+        if self._inflight.get(key, (None, None))[1] is task:
+            del self._inflight[key]
+
+
+def _account_key(username: str) -> str:
+    return username.strip().lower()
+
+
+@callback
+def async_acquire_client(
+    hass: HomeAssistant, username: str, password: str
+) -> HAEasylogCloudApiClient:
+    """Return the account's client, creating it for the first subscriber.
+
+    A client validated by the config flow is adopted when the account has
+    no client yet. Every call must be paired with ``async_release_client``.
+    """
+    clients: dict[str, _SharedClient] = hass.data.setdefault(DATA_CLIENTS, {})
+    validated = hass.data.get(DATA_VALIDATED_CLIENTS, {}).pop(username, None)
+    key = _account_key(username)
+    if (shared := clients.get(key)) is None:
+        shared = clients[key] = _SharedClient(
+            validated or HAEasylogCloudApiClient(hass, username, password)
+        )
+        shared.client.status_cache = hass.data.setdefault(
+            DATA_DEVICE_STATUS, DeviceStatusCache()
+        )
+        shared.client.rate_limiter = hass.data.setdefault(
+            DATA_RATE_LIMITER, RateLimiter()
+        )
+    shared.refs += 1
+    # Subscribers poll on their own timers; let them reuse each other's cycles
+    shared.client.result_window = SHARED_RESULT_WINDOW if shared.refs > 1 else 0
+    _LOGGER.debug("EasyLog Cloud account %s has %d subscribers", key, shared.refs)
+    return shared.client
+
+
+@callback
+def async_release_client(hass: HomeAssistant, username: str) -> None:
+    """Drop one subscriber, forgetting the client after the last one."""
+    clients: dict[str, _SharedClient] = hass.data.get(DATA_CLIENTS, {})
+    key = _account_key(username)
+    if (shared := clients.get(key)) is None:
+        return
+    shared.refs -= 1
+    if shared.refs <= 0:
+        del clients[key]
+        if not clients:
+            hass.data.pop(DATA_DEVICE_STATUS, None)
+            hass.data.pop(DATA_RATE_LIMITER, None)
+    elif shared.refs == 1:
+        shared.client.result_window = 0
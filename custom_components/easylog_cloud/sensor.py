@@ -1,39 +1,33 @@
 from __future__ import annotations
 
-from datetime import datetime, timezone
 import logging
 
-from homeassistant.components.sensor import SensorDeviceClass, SensorEntity
-from homeassistant.helpers.entity import EntityCategory
+from homeassistant.components.sensor import SensorEntity
+from homeassistant.core import callback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN
+from .const import DOMAIN, SENSOR
+from .labels import get_label_metadata
+from .plan import unique_id
 
 _LOGGER = logging.getLogger(__name__)
 
 
 async def async_setup_entry(hass, entry, async_add_entities):
     coordinator = hass.data[DOMAIN][entry.entry_id]
-    entities = []
-    _LOGGER.debug("Coordinator data: %s", coordinator.data)
 
-    for device in coordinator.data:
-        _LOGGER.warning(
-            "Available fields for %s: %s", device["name"], list(device.keys())
+    @callback
+    def _add_entities(planned):
+        async_add_entities(
+            [
+                EasylogCloudSensor(
+                    coordinator.coordinator_for(device["id"]), device, label, data
+                )
+                for device, label, data in planned
+            ]
         )
-        for label, data in device.items():
-            if label in ("id", "name", "model"):
-                continue
-            _LOGGER.error(
-                "Adding sensor for device '%s': %s = %s %s",
-                device["name"],
-                label,
-                data.get("value") if isinstance(data, dict) else data,
-                data.get("unit") if isinstance(data, dict) else "",
-            )
-            entities.append(EasylogCloudSensor(coordinator, device, label, data))
 
-    async_add_entities(entities)
+    entry.async_on_unload(coordinator.async_register_platform(SENSOR, _add_entities))
 
 
 class EasylogCloudSensor(CoordinatorEntity, SensorEntity):
@@ -42,69 +36,37 @@ class EasylogCloudSensor(CoordinatorEntity, SensorEntity):
         self.device_id = device["id"]
         self.label = label
         self._attr_name = f"{device['name']} {label}"
-        self._attr_unique_id = f"{device['id']}_{label.lower().replace(' ', '_')}"
-        self._attr_device_class = self._guess_device_class(label)
-        self._attr_state_class = self._guess_state_class(label)
-
-        # Store the last known good value
-        self._last_value = None
-
-        # Fix humidity unit: replace %RH with % (required by HA)
-        raw_unit = data.get("unit") if isinstance(data, dict) else None
-        if self._attr_device_class == SensorDeviceClass.HUMIDITY and raw_unit in (
-            "%RH",
-            "RH%",
-        ):
-            self._attr_native_unit_of_measurement = "%"
-        elif self._attr_device_class or self._is_numeric_sensor(label):
-            self._attr_native_unit_of_measurement = raw_unit
-        else:
-            self._attr_native_unit_of_measurement = None
-
-        if label.lower() in [
-            "firmware version",
-            "mac address",
-            "ssid",
-            "wi-fi signal",
-            "wifi signal",
-        ]:
-            self._attr_entity_category = EntityCategory.DIAGNOSTIC
-
-    def _guess_device_class(self, label: str):
-        label = label.lower()
-        if "temp" in label:
-            return SensorDeviceClass.TEMPERATURE
-        if "humidity" in label:
-            return SensorDeviceClass.HUMIDITY
-        if "co2" in label or "carbon dioxide" in label:
-            return SensorDeviceClass.CO2
-        if "pressure" in label:
-            return SensorDeviceClass.PRESSURE
-        if "signal" in label:
-            return SensorDeviceClass.SIGNAL_STRENGTH
-        if "last updated" in label:
-            return SensorDeviceClass.TIMESTAMP
-        # No standard device class for VOC, particulates, or air quality in HA as of 2024
-        return None
-
-    def _guess_state_class(self, label: str):
-        # For VOC, particulates, air quality, and other numeric sensors, set as measurement
-        if self._is_numeric_sensor(label):
-            return "measurement"
-        # For timestamp, do not set state_class
-        return None
-
-    def _is_numeric_sensor(self, label: str):
-        label = label.lower()
-        keywords = ["voc", "particulate", "pm2.5", "pm10", "air quality", "aqi"]
-        return any(k in label for k in keywords)
+        self._attr_unique_id = unique_id(device["id"], label)
+
+        meta = get_label_metadata(label)
+        self._attr_device_class = meta.device_class
+        self._attr_state_class = meta.state_class
+        self._attr_native_unit_of_measurement = meta.native_unit(
+            data.get("unit") if isinstance(data, dict) else None
+        )
+        if meta.entity_category is not None:
+            self._attr_entity_category = meta.entity_category
+        # Bound once so reading the value never re-classifies the label
+        self._convert = meta.converter
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        # Streamed updates of this device only, see async_update_device
+        self.async_on_remove(
+            self.coordinator.async_add_device_listener(
+                self.device_id, self._handle_coordinator_update
+            )
+        )
+
+    def _device(self):
+        """Return the latest data of the device from the coordinator, or None."""
+        index = self.coordinator.device_index(self.device_id)
+        return None if index is None else self.coordinator.data[index]
 
     @property
     def native_value(self):
         # Always look up the latest device data from the coordinator
-        device = next(
-            (d for d in self.coordinator.data if d["id"] == self.device_id), None
-        )
+        device = self._device()
         if not device or self.label not in device:
             _LOGGER.debug(
                 "Sensor %s.%s: device or label not found in coordinator data",
@@ -114,51 +76,7 @@ class EasylogCloudSensor(CoordinatorEntity, SensorEntity):
             return None
 
         try:
-            value = device[self.label]["value"]
-            _LOGGER.debug(
-                "Sensor %s.%s: fetched value %s", self.device_id, self.label, value
-            )
-
-            # Unknown / missing value -> explicit None
-            if value in (None, "unknown"):
-                return None  # pragma: no cover - explicit missing value
-
-            # Timestamp handling
-            if self._attr_device_class == SensorDeviceClass.TIMESTAMP:
-                if isinstance(value, str):
-                    try:
-                        dt = datetime.fromisoformat(value)
-                        if dt.tzinfo is None:
-                            dt = dt.replace(tzinfo=timezone.utc)
-                        self._last_value = dt
-                        return dt  # pragma: no cover - trivial setter
-                    except Exception:
-                        _LOGGER.warning(
-                            "Failed to parse timestamp value '%s' for %s",
-                            value,
-                            self.label,
-                        )
-                        return None
-                if isinstance(value, datetime):
-                    self._last_value = value  # pragma: no cover - trivial setter
-                    return value  # pragma: no cover - trivial setter
-                return None  # pragma: no cover - unsupported type
-
-            # Numeric sensors should coerce to float or return None
-            if self._is_numeric_sensor(self.label):
-                try:
-                    num_value = float(value)
-                    self._last_value = num_value
-                    return num_value
-                except (TypeError, ValueError):
-                    _LOGGER.warning(
-                        "Value for %s is not numeric: %s", self.label, value
-                    )  # pragma: no cover - defensive log
-                    return None  # pragma: no cover
-
-            # For all other sensors, just store and return the value
-            self._last_value = value
-            return value  # pragma: no cover - passthrough
+            return self._convert(device[self.label]["value"])
         except Exception as e:  # pragma: no cover - defensive
             _LOGGER.warning(
                 "native_value error for %s on %s: %s",
@@ -171,9 +89,7 @@ class EasylogCloudSensor(CoordinatorEntity, SensorEntity):
     @property
     def device_info(self):
         # Get the latest device info from coordinator data
-        device = next(
-            (d for d in self.coordinator.data if d["id"] == self.device_id), None
-        )
+        device = self._device()
         if device:
             return {
                 "identifiers": {
@@ -0,0 +1,109 @@
+"""Services of the EasyLog Cloud integration."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+
+from homeassistant.const import ATTR_DEVICE_ID, ATTR_ENTITY_ID
+from homeassistant.core import HomeAssistant, ServiceCall, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import (
+    config_validation as cv,
+    device_registry as dr,
+    entity_registry as er,
+)
+import voluptuous as vol
+
+from .const import DOMAIN, SERVICE_REFRESH_DEVICE
+from .plan import parse_unique_id
+from .ratelimit import PRIORITY_INTERACTIVE, request_priority
+
+_LOGGER = logging.getLogger(__name__)
+
+REFRESH_DEVICE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_DEVICE_ID, default=[]): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional(ATTR_ENTITY_ID, default=[]): cv.entity_ids,
+    }
+)
+
+
+@callback
+def _resolve_targets(hass: HomeAssistant, call: ServiceCall) -> dict[str, set[int]]:
+    """Map the devices and entities of a call to EasyLog ids per config entry.
+
+    Device ids may be Home Assistant device registry ids or EasyLog device
+    ids; the latter match every entry that discovered the device.
+    """
+    coordinators = hass.data.get(DOMAIN, {})
+    targets: dict[str, set[int]] = {}
+    dev_reg = dr.async_get(hass)
+    for device_id in call.data[ATTR_DEVICE_ID]:
+        if (device := dev_reg.async_get(device_id)) is not None:
+            easylog_ids = {
+                int(ident[1]) for ident in device.identifiers if ident[0] == DOMAIN
+            }
+            for entry_id in device.config_entries & set(coordinators):
+                targets.setdefault(entry_id, set()).update(easylog_ids)
+            continue
+        try:
+            easylog_id = int(device_id)
+        except ValueError:
+            continue
+        for entry_id, coordinator in coordinators.items():
+            if any(
+                known["id"] == easylog_id
+                for known in coordinator.api_client.discovered_devices
+            ):
+                targets.setdefault(entry_id, set()).add(easylog_id)
+
+    ent_reg = er.async_get(hass)
+    for entity_id in call.data[ATTR_ENTITY_ID]:
+        entry = ent_reg.async_get(entity_id)
+        if (
+            entry is None
+            or entry.platform != DOMAIN
+            or entry.config_entry_id not in coordinators
+            or (parsed := parse_unique_id(entry.unique_id)) is None
+        ):
+            continue
+        targets.setdefault(entry.config_entry_id, set()).add(parsed[0])
+    return targets
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the integration's services."""
+
+    async def _async_refresh_device(call: ServiceCall) -> None:
+        targets = _resolve_targets(hass, call)
+        if not targets:
+            raise HomeAssistantError("No EasyLog Cloud device matches the request")
+        # Served ahead of scheduled polls, even when an automation triggered
+        # by a poll made the call
+        token = request_priority.set(PRIORITY_INTERACTIVE)
+        coordinators = hass.data[DOMAIN]
+        _LOGGER.debug("Refreshing devices %s on request", targets)
+        try:
+            results = await asyncio.gather(
+                *(
+                    coordinators[entry_id].async_refresh_devices(device_ids)
+                    for entry_id, device_ids in targets.items()
+                ),
+                return_exceptions=True,
+            )
+        finally:
+            request_priority.reset(token)
+        for result in results:
+            if isinstance(result, Exception):
+                raise HomeAssistantError(
+                    f"Error refreshing EasyLog Cloud devices: {result}"
+                ) from result
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_REFRESH_DEVICE,
+        _async_refresh_device,
+        schema=REFRESH_DEVICE_SCHEMA,
+    )
@@ -1,28 +1,36 @@
 from homeassistant.components.switch import SwitchEntity
+from homeassistant.core import callback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN
+from .const import DOMAIN, SWITCH
+from .plan import unique_id
 
 
 async def async_setup_entry(hass, entry, async_add_entities):
     coordinator = hass.data[DOMAIN][entry.entry_id]
-    entities = []
 
-    for device in coordinator.data:
-        for label, data in device.items():
-            if isinstance(data, dict) and "switch" in label.lower():
-                entities.append(EasylogCloudSwitch(coordinator, device, label, data))
+    @callback
+    def _add_entities(planned):
+        # Not in PLATFORMS and never planned until the API can drive switches
+        async_add_entities(  # pragma: no cover
+            [
+                EasylogCloudSwitch(
+                    coordinator.coordinator_for(device["id"]), device, label, data
+                )
+                for device, label, data in planned
+            ]
+        )
 
-    async_add_entities(entities)
+    entry.async_on_unload(coordinator.async_register_platform(SWITCH, _add_entities))
 
 
 class EasylogCloudSwitch(CoordinatorEntity, SwitchEntity):
     def __init__(self, coordinator, device, label, data):
-        super().__init__(coordinator)
+        super().__init__(coordinator, device["id"])
         self.device = device
         self.label = label
         self._attr_name = f"{device['name']} {label}"
-        self._attr_unique_id = f"{device['id']}_{label.lower().replace(' ', '_')}"
+        self._attr_unique_id = unique_id(device["id"], label)
         self._state = data.get("value", "off") == "on"
 
     @property
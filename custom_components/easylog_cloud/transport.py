@@ -0,0 +1,238 @@
+"""HTTP transports behind the EasyLog Cloud API client.
+
+The client talks to easylogcloud.com through an object with the ``get``,
+``post`` and ``head`` methods of :class:`aiohttp.ClientSession`; the live
+transport is Home Assistant's shared session. The transports here have
+the same interface and let the client run offline or against a stand-in:
+
+- ``SessionTransport`` forwards to an aiohttp session, optionally to
+  another address than the live site, e.g. a local stand-in.
+- ``RecordingTransport`` does the same and keeps every response, to be
+  saved as a cassette.
+- ``ReplayTransport`` answers from a cassette.
+- ``FakeTransport`` answers from a handler, with injected latency.
+"""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+import asyncio
+from collections import deque
+from collections.abc import Callable, Coroutine
+import json
+from pathlib import Path
+from typing import Any
+
+import aiohttp
+
+LIVE_URL = "https://www.easylogcloud.com"
+
+# Stands in for the session cookies in a cassette
+REDACTED = "**REDACTED**"
+
+
+class TransportResponse:
+    """The parts of :class:`aiohttp.ClientResponse` the client reads."""
+
+    def __init__(
+        self,
+        status: int = 200,
+        body: str = "",
+        headers: dict[str, str] | None = None,
+        cookies: dict[str, str] | None = None,
+    ) -> None:
+        self.status = status
+        self.body = body
+        self.headers = headers or {}
+        self.cookies = cookies or {}
+
+    async def text(self) -> str:
+        return self.body
+
+    async def json(self) -> Any:
+        """Decode the body, refusing non-JSON content like aiohttp does."""
+        content_type = self.headers.get("Content-Type", "application/json")
+        if "json" not in content_type:
+            raise ValueError(f"Unexpected content type {content_type}")
+        return json.loads(self.body)
+
+    def release(self) -> None:
+        """Nothing to give back, the body is already read."""
+
+    async def __aenter__(self) -> TransportResponse:
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.release()
+
+
+class _RequestContext:
+    """Awaitable that can also be used with ``async with``, like aiohttp's."""
+
+    def __init__(self, coro: Coroutine[Any, Any, TransportResponse]) -> None:
+        self._coro = coro
+        self._response: TransportResponse | None = None
+
+    def __await__(self):
+        return self._coro.__await__()
+
+    async def __aenter__(self) -> TransportResponse:
+        self._response = await self._coro
+        return self._response
+
+    async def __aexit__(self, *exc_info) -> None:
+        self._response.release()
+
+
+class _Transport(ABC):
+    """Base for the transports; subclasses answer ``_async_request``."""
+
+    def get(self, url: str, **kwargs: Any) -> _RequestContext:
+        return _RequestContext(self._async_request("GET", url, **kwargs))
+
+    def post(self, url: str, **kwargs: Any) -> _RequestContext:
+        return _RequestContext(self._async_request("POST", url, **kwargs))
+
+    def head(self, url: str, **kwargs: Any) -> _RequestContext:
+        return _RequestContext(self._async_request("HEAD", url, **kwargs))
+
+    @abstractmethod
+    async def _async_request(
+        self, method: str, url: str, **kwargs: Any
+    ) -> TransportResponse:
+        """Send a request and return its response."""
+
+
+class SessionTransport(_Transport):
+    """Forward requests to an aiohttp session.
+
+    With ``base_url``, requests for the live site go to that address
+    instead, e.g. a local stand-in of easylogcloud.com.
+    """
+
+    def __init__(
+        self, session: aiohttp.ClientSession, base_url: str | None = None
+    ) -> None:
+        self._session = session
+        self._base_url = base_url
+
+    async def _async_request(
+        self, method: str, url: str, **kwargs: Any
+    ) -> TransportResponse:
+        if self._base_url is not None:
+            url = url.replace(LIVE_URL, self._base_url, 1)
+        async with self._session.request(method, url, **kwargs) as resp:
+            return TransportResponse(
+                resp.status,
+                await resp.text(),
+                dict(resp.headers),
+                {name: morsel.value for name, morsel in resp.cookies.items()},
+            )
+
+
+class RecordingTransport(SessionTransport):
+    """Forward requests to a session and record the responses.
+
+    Interactions are recorded with the live site's URLs, whatever the
+    ``base_url``. Request bodies are not recorded, so the credentials never
+    end up in a cassette. Unless ``redact_cookies`` is False, the values of
+    response cookies and Set-Cookie headers, the .ASPXAUTH login among
+    them, are recorded as ``REDACTED``.
+    """
+
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        redact_cookies: bool = True,
+        base_url: str | None = None,
+    ) -> None:
+        super().__init__(session, base_url)
+        self._redact_cookies = redact_cookies
+        self.interactions: list[dict[str, Any]] = []
+
+    async def _async_request(
+        self, method: str, url: str, **kwargs: Any
+    ) -> TransportResponse:
+        response = await super()._async_request(method, url, **kwargs)
+        headers, cookies = response.headers, response.cookies
+        if self._redact_cookies:
+            headers = {
+                name: REDACTED if name.lower() == "set-cookie" else value
+                for name, value in headers.items()
+            }
+            cookies = dict.fromkeys(cookies, REDACTED)
+        self.interactions.append(
+            {
+                "method": method,
+                "url": url,
+                "status": response.status,
+                "body": response.body,
+                "headers": headers,
+                "cookies": cookies,
+            }
+        )
+        return response
+
+    def save(self, path: str | Path) -> None:
+        """Write the recorded interactions to a cassette file."""
+        Path(path).write_text(json.dumps(self.interactions, indent=1))
+
+
+class ReplayTransport(_Transport):
+    """Answer requests with the responses of a cassette.
+
+    Responses for the same method and URL are replayed in recorded order,
+    and the last one is repeated once they are used up.
+    """
+
+    def __init__(self, interactions: list[dict[str, Any]]) -> None:
+        self._responses: dict[tuple[str, str], deque[dict[str, Any]]] = {}
+        for interaction in interactions:
+            self._responses.setdefault(
+                (interaction["method"], interaction["url"]), deque()
+            ).append(interaction)
+
+    @classmethod
+    def from_file(cls, path: str | Path) -> ReplayTransport:
+        return cls(json.loads(Path(path).read_text()))
+
+    async def _async_request(
+        self, method: str, url: str, **kwargs: Any
+    ) -> TransportResponse:
+        responses = self._responses.get((method, url))
+        if not responses:
+            raise aiohttp.ClientError(f"No recorded response for {method} {url}")
+        recorded = responses.popleft() if len(responses) > 1 else responses[0]
+        return TransportResponse(
+            recorded["status"],
+            recorded["body"],
+            recorded["headers"],
+            recorded["cookies"],
+        )
+
+
+class FakeTransport(_Transport):
+    """Answer requests from a handler after an injected delay.
+
+    ``handler`` gets the method, URL and request keyword arguments and
+    returns the response. ``latency`` is a number of seconds, or a
+    callable taking the method and URL and returning one.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[..., TransportResponse],
+        latency: float | Callable[[str, str], float] = 0.0,
+    ) -> None:
+        self._handler = handler
+        self._latency = latency
+        self.requests: list[tuple[str, str]] = []
+
+    async def _async_request(
+        self, method: str, url: str, **kwargs: Any
+    ) -> TransportResponse:
+        self.requests.append((method, url))
+        delay = self._latency(method, url) if callable(self._latency) else self._latency
+        if delay:
+            await asyncio.sleep(delay)
+        return self._handler(method, url, **kwargs)
@@ -0,0 +1,6 @@
+"""Benchmarks of the EasyLog Cloud parsing pipeline."""
+
+import pytest
+
+# Throughput rows of the benchmarks that ran, for the terminal summary
+THROUGHPUT = pytest.StashKey[list]()
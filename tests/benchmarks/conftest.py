@@ -0,0 +1,17 @@
+"""Reporting of the parsing benchmarks."""
+
+from . import THROUGHPUT
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    """List the throughput of every benchmark that ran."""
+    rows = config.stash.get(THROUGHPUT, [])
+    if not rows:
+        return
+    terminalreporter.write_sep("-", "parsing throughput")
+    for name, devices, devices_per_second, bytes_per_second in rows:
+        terminalreporter.write_line(
+            f"{name:<40} {devices:>6} devices "
+            f"{devices_per_second:>14,.0f} devices/s "
+            f"{bytes_per_second / 1e6:>10,.1f} MB/s"
+        )
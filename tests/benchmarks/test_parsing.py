@@ -0,0 +1,139 @@
+"""Throughput of the devicesArr and currentStatus parsing.
+
+Each stage of the pipeline is measured on its own, on synthetic accounts
+of 10 to 10,000 devices: locating devicesArr in devices.aspx, parsing
+the device list, decoding currentStatus answers the way the client reads
+them off the wire and coercing their channel readings. The benchmarks need pytest-benchmark and only run on
+request::
+
+    pytest tests/benchmarks --benchmark-only --no-cov --benchmark-autosave
+
+Every run is saved under ``.benchmarks`` with the commit it measured;
+``--benchmark-compare`` (or ``pytest-benchmark compare``) sets it against
+earlier runs, so changes to api.py can be compared version to version.
+Devices and bytes per second are listed after the run and kept in the
+``extra_info`` of the saved results.
+"""
+
+import asyncio
+import random
+
+import pytest
+
+from custom_components.easylog_cloud.api import HAEasylogCloudApiClient
+from custom_components.easylog_cloud.transport import FakeTransport, TransportResponse
+
+from . import THROUGHPUT
+from ..synthetic_account import devices_page, generate_devices, status, status_body
+
+pytest.importorskip("pytest_benchmark")
+
+SIZES = [10, 100, 1_000, 10_000]
+
+
+@pytest.fixture(scope="module", autouse=True)
+def _benchmarks_requested(request):
+    if not request.config.getoption("benchmark_only", False):
+        pytest.skip("benchmarks run with --benchmark-only")
+
+
+@pytest.fixture(scope="module", params=SIZES, ids=lambda size: f"{size}-devices")
+def account(request):
+    """Pages and status answers of a synthetic account."""
+    rng = random.Random(request.param)
+    devices = generate_devices(request.param, seed=request.param)
+    statuses = [status(device, rng, invalid_share=0.05) for device in devices]
+    return {
+        "devices": devices,
+        "html": devices_page(devices),
+        "statuses": statuses,
+        "json": [status_body(device_status) for device_status in statuses],
+        "xml": [status_body(device_status, xml=True) for device_status in statuses],
+    }
+
+
+@pytest.fixture
+def api():
+    return HAEasylogCloudApiClient(
+        None, "test_user", "test_pass", FakeTransport(lambda *args, **kwargs: None)
+    )
+
+
+def _throughput(request, benchmark, devices, size):
+    """Record devices and bytes per second of the mean round."""
+    mean = benchmark.stats.stats.mean
+    benchmark.extra_info["devices"] = devices
+    benchmark.extra_info["bytes"] = size
+    benchmark.extra_info["devices_per_second"] = devices / mean
+    benchmark.extra_info["bytes_per_second"] = size / mean
+    request.config.stash.setdefault(THROUGHPUT, []).append(
+        (request.node.name, devices, devices / mean, size / mean)
+    )
+
+
+def _size(texts):
+    return sum(len(text.encode()) for text in texts)
+
+
+def test_extract_devices_arr(benchmark, request, api, account):
+    benchmark.group = "extract_devices_arr"
+    html = account["html"]
+
+    devices_js = benchmark(api._extract_devices_arr_from_html, html)
+
+    assert devices_js
+    _throughput(request, benchmark, len(account["devices"]), _size([html]))
+
+
+def test_extract_device_list(benchmark, request, api, account):
+    benchmark.group = "extract_device_list"
+    html = account["html"]
+    devices_js = api._extract_devices_arr_from_html(html)
+
+    devices = benchmark(api._extract_device_list, devices_js, html)
+
+    assert len(devices) == len(account["devices"])
+    _throughput(request, benchmark, len(devices), _size([devices_js]))
+
+
+@pytest.mark.parametrize("form", ["json", "xml"])
+def test_decode_status(benchmark, request, account, form):
+    benchmark.group = f"decode_status_{form}"
+    bodies = account[form]
+    content_type = "application/json" if form == "json" else "text/xml"
+    responses = {
+        device["id"]: TransportResponse(
+            body=body, headers={"Content-Type": content_type}
+        )
+        for device, body in zip(account["devices"], bodies)
+    }
+    # The client's own status request, answered without a network, so the
+    # JSON decoding and its XML fallback run as they do on live responses
+    api = HAEasylogCloudApiClient(
+        None,
+        "test_user",
+        "test_pass",
+        FakeTransport(lambda method, url, **kwargs: responses[int(url.split("=")[-1])]),
+    )
+
+    async def _decode():
+        return [await api._async_request_status(device_id) for device_id in responses]
+
+    loop = asyncio.new_event_loop()
+    try:
+        decoded = benchmark(lambda: loop.run_until_complete(_decode()))
+    finally:
+        loop.close()
+
+    assert all(data for _, data in decoded)
+    _throughput(request, benchmark, len(bodies), _size(bodies))
+
+
+def test_parse_channels(benchmark, request, api, account):
+    benchmark.group = "parse_channels"
+    statuses = account["statuses"]
+
+    parsed = benchmark(lambda: [api._parse_channels(d) for d in statuses])
+
+    assert len(parsed) == len(statuses)
+    _throughput(request, benchmark, len(statuses), _size(account["json"]))
@@ -0,0 +1,179 @@
+"""Local stand-in for easylogcloud.com, for end-to-end and load tests.
+
+``FakeEasylogServer`` serves the ASP.NET login form, ``devices.aspx`` with
+a generated ``devicesArr`` and ``devicedata.asmx/currentStatus`` in its
+JSON and XML-wrapped forms, on 127.0.0.1. Latency, error rates and the
+session lifetime are configurable per endpoint, and ``transport()`` gives
+the real API client a transport that talks to the stand-in.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import Counter
+import random
+import secrets
+import time
+
+from aiohttp import ClientSession, web
+from aiohttp.test_utils import TestServer
+
+from custom_components.easylog_cloud.transport import SessionTransport
+
+from .synthetic_account import devices_page, generate_devices, status, status_body
+
+LOGIN = "login"
+DEVICES = "devices"
+STATUS = "status"
+
+_AUTH_COOKIE = ".ASPXAUTH"
+
+_LOGIN_FORM = """<html><body><form method="post" action="./">
+<input type="hidden" name="__VIEWSTATE" id="__VIEWSTATE" value="{viewstate}" />
+<input type="hidden" name="__VIEWSTATEGENERATOR" value="{generator}" />
+<input name="ctl00$cph1$username1" type="text" />
+<input name="ctl00$cph1$password" type="password" />
+<input type="submit" name="ctl00$cph1$signin" value="Sign In" />
+</form></body></html>"""
+
+
+class FakeEasylogServer:
+    """Serve an EasyLog Cloud account from memory.
+
+    ``latency`` and ``error_rate`` map the LOGIN, DEVICES and STATUS
+    endpoints to seconds of delay and the share of requests answered with
+    a 500. Sessions expire after ``session_ttl`` seconds, after which
+    pages redirect to the login form like the real site. ``xml_status``
+    answers currentStatus as XML-wrapped JSON instead of plain JSON.
+    """
+
+    def __init__(
+        self,
+        devices: list[dict] | int = 10,
+        *,
+        username: str = "test_user",
+        password: str = "test_pass",
+        latency: dict[str, float] | None = None,
+        error_rate: dict[str, float] | None = None,
+        session_ttl: float | None = None,
+        xml_status: bool = False,
+        seed: int = 0,
+    ) -> None:
+        self.devices = (
+            generate_devices(devices, seed=seed, models={"EL-IOT-CO2": 1})
+            if isinstance(devices, int)
+            else devices
+        )
+        self.username = username
+        self.password = password
+        self.latency = latency or {}
+        self.error_rate = error_rate or {}
+        self.session_ttl = session_ttl
+        self.xml_status = xml_status
+        self.viewstate = secrets.token_hex(16)
+        self.requests: Counter[str] = Counter()
+        self._random = random.Random(seed)
+        self._sessions: dict[str, float] = {}
+        self._server: TestServer | None = None
+
+    async def start(self) -> None:
+        app = web.Application()
+        app.router.add_get("/", self._login_form)
+        app.router.add_post("/", self._login)
+        app.router.add_get("/devices.aspx", self._devices_page)
+        app.router.add_get("/devicedata.asmx/currentStatus", self._current_status)
+        self._server = TestServer(app, host="127.0.0.1")
+        await self._server.start_server()
+
+    async def close(self) -> None:
+        await self._server.close()
+
+    async def __aenter__(self) -> FakeEasylogServer:
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    @property
+    def url(self) -> str:
+        return str(self._server.make_url("")).rstrip("/")
+
+    def transport(self, session: ClientSession) -> SessionTransport:
+        """Return a transport sending requests for the live site here."""
+        return SessionTransport(session, self.url)
+
+    def expire_sessions(self) -> None:
+        self._sessions.clear()
+
+    async def _enter(self, endpoint: str) -> web.Response | None:
+        """Count, delay and possibly fail a request to ``endpoint``.
+
+        Returns the error response, if any. Compare it with None, aiohttp
+        responses are mappings and an empty one is falsy.
+        """
+        self.requests[endpoint] += 1
+        if delay := self.latency.get(endpoint):
+            await asyncio.sleep(delay)
+        if self._random.random() < self.error_rate.get(endpoint, 0):
+            return web.Response(status=500, text="Server Error")
+        return None
+
+    def _signed_in(self, request: web.Request) -> bool:
+        created = self._sessions.get(request.cookies.get(_AUTH_COOKIE, ""))
+        return created is not None and (
+            self.session_ttl is None or time.monotonic() - created < self.session_ttl
+        )
+
+    def _login_page(self) -> web.Response:
+        return web.Response(
+            text=_LOGIN_FORM.format(viewstate=self.viewstate, generator="CA0B0334"),
+            content_type="text/html",
+        )
+
+    async def _login_form(self, request: web.Request) -> web.Response:
+        if (error := await self._enter(LOGIN)) is not None:
+            return error
+        return self._login_page()
+
+    async def _login(self, request: web.Request) -> web.Response:
+        if (error := await self._enter(LOGIN)) is not None:
+            return error
+        form = await request.post()
+        if form.get("__VIEWSTATE") != self.viewstate:
+            return web.Response(status=500, text="Validation of viewstate MAC failed")
+        if (
+            form.get("ctl00$cph1$username1") != self.username
+            or form.get("ctl00$cph1$password") != self.password
+        ):
+            return self._login_page()
+        token = secrets.token_hex(16)
+        self._sessions[token] = time.monotonic()
+        response = web.Response(text="<html>Devices</html>", content_type="text/html")
+        response.set_cookie(_AUTH_COOKIE, token)
+        return response
+
+    async def _devices_page(self, request: web.Request) -> web.Response:
+        if (error := await self._enter(DEVICES)) is not None:
+            return error
+        if not self._signed_in(request):
+            return self._login_page()
+        return web.Response(
+            text=devices_page(self.devices, self.username), content_type="text/html"
+        )
+
+    async def _current_status(self, request: web.Request) -> web.Response:
+        if (error := await self._enter(STATUS)) is not None:
+            return error
+        if not self._signed_in(request):
+            return self._login_page()
+        device_id = int(request.query["sensorId"])
+        device = next((d for d in self.devices if d["id"] == device_id), None)
+        device_status = {} if device is None else status(device, self._random)
+        if self.xml_status:
+            return web.Response(
+                text=status_body(device_status, xml=True), content_type="text/xml"
+            )
+        return web.Response(
+            text=status_body(device_status), content_type="application/json"
+        )
@@ -0,0 +1,214 @@
+"""Synthetic EasyLog Cloud accounts, from one device to tens of thousands.
+
+``generate_devices`` draws devices from the model mix of real accounts,
+with the channel sets of each model and a share of names carrying quotes,
+commas and backslashes. ``devices_page`` renders them as devices.aspx
+with its ``devicesArr``, and ``status`` and ``status_body`` build the
+currentStatus answers, with ``channelDetails`` as a list or, like the
+service does for single-channel devices, a bare dict.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+import json
+import random
+from xml.sax.saxutils import escape
+
+# Channels of each model, and how many of them a device has at least;
+# probe and sensor ports beyond that are left unplugged on some devices
+MODELS: dict[str, tuple[tuple[tuple[str, str], ...], int]] = {
+    "EL-IOT-CO2": (
+        (("CO2", "ppm"), ("Temperature", "°C"), ("Humidity", "%RH")),
+        3,
+    ),
+    "EL-WEM+": (
+        (
+            ("Temperature", "°C"),
+            ("Humidity", "%RH"),
+            ("Air Pressure", "hPa"),
+            ("VOC", "ppb"),
+            ("PM2.5", "µg/m³"),
+        ),
+        2,
+    ),
+    "EL-WiFi-TH": ((("Temperature", "°C"), ("Humidity", "%RH")), 2),
+    "EL-WiFi-T": ((("Temperature", "°C"),), 1),
+    "EL-WiFi-TP+": ((("Probe Temperature", "°C"),), 1),
+    "EL-WiFi-DTC": (
+        (("Probe 1 Temperature", "°C"), ("Probe 2 Temperature", "°C")),
+        1,
+    ),
+    "EL-WiFi-ALERT": ((("Contact", ""), ("Temperature", "°C")), 1),
+}
+
+# Relative frequency of each model in an account
+MODEL_MIX: dict[str, int] = {
+    "EL-IOT-CO2": 25,
+    "EL-WEM+": 15,
+    "EL-WiFi-TH": 30,
+    "EL-WiFi-T": 10,
+    "EL-WiFi-TP+": 8,
+    "EL-WiFi-DTC": 8,
+    "EL-WiFi-ALERT": 4,
+}
+
+# Lowest and highest reading, and decimals, per unit
+_READINGS: dict[str, tuple[float, float, int]] = {
+    "ppm": (400, 2500, 0),
+    "°C": (-30, 40, 1),
+    "%RH": (15, 95, 1),
+    "hPa": (960, 1050, 1),
+    "ppb": (0, 600, 0),
+    "µg/m³": (0, 80, 1),
+    "": (0, 1, 0),
+}
+
+# What the service shows for a channel without a reading
+INVALID_READING = "--.--"
+
+_PLACES = (
+    "Freezer",
+    "Fridge",
+    "Cold room",
+    "Vaccine fridge",
+    "Server rack",
+    "Greenhouse",
+    "Warehouse",
+    "Lab",
+    "Kjølerom",
+    "Salle serveur",
+)
+
+# Names that break naive splitting on commas or stripping of quotes
+_TRICKY_NAMES = (
+    "O'Brien's {}",
+    "{}, left door",
+    "{} 'B'",
+    '{} "north"',
+    "{} (spare), bay 2",
+    "{}\\backup",
+    "{},",
+)
+
+_TIME_FORMAT = "%d/%m/%Y %H:%M:%S"
+
+
+def generate_devices(
+    count: int,
+    *,
+    seed: int = 0,
+    models: dict[str, int] | None = None,
+    tricky_share: float = 0.2,
+) -> list[dict]:
+    """Return ``count`` devices with consecutive ids.
+
+    ``models`` overrides ``MODEL_MIX``, and ``tricky_share`` is the share
+    of names with quotes, commas or backslashes. The same seed gives the
+    same account.
+    """
+    rng = random.Random(seed)
+    mix = models or MODEL_MIX
+    drawn = rng.choices(list(mix), weights=list(mix.values()), k=count)
+    devices = []
+    for index, model in enumerate(drawn):
+        channels, least = MODELS[model]
+        name = f"{rng.choice(_PLACES)} {index + 1}"
+        firmware = f"{rng.randint(1, 4)}.{rng.randint(0, 9)}.{rng.randint(0, 30)}"
+        if rng.random() < tricky_share:
+            name = rng.choice(_TRICKY_NAMES).format(name)
+        devices.append(
+            {
+                "id": 100000 + index,
+                "model": model,
+                "name": name,
+                "mac": f"00:11:22:{index >> 16 & 255:02X}:{index >> 8 & 255:02X}:"
+                f"{index & 255:02X}",
+                "firmware": firmware,
+                "ssid": rng.choice(("EasyLogWiFi", "Lab, 2.4GHz", "Guest's")),
+                "rssi": rng.randint(-90, -35),
+                "channels": list(channels[: rng.randint(least, len(channels))]),
+            }
+        )
+    return devices
+
+
+def _js_quote(value: str) -> str:
+    escaped = value.replace("\\", "\\\\").replace("'", "\\'")
+    return f"'{escaped}'"
+
+
+def device_js(device: dict) -> str:
+    """Render one ``new Device(...)`` entry of devicesArr."""
+    fields = ["''"] * 35
+    fields[0] = str(device["id"])
+    fields[1] = "true"
+    fields[2] = _js_quote(device["model"])
+    fields[4] = _js_quote(device["name"])
+    fields[5] = _js_quote(device["mac"])
+    fields[16] = _js_quote(device.get("firmware", "1.0.0"))
+    fields[17] = _js_quote(device.get("ssid", "EasyLogWiFi"))
+    fields[28] = str(device.get("rssi", -60))
+    fields[34] = _js_quote(datetime.now().strftime(_TIME_FORMAT))
+    channels = ", ".join(
+        f"new Channel({_js_quote(label)}, '0', {_js_quote(unit)})"
+        for label, unit in device["channels"]
+    )
+    return f"new Device({', '.join(fields)}, [{channels}])"
+
+
+def devices_page(devices: list[dict], username: str = "test_user") -> str:
+    """Render devices.aspx for an account holding ``devices``."""
+    entries = ",\n".join(device_js(device) for device in devices)
+    return (
+        f"<html><span id='username'>{username}</span><script>\n"
+        f"var devicesArr = [\n{entries}\n];\n</script></html>"
+    )
+
+
+def _reading(unit: str, rng: random.Random) -> str:
+    low, high, decimals = _READINGS.get(unit, (0, 100, 1))
+    value = rng.uniform(low, high)
+    return str(round(value)) if decimals == 0 else f"{value:.{decimals}f}"
+
+
+def status(
+    device: dict,
+    rng: random.Random,
+    *,
+    shape: str | None = None,
+    invalid_share: float = 0.0,
+) -> dict:
+    """Return the currentStatus of ``device``.
+
+    ``shape`` is "list" or "dict", the latter sending the first channel
+    alone; by default single-channel devices get the dict shape.
+    ``invalid_share`` is the share of channels reading ``INVALID_READING``.
+    """
+    details = [
+        {
+            "channelLabel": label,
+            "reading": (
+                INVALID_READING if rng.random() < invalid_share else _reading(unit, rng)
+            ),
+            "unit": unit,
+        }
+        for label, unit in device["channels"]
+    ]
+    if shape is None:
+        shape = "dict" if len(details) == 1 else "list"
+    return {
+        "sensorName": device["name"],
+        "firmwareVersion": device.get("firmware", "1.0.0"),
+        "rssi": device.get("rssi", -60),
+        "lastCommFormatted": datetime.now().strftime(_TIME_FORMAT),
+        "channels": {"channelDetails": details[0] if shape == "dict" else details},
+    }
+
+
+def status_body(device_status: dict, *, xml: bool = False) -> str:
+    """Serialize a status as the service answers it, in JSON or XML."""
+    if not xml:
+        return json.dumps({"d": device_status})
+    body = json.dumps({"deviceStatus": device_status})
+    return f'<?xml version="1.0" encoding="utf-8"?>\n<string>{escape(body)}</string>'
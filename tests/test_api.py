@@ -1,11 +1,32 @@
 """Tests for Home Assistant EasyLog Cloud api."""
 
+import asyncio
+import random
+import time
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import aiohttp
 import pytest
 
 from custom_components.easylog_cloud.api import (
     HAEasylogCloudApiClient,
+    SessionExpiredError,
+)
+from custom_components.easylog_cloud.const import RATE_LIMIT_ACCOUNT_BUDGET
+from custom_components.easylog_cloud.ratelimit import (
+    PRIORITY_BACKGROUND,
+    RateLimitedError,
+    request_priority,
+)
+from custom_components.easylog_cloud.transport import FakeTransport, TransportResponse
+
+from .synthetic_account import (
+    INVALID_READING,
+    device_js,
+    devices_page,
+    generate_devices,
+    status,
+    status_body,
 )
 
 
@@ -142,6 +163,55 @@ def test_extract_device_list_success(hass, mock_session):
     # name may not be parsed exactly due to simple splitter – ensure MAC & model correct
 
 
+@pytest.mark.parametrize("count", [1, 300])
+def test_extract_device_list_synthetic_account(hass, mock_session, count):
+    """Names with quotes, commas and backslashes survive the parser intact."""
+    api = HAEasylogCloudApiClient(hass, "test_user", "test_pass")
+    devices = generate_devices(count, seed=count, tricky_share=0.5)
+    html = devices_page(devices, "Synthetic")
+
+    result = api._extract_device_list(api._extract_devices_arr_from_html(html), html)
+
+    assert [
+        (
+            device["id"],
+            device["model"],
+            device["name"],
+            device["MAC Address"]["value"],
+            device["Firmware Version"]["value"],
+            device["SSID"]["value"],
+            device["WiFi Signal"]["value"],
+        )
+        for device in result
+    ] == [
+        (
+            device["id"],
+            device["model"],
+            device["name"],
+            device["mac"],
+            device["firmware"],
+            device["ssid"],
+            str(device["rssi"]),
+        )
+        for device in devices
+    ]
+    assert all(device["Last Updated"]["value"] is not None for device in result)
+    assert api.account_name == "Synthetic"
+
+
+def test_extract_device_list_bare_values(hass, mock_session):
+    """Unquoted arguments are taken as written."""
+    api = HAEasylogCloudApiClient(hass, "test_user", "test_pass")
+    devices = generate_devices(1)
+    devices_js = device_js(devices[0]).replace(
+        f"'{devices[0]['firmware']}'", devices[0]["firmware"]
+    )
+
+    result = api._extract_device_list(devices_js, "<html></html>")
+
+    assert result[0]["Firmware Version"]["value"] == devices[0]["firmware"]
+
+
 def test_extract_device_list_insufficient_fields(hass, mock_session):
     """Test extract_device_list method with insufficient fields."""
     api = HAEasylogCloudApiClient(hass, "test_user", "test_pass")
@@ -1495,3 +1565,764 @@ async def test_async_get_devices_data_xml_not_dict_specific(hass, mock_session):
         # Should return empty list since XML parsing didn't return a dict
         assert result == []
         mock_auth.assert_called_once()
+
+
+async def test_async_get_devices_data_skips_disabled(hass, mock_session):
+    """Skipped devices are not polled and skipped channels are not converted."""
+    api = HAEasylogCloudApiClient(hass, "test_user", "test_pass")
+
+    api.authenticate = AsyncMock()
+    api.fetch_devices_page = AsyncMock(return_value="<html></html>")
+    api._extract_devices_arr_from_html = MagicMock(return_value="")
+    api._extract_device_list = MagicMock(
+        return_value=[
+            {"id": 1, "name": "Polled", "model": "EL-IOT-CO2"},
+            {"id": 2, "name": "Skipped", "model": "EL-IOT-CO2"},
+        ]
+    )
+
+    live_response = AsyncMock()
+    live_response.json = AsyncMock(
+        return_value={
+            "d": {
+                "channels": [
+                    {"channelLabel": "CO2", "reading": "400", "unit": "ppm"},
+                    {"channelLabel": "Air Quality", "reading": "3", "unit": ""},
+                ]
+            }
+        }
+    )
+    async_cm = AsyncMock()
+    async_cm.__aenter__.return_value = live_response
+    api._session.get = MagicMock(return_value=async_cm)
+
+    result = await api.async_get_devices_data(
+        skip_devices={2}, skip_channels={1: {"air_quality"}}
+    )
+
+    assert [dev["id"] for dev in result] == [1]
+    assert result[0]["CO2"]["value"] == 400
+    assert "Air Quality" not in result[0]
+    api._session.get.assert_called_once()
+
+
+async def test_apply_options(hass, mock_session):
+    """Tuning options replace the client defaults."""
+    api = HAEasylogCloudApiClient(hass, "test_user", "test_pass")
+
+    api.apply_options(
+        {
+            "discovery_ttl": 0,
+            "fetch_concurrency": 0,
+            "auth_timeout": 5,
+            "discovery_timeout": 6,
+            "status_timeout": 7,
+            "cycle_timeout": 8,
+            "account_budget": 1200,
+        }
+    )
+
+    assert api.discovery_ttl == 0
+    assert api.fetch_concurrency == 1
+    assert api._auth_timeout.total == 5
+    assert api._discovery_timeout.total == 6
+    assert api._status_timeout.total == 7
+    assert api.cycle_timeout == 8
+    assert api.account_budget == 1200
+
+
+async def test_discovery_is_cached_and_include_filter(hass, mock_session):
+    """The device list is reused within its TTL and include limits polling."""
+    api = HAEasylogCloudApiClient(hass, "test_user", "test_pass")
+    assert api.discovered_devices == []
+
+    api.authenticate = AsyncMock()
+    api.fetch_devices_page = AsyncMock(return_value="<html></html>")
+    api._extract_devices_arr_from_html = MagicMock(return_value="")
+    api._extract_device_list = MagicMock(
+        return_value=[
+            {"id": 1, "name": "Included", "model": "EL-IOT-CO2"},
+            {"id": 2, "name": "Excluded", "model": "EL-IOT-CO2"},
+        ]
+    )
+    api._async_fetch_device = AsyncMock(side_effect=lambda device, skipped: device)
+
+    result = await api.async_get_devices_data(include_devices={1})
+    assert [dev["id"] for dev in result] == [1]
+    assert [dev["id"] for dev in api.discovered_devices] == [1, 2]
+
+    await api.async_get_devices_data()
+    api.fetch_devices_page.assert_awaited_once()
+
+    api.apply_options({"discovery_ttl": 0})
+    result = await api.async_get_devices_data()
+    assert [dev["id"] for dev in result] == [1, 2]
+    assert api.fetch_devices_page.await_count == 2
+
+
+async def test_login_is_reused_until_it_expires(hass, mock_session):
+    """A recent login is reused and a failed cycle forces a new one."""
+    api = HAEasylogCloudApiClient(hass, "test_user", "test_pass")
+
+    async def _login():
+        api._authenticated_at = 1000.0
+
+    api.authenticate = AsyncMock(side_effect=_login)
+    api._async_discover_devices = AsyncMock(return_value=[{"id": 1}])
+    api._async_fetch_device = AsyncMock(return_value={"id": 1})
+
+    with patch("custom_components.easylog_cloud.api.time.monotonic") as monotonic:
+        monotonic.return_value = 1000.0
+        await api.async_get_devices_data()
+        monotonic.return_value = 1299.0
+        await api.async_get_devices_data()
+        assert api.authenticate.await_count == 1
+
+        monotonic.return_value = 1300.0
+        await api.async_get_devices_data()
+        assert api.authenticate.await_count == 2
+
+        # A cycle without live devices drops the session
+        api._async_fetch_device = AsyncMock(return_value=None)
+        assert await api.async_get_devices_data() == []
+        assert api._authenticated_at is None
+
+
+async def test_concurrent_callers_share_one_cycle(hass, mock_session):
+    """Overlapping requests share a cycle and results are reused in the window."""
+    api = HAEasylogCloudApiClient(hass, "test_user", "test_pass")
+    api.authenticate = AsyncMock()
+    api._async_discover_devices = AsyncMock(return_value=[{"id": 1}])
+    api._async_fetch_device = AsyncMock(return_value={"id": 1})
+
+    first, second = await asyncio.gather(
+        api.async_get_devices_data(), api.async_get_devices_data()
+    )
+    assert first == second == [{"id": 1}]
+    api._async_discover_devices.assert_awaited_once()
+
+    api.result_window = 30
+    assert await api.async_get_devices_data() == [{"id": 1}]
+    api._async_discover_devices.assert_awaited_once()
+
+    # A different filter is a different snapshot, kept next to the first
+    await api.async_get_devices_data(skip_devices={1})
+    assert api._async_discover_devices.await_count == 2
+    assert await api.async_get_devices_data() == [{"id": 1}]
+    assert api._async_discover_devices.await_count == 2
+
+
+async def test_status_fetches_go_through_shared_cache(hass, mock_session):
+    """With a shared status cache, device fetches are keyed by id and channels."""
+    api = HAEasylogCloudApiClient(hass, "test_user", "test_pass")
+    api.authenticate = AsyncMock()
+    api._async_discover_devices = AsyncMock(return_value=[{"id": 1}])
+    api._async_fetch_device = AsyncMock(return_value={"id": 1})
+
+    async def _fetch(client, key, fetch):
+        assert client is api
+        assert key == (1, frozenset({"voc"}))
+        return await fetch()
+
+    api.status_cache = MagicMock()
+    api.status_cache.async_fetch = AsyncMock(side_effect=_fetch)
+
+    assert await api.async_get_devices_data(skip_channels={1: {"voc"}}) == [{"id": 1}]
+    api._async_fetch_device.assert_awaited_once_with({"id": 1}, {"voc"})
+
+
+async def test_requests_are_rate_limited(hass, mock_session):
+    """Every request waits for the limiter and a 429 pauses all traffic."""
+    api = HAEasylogCloudApiClient(hass, " User@Example.com", "test_pass")
+    api.rate_limiter = MagicMock()
+    api.rate_limiter.async_acquire = AsyncMock()
+
+    page = MagicMock(status=200)
+    page.text = AsyncMock(return_value="<html></html>")
+    api._session.get = AsyncMock(return_value=page)
+    assert await api.fetch_devices_page() == "<html></html>"
+    api.rate_limiter.async_acquire.assert_awaited_once_with(
+        "user@example.com", budget=RATE_LIMIT_ACCOUNT_BUDGET
+    )
+
+    throttled = MagicMock(status=429, headers={"Retry-After": "7"})
+    api._session.get = AsyncMock(return_value=throttled)
+    with pytest.raises(RateLimitedError):
+        await api.fetch_devices_page()
+    api.rate_limiter.pause.assert_called_once_with(7)
+
+    # Without a limiter the 429 still fails the request
+    api.rate_limiter = None
+    with pytest.raises(RateLimitedError):
+        await api.authenticate()
+
+
+async def test_status_fetch_feeds_adaptive_concurrency(hass, mock_session):
+    """Server errors lower the concurrency and healthy responses raise it."""
+    api = HAEasylogCloudApiClient(hass, "test_user", "test_pass")
+    api.apply_options({"fetch_concurrency": 4})
+    concurrency = api.concurrency
+    api.apply_options({"fetch_concurrency": 4})
+    assert api.concurrency is concurrency
+
+    failing = AsyncMock(status=503)
+    failing.json = AsyncMock(side_effect=Exception("not json"))
+    failing.text = AsyncMock(return_value="Service Unavailable")
+    async_cm = AsyncMock()
+    async_cm.__aenter__.return_value = failing
+    api._session.get = MagicMock(return_value=async_cm)
+
+    assert await api._async_fetch_device({"id": 1, "name": "D", "model": "M"}) is None
+    assert api.concurrency.limit == 2
+
+
+async def test_hedged_status_request_is_rate_limited(hass, mock_session):
+    """The hedge of a status request waits for the rate limiter like any other."""
+    api = HAEasylogCloudApiClient(hass, "test_user", "test_pass")
+    api.apply_options({"hedge_requests": True})
+    assert api.hedger.enabled is True
+    api.rate_limiter = MagicMock()
+    api.rate_limiter.async_acquire = AsyncMock()
+
+    resp = AsyncMock(status=200)
+    resp.json = AsyncMock(return_value={"d": {}})
+    async_cm = AsyncMock()
+    async_cm.__aenter__.return_value = resp
+    api._session.get = MagicMock(return_value=async_cm)
+
+    assert await api._async_request_status(1, throttle=True) == (True, {"d": {}})
+    api.rate_limiter.async_acquire.assert_awaited_once()
+
+
+async def test_watchdog_keeps_results_of_overrunning_cycle(hass, mock_session):
+    """Status fetches still running at the cycle deadline are cancelled."""
+    api = HAEasylogCloudApiClient(hass, "test_user", "test_pass")
+    api.apply_options({"cycle_timeout": 0.05})
+    api.authenticate = AsyncMock()
+    api._authenticated_at = None
+    api._async_discover_devices = AsyncMock(
+        return_value=[{"id": 1}, {"id": 2}, {"id": 3}]
+    )
+    hung = asyncio.Event()
+
+    async def _fetch(device, skipped):
+        if device["id"] == 2:
+            try:
+                await asyncio.sleep(10)
+            finally:
+                hung.set()
+        return {"id": device["id"]}
+
+    api._async_fetch_device = AsyncMock(side_effect=_fetch)
+
+    result = await api.async_get_devices_data()
+
+    assert result == [{"id": 1}, {"id": 3}]
+    assert hung.is_set()
+    assert api.cancelled_fetches == 1
+    assert api.last_error is None
+
+    # A cycle with nothing left to fetch finishes straight away
+    api._async_discover_devices = AsyncMock(return_value=[])
+    assert await api.async_get_devices_data() == []
+    assert api.cancelled_fetches == 1
+
+
+async def test_watchdog_does_not_drop_session_on_timeout(hass, mock_session):
+    """A cycle that only timed out keeps its login for the next cycle."""
+    api = HAEasylogCloudApiClient(hass, "test_user", "test_pass")
+    api.apply_options({"cycle_timeout": 0})
+    api._authenticated_at = time.monotonic()
+    api._async_discover_devices = AsyncMock(return_value=[{"id": 1}])
+
+    async def _hang(device, skipped):
+        await asyncio.sleep(10)
+
+    api._async_fetch_device = _hang
+
+    assert await api.async_get_devices_data() == []
+    assert api.cancelled_fetches == 1
+    assert api._authenticated_at is not None
+
+
+async def test_rate_limited_cycle_keeps_partial_results(hass, mock_session):
+    """A 429 ends the cycle early without dropping its results or the login."""
+    api = HAEasylogCloudApiClient(hass, "test_user", "test_pass")
+    authenticated_at = api._authenticated_at = time.monotonic()
+    api._async_discover_devices = AsyncMock(
+        return_value=[{"id": 1}, {"id": 2}, {"id": 3}]
+    )
+    api._last_status = {3: {"id": 3, "stale": True}}
+    hung = asyncio.Event()
+
+    async def _fetch(device, skipped):
+        if device["id"] == 2:
+            await asyncio.sleep(0.01)
+            raise RateLimitedError(30)
+        if device["id"] == 3:
+            try:
+                await asyncio.sleep(10)
+            finally:
+                hung.set()
+        return {"id": device["id"]}
+
+    api._async_fetch_device = _fetch
+
+    result = await api.async_get_devices_data()
+
+    assert result == [{"id": 1}, {"id": 3, "stale": True}]
+    assert hung.is_set()
+    assert api.last_error is None
+    assert api._authenticated_at == authenticated_at
+    assert api.cancelled_fetches == 1
+    assert api.carry_over == {(frozenset(), frozenset(), frozenset()): [2, 3]}
+
+    # Rate limited before any status request, the cycle fails but keeps
+    # its login
+    api._async_discover_devices = AsyncMock(side_effect=RateLimitedError(30))
+    assert await api.async_get_devices_data() == []
+    assert isinstance(api.last_error, RateLimitedError)
+    assert api._authenticated_at == authenticated_at
+
+
+async def test_failed_device_does_not_fail_the_cycle(hass, mock_session):
+    """A device that times out or loses its connection fails on its own."""
+    api = HAEasylogCloudApiClient(hass, "test_user", "test_pass")
+    api._authenticated_at = time.monotonic()
+    api._async_discover_devices = AsyncMock(
+        return_value=[{"id": i, "name": "D", "model": "M"} for i in (1, 2, 3)]
+    )
+    errors = {1: asyncio.TimeoutError(), 3: aiohttp.ClientConnectionError("reset")}
+
+    async def _request(device_id, throttle=False):
+        if device_id in errors:
+            raise errors[device_id]
+        return True, {"d": {"sensorName": f"Device {device_id}"}}
+
+    api._async_request_status = _request
+
+    result = await api.async_get_devices_data()
+    assert [dev["id"] for dev in result] == [2]
+    assert api.last_error is None
+    assert api.failed_requests == 2
+
+    # Even when no device answers, the login is kept
+    errors[2] = asyncio.TimeoutError()
+    assert await api.async_get_devices_data() == []
+    assert api.last_error is None
+    assert api._authenticated_at is not None
+
+
+async def test_time_budgeted_cycles_rotate_devices(hass, mock_session):
+    """Devices missed by a budgeted cycle go first next time, keeping old data."""
+    api = HAEasylogCloudApiClient(hass, "test_user", "test_pass")
+    api.apply_options({"time_budgeted": True, "poll_interval": 10})
+    assert api.cycle_budget == 8
+    api.apply_options({"time_budgeted": True, "poll_interval": 0.3})
+    api._authenticated_at = time.monotonic()
+    api._async_discover_devices = AsyncMock(
+        return_value=[{"id": 1}, {"id": 2}, {"id": 3}]
+    )
+    order = []
+    lock = asyncio.Lock()
+
+    async def _one_at_a_time(device, skipped):
+        async with lock:
+            order.append(device["id"])
+            await asyncio.sleep(0.1)
+            return {"id": device["id"]}
+
+    api._async_fetch_device = _one_at_a_time
+
+    first = await api.async_get_devices_data()
+    assert [dev["id"] for dev in first] == [1, 2]
+    assert list(api.carry_over.values()) == [[3]]
+
+    second = await api.async_get_devices_data()
+    assert order[3:5] == [3, 1]
+    # Device 2 was not reached this time and keeps its previous status
+    assert {dev["id"] for dev in second} == {1, 2, 3}
+    assert list(api.carry_over.values()) == [[2]]
+
+    # Cycles for other filters keep their own carry-over
+    await api.async_get_devices_data(include_devices={1})
+    assert list(api.carry_over.values()) == [[2]]
+
+
+async def test_quarantined_devices_rest_between_retries(hass, mock_session):
+    """Quarantined devices are skipped but keep their last known status."""
+    api = HAEasylogCloudApiClient(hass, "test_user", "test_pass")
+    api._authenticated_at = time.monotonic()
+    api._async_discover_devices = AsyncMock(return_value=[{"id": 1}, {"id": 2}])
+    api._async_fetch_device = AsyncMock(
+        side_effect=lambda device, skipped: {"id": device["id"]}
+    )
+    await api.async_get_devices_data()
+
+    api.quarantine.record(2, False)
+    api.quarantine.record(2, False)
+    api.quarantine.record(2, False)
+    api._async_fetch_device.reset_mock()
+
+    result = await api.async_get_devices_data()
+
+    assert result == [{"id": 1}, {"id": 2}]
+    api._async_fetch_device.assert_awaited_once_with({"id": 1}, ())
+
+
+async def test_empty_status_counts_as_failure(hass, mock_session):
+    """Empty or undecodable status responses feed the quarantine."""
+    api = HAEasylogCloudApiClient(hass, "test_user", "test_pass")
+    device = {"id": 1, "name": "D", "model": "M"}
+    api._async_request_status = AsyncMock(return_value=(True, {"d": {}}))
+    for _ in range(3):
+        await api._async_fetch_device(device)
+    assert api.quarantine.quarantined == {1}
+    # Once quarantined, empty responses are no longer logged as errors
+    await api._async_fetch_device(device)
+
+    api._async_request_status = AsyncMock(return_value=(True, None))
+    assert await api._async_fetch_device({"id": 2, "name": "D", "model": "M"}) is None
+    assert api.quarantine._failures[2] == 1
+
+    # So do server errors, timeouts and lost connections
+    api._async_request_status = AsyncMock(return_value=(False, {"d": {"rssi": 1}}))
+    assert await api._async_fetch_device({"id": 3, "name": "D", "model": "M"}) is None
+    for error in (asyncio.TimeoutError(), aiohttp.ServerDisconnectedError()):
+        api._async_request_status = AsyncMock(side_effect=error)
+        assert (
+            await api._async_fetch_device({"id": 3, "name": "D", "model": "M"}) is None
+        )
+    assert api.quarantine._failures[3] == 3
+    assert api.quarantine.quarantined == {1, 3}
+    assert api.failed_requests == 2
+
+
+async def test_discover_devices_for_sharded_mode(hass, mock_session):
+    """Discovery on its own logs in first and drops the session on failure."""
+    api = HAEasylogCloudApiClient(hass, "test_user", "test_pass")
+    api._async_ensure_session = AsyncMock()
+    api._async_discover_devices = AsyncMock(return_value=[{"id": 1}])
+    assert await api.async_discover_devices() == [{"id": 1}]
+    api._async_ensure_session.assert_awaited_once()
+
+    api._authenticated_at = time.monotonic()
+    api._async_discover_devices = AsyncMock(side_effect=Exception("boom"))
+    with pytest.raises(Exception, match="boom"):
+        await api.async_discover_devices()
+    assert api._authenticated_at is None
+
+
+async def test_devices_are_streamed_as_they_complete(hass, mock_session):
+    """Callers sharing a cycle get each device before the slowest one ends."""
+    api = HAEasylogCloudApiClient(hass, "test_user", "test_pass")
+    api._authenticated_at = time.monotonic()
+    api._async_discover_devices = AsyncMock(return_value=[{"id": 1}, {"id": 2}])
+    release = asyncio.Event()
+
+    async def _fetch(device, skipped):
+        if device["id"] == 2:
+            await release.wait()
+            return None
+        return {"id": device["id"]}
+
+    api._async_fetch_device = _fetch
+    first, second = [], []
+    streamed = asyncio.Event()
+
+    def _on_second(device):
+        second.append(device)
+        streamed.set()
+
+    cycle = asyncio.ensure_future(api.async_get_devices_data(on_device=first.append))
+    joined = asyncio.ensure_future(api.async_get_devices_data(on_device=_on_second))
+    await asyncio.wait_for(streamed.wait(), 1)
+
+    assert first == second == [{"id": 1}]
+    assert not cycle.done()
+    release.set()
+    assert await cycle == await joined == [{"id": 1}]
+    assert api._stream_callbacks == {}
+
+
+async def test_status_fetches_overlap_discovery(hass, mock_session):
+    """Known devices are fetched while the device page is still loading."""
+    api = HAEasylogCloudApiClient(hass, "test_user", "test_pass")
+    api._authenticated_at = time.monotonic()
+    api.remember_devices([{"id": 1}, {"id": 2}])
+    api.discovery_ttl = 0
+    page_loaded = asyncio.Event()
+    fetched = []
+
+    async def _discover():
+        await page_loaded.wait()
+        return [{"id": 1}, {"id": 3}]
+
+    async def _fetch(device, skipped):
+        fetched.append(device["id"])
+        if device["id"] == 2:
+            await asyncio.sleep(10)
+        return {"id": device["id"]}
+
+    api._async_discover_devices = _discover
+    api._async_fetch_device = _fetch
+    cycle = asyncio.ensure_future(api.async_get_devices_data())
+    await asyncio.sleep(0.01)
+    assert sorted(fetched) == [1, 2]
+
+    page_loaded.set()
+    # Device 2 has vanished from the page, its fetch is dropped
+    assert await asyncio.wait_for(cycle, 1) == [{"id": 1}, {"id": 3}]
+
+    api._async_discover_devices = AsyncMock(side_effect=Exception("boom"))
+    assert await api.async_get_devices_data() == []
+    assert str(api.last_error) == "boom"
+
+
+async def test_concurrent_cycles_share_login_and_discovery(hass, mock_session):
+    """Cycles for different filters sign in and scrape the device page once."""
+    api = HAEasylogCloudApiClient(hass, "test_user", "test_pass")
+
+    async def _authenticate():
+        await asyncio.sleep(0.01)
+        api._authenticated_at = time.monotonic()
+
+    api.authenticate = AsyncMock(side_effect=_authenticate)
+    api.fetch_devices_page = AsyncMock(return_value="<html></html>")
+    api._extract_devices_arr_from_html = MagicMock(return_value="[]")
+    api._extract_device_list = MagicMock(return_value=[{"id": 1}, {"id": 2}])
+    api._async_fetch_device = AsyncMock(
+        side_effect=lambda device, skipped: {"id": device["id"]}
+    )
+
+    first, second = await asyncio.gather(
+        api.async_get_devices_data(include_devices={1}),
+        api.async_get_devices_data(include_devices={2}),
+    )
+
+    assert first == [{"id": 1}] and second == [{"id": 2}]
+    api.authenticate.assert_awaited_once()
+    api.fetch_devices_page.assert_awaited_once()
+    assert api._steps == {}
+
+
+async def test_refresh_only_requested_devices(hass, mock_session):
+    """A targeted refresh fetches just the known requested devices."""
+    api = HAEasylogCloudApiClient(hass, "test_user", "test_pass")
+    api._authenticated_at = time.monotonic()
+    api._async_discover_devices = AsyncMock(
+        return_value=[{"id": 1}, {"id": 2}, {"id": 3}]
+    )
+    api._async_fetch_device = AsyncMock(
+        side_effect=lambda device, skipped: (
+            None if device["id"] == 3 else {"id": device["id"], "skipped": skipped}
+        )
+    )
+
+    result = await api.async_refresh_devices([2, 3, 4], {2: {"voc"}})
+
+    assert result == [{"id": 2, "skipped": {"voc"}}]
+    assert api._last_status == {2: {"id": 2, "skipped": {"voc"}}}
+
+    api._async_discover_devices = AsyncMock(side_effect=Exception("boom"))
+    with pytest.raises(Exception, match="boom"):
+        await api.async_refresh_devices([1])
+    assert api._authenticated_at is None
+
+
+async def test_refresh_goes_ahead_of_queued_background_fetches(hass):
+    """A refresh during a cycle waits for a free slot, not for the queue."""
+    devices = [{"id": i, "name": "D", "model": "M"} for i in range(60)]
+
+    def _handler(method, url, **kwargs):
+        return TransportResponse(body='{"d": {"sensorName": "Device"}}')
+
+    transport = FakeTransport(_handler, latency=0.01)
+    api = HAEasylogCloudApiClient(hass, "test_user", "test_pass", transport)
+    api.apply_options({"fetch_concurrency": 2})
+    api.concurrency.maximum = 2
+    api._authenticated_at = time.monotonic()
+    api._async_discover_devices = AsyncMock(return_value=devices)
+
+    async def _poll():
+        request_priority.set(PRIORITY_BACKGROUND)
+        return await api.async_get_devices_data()
+
+    cycle = asyncio.ensure_future(_poll())
+    await asyncio.sleep(0.03)
+    assert await api.async_refresh_devices([59])
+    sent = [url.rsplit("=", 1)[1] for _, url in transport.requests]
+    assert sent.index("59") < 10
+    assert len(await cycle) == 60
+
+
+async def test_prewarm_signs_in_or_opens_a_connection(hass, mock_session):
+    """Pre-warming renews an expiring session, else opens a connection."""
+    api = HAEasylogCloudApiClient(hass, "test_user", "test_pass")
+    api.authenticate = AsyncMock()
+    api._authenticated_at = time.monotonic() - 298
+    await api.async_prewarm(5)
+    api.authenticate.assert_awaited_once()
+    mock_session.head.assert_not_called()
+
+    api._authenticated_at = time.monotonic()
+    response = MagicMock(status=200)
+    mock_session.head = AsyncMock(return_value=response)
+    await api.async_prewarm(5)
+    mock_session.head.assert_awaited_once()
+    response.release.assert_called_once()
+
+    # Failures are left to the cycle
+    mock_session.head = AsyncMock(return_value=MagicMock(status=429, headers={}))
+    await api.async_prewarm(5)
+    assert api._authenticated_at is not None
+
+
+async def test_authenticate_reuses_cached_form_tokens(hass, mock_session):
+    """Signing in again posts the cached form tokens without a page fetch."""
+    api = HAEasylogCloudApiClient(hass, "test_user", "test_pass")
+    login_page = MagicMock(status=200)
+    login_page.text = AsyncMock(
+        return_value='<input name="__VIEWSTATE" value="vs1" />'
+        '<input name="__VIEWSTATEGENERATOR" value="gen1" />'
+    )
+    signed_in = MagicMock(status=200, cookies={"auth": "1"})
+    signed_in.text = AsyncMock(return_value="<html>Devices</html>")
+    mock_session.get = AsyncMock(return_value=login_page)
+    mock_session.post = AsyncMock(return_value=signed_in)
+
+    await api.authenticate()
+    await api.authenticate()
+
+    mock_session.get.assert_awaited_once()
+    assert mock_session.post.await_count == 2
+    assert mock_session.post.call_args.kwargs["data"]["__VIEWSTATE"] == "vs1"
+    assert api._cookies == {"auth": "1"}
+
+
+@pytest.mark.parametrize(
+    ("status", "body"),
+    [(500, "Validation of viewstate MAC failed"), (200, 'name="ctl00$cph1$password"')],
+)
+async def test_authenticate_refetches_rejected_form_tokens(
+    hass, mock_session, status, body
+):
+    """Rejected cached tokens are replaced by the ones of a fresh login page."""
+    api = HAEasylogCloudApiClient(hass, "test_user", "test_pass")
+    api._form_tokens = {"__VIEWSTATE": "old", "__VIEWSTATEGENERATOR": "old"}
+    rejected = MagicMock(status=status)
+    rejected.text = AsyncMock(return_value=body)
+    signed_in = MagicMock(status=200, cookies={"auth": "1"})
+    login_page = MagicMock(status=200)
+    login_page.text = AsyncMock(
+        return_value='<input name="__VIEWSTATE" value="new" />'
+        '<input name="__VIEWSTATEGENERATOR" value="gen" />'
+    )
+    mock_session.get = AsyncMock(return_value=login_page)
+    mock_session.post = AsyncMock(side_effect=[rejected, signed_in])
+
+    await api.authenticate()
+
+    mock_session.get.assert_awaited_once()
+    assert mock_session.post.call_args.kwargs["data"]["__VIEWSTATE"] == "new"
+    assert api._form_tokens == {"__VIEWSTATE": "new", "__VIEWSTATEGENERATOR": "gen"}
+    assert api._cookies == {"auth": "1"}
+
+
+async def test_expired_session_signs_in_again(hass):
+    """A sign-in form instead of a status renews the login once."""
+    signed_in = {"logins": 0, "expired": True}
+
+    def _handler(method, url, **kwargs):
+        if "currentStatus" in url and signed_in["expired"]:
+            return TransportResponse(
+                body='<input name="ctl00$cph1$password" type="password" />',
+                headers={"Content-Type": "text/html"},
+            )
+        return TransportResponse(body='{"d": {"sensorName": "Device"}}')
+
+    api = HAEasylogCloudApiClient(
+        hass, "test_user", "test_pass", FakeTransport(_handler)
+    )
+    api._authenticated_at = time.monotonic()
+    api._async_discover_devices = AsyncMock(
+        return_value=[{"id": i, "name": "D", "model": "M"} for i in (1, 2)]
+    )
+
+    async def _login():
+        signed_in["logins"] += 1
+        signed_in["expired"] = False
+        api._authenticated_at = time.monotonic()
+
+    api.authenticate = AsyncMock(side_effect=_login)
+
+    result = await api.async_get_devices_data()
+    assert [dev["name"] for dev in result] == ["Device", "Device"]
+    assert signed_in["logins"] == 1
+    assert api.last_error is None
+    assert not api.quarantine.quarantined
+
+    # A session refused right after signing in again fails the cycle
+    api.authenticate = AsyncMock()
+    signed_in["expired"] = True
+    assert await api.async_get_devices_data() == []
+    assert isinstance(api.last_error, SessionExpiredError)
+    assert api._authenticated_at is None
+    assert not api.quarantine.quarantined
+
+
+async def test_devices_page_of_expired_session_signs_in_again(hass, mock_session):
+    """The device page is fetched again after a new login."""
+    api = HAEasylogCloudApiClient(hass, "test_user", "test_pass")
+    api._authenticated_at = time.monotonic()
+    api.authenticate = AsyncMock()
+    expired = MagicMock(status=200)
+    expired.text = AsyncMock(return_value='name="ctl00$cph1$password"')
+    page = MagicMock(status=200)
+    page.text = AsyncMock(return_value="<html>Devices</html>")
+    mock_session.get = AsyncMock(side_effect=[expired, page])
+
+    assert await api.fetch_devices_page() == "<html>Devices</html>"
+    api.authenticate.assert_awaited_once()
+
+    # A request made with an older login does not drop the new one
+    authenticated_at = api._authenticated_at = time.monotonic()
+    await api._async_renew_session(authenticated_at - 1)
+    assert api._authenticated_at == authenticated_at
+    api.authenticate.assert_awaited_once()
+
+
+@pytest.mark.parametrize("xml", [False, True])
+@pytest.mark.parametrize("shape", ["list", "dict"])
+async def test_fetch_device_synthetic_statuses(hass, xml, shape):
+    """Statuses of every model decode, in both channelDetails shapes."""
+    rng = random.Random(7)
+    devices = generate_devices(60, seed=7)
+    statuses = {
+        device["id"]: status(device, rng, shape=shape, invalid_share=0.1)
+        for device in devices
+    }
+
+    def _handler(method, url, **kwargs):
+        device_status = statuses[int(url.rsplit("=", 1)[1])]
+        return TransportResponse(
+            body=status_body(device_status, xml=xml),
+            headers={"Content-Type": "text/xml" if xml else "application/json"},
+        )
+
+    api = HAEasylogCloudApiClient(
+        hass, "test_user", "test_pass", FakeTransport(_handler)
+    )
+
+    for device in devices:
+        result = await api._async_fetch_device(device)
+        details = statuses[device["id"]]["channels"]["channelDetails"]
+        expected = details if isinstance(details, list) else [details]
+        assert result["name"] == device["name"]
+        assert len(result) == 8 + len(expected)
+        for channel in expected:
+            value = result[channel["channelLabel"]]["value"]
+            if channel["reading"] == INVALID_READING:
+                assert value is None
+            else:
+                assert value == float(channel["reading"])
@@ -4,10 +4,23 @@ from homeassistant.components.binary_sensor import BinarySensorDeviceClass
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
 from custom_components.easylog_cloud.const import DOMAIN
+from custom_components.easylog_cloud.coordinator import EasylogCloudCoordinator
 
 from .const import MOCK_CONFIG
 
 
+class MockCoordinator:
+    """Coordinator stand-in holding a snapshot, looked up by device id."""
+
+    def __init__(self, data=None):
+        self.data = data
+
+    def device_index(self, device_id):
+        return next(
+            (i for i, d in enumerate(self.data or []) if d["id"] == device_id), None
+        )
+
+
 async def test_binary_sensor_setup(hass):
     """Test binary sensor setup."""
     from custom_components.easylog_cloud.binary_sensor import async_setup_entry
@@ -33,9 +46,9 @@ async def test_binary_sensor_setup(hass):
 
     # Set up the entry with mocked data
     hass.data.setdefault(DOMAIN, {})
-    hass.data[DOMAIN][config_entry.entry_id] = type(
-        "MockCoordinator", (), {"data": mock_data}
-    )()
+    coordinator = EasylogCloudCoordinator(hass, "test_user", "test_pass")
+    coordinator.data = mock_data
+    hass.data[DOMAIN][config_entry.entry_id] = coordinator
 
     # Track added entities
     added_entities = []
@@ -45,9 +58,10 @@ async def test_binary_sensor_setup(hass):
 
     # Test setup
     await async_setup_entry(hass, config_entry, mock_add_entities)
+    await coordinator.async_shutdown()
 
-    # Verify that only binary sensors were added
-    assert len(added_entities) == 5  # Motion, Door Contact, Window, Battery, Power
+    # Only labels naming an on/off state get a binary sensor
+    assert len(added_entities) == 3  # Motion, Door Contact, Window
 
     # Verify entity properties
     motion_sensor = next(e for e in added_entities if "Motion" in e.name)
@@ -68,22 +82,12 @@ async def test_binary_sensor_setup(hass):
     assert window_sensor.device_class == BinarySensorDeviceClass.WINDOW
     assert window_sensor.is_on is True
 
-    battery_sensor = next(e for e in added_entities if "Battery" in e.name)
-    assert battery_sensor.name == "Test Device Battery"
-    assert battery_sensor.unique_id == "1_battery"
-    assert battery_sensor.device_class == BinarySensorDeviceClass.BATTERY
-    assert battery_sensor.is_on is True
-
-    power_sensor = next(e for e in added_entities if "Power" in e.name)
-    assert power_sensor.name == "Test Device Power"
-    assert power_sensor.unique_id == "1_power"
-    assert power_sensor.device_class == BinarySensorDeviceClass.POWER
-    assert power_sensor.is_on is False
+    assert not any("Battery" in e.name or "Power" in e.name for e in added_entities)
 
 
 def test_is_binary_function():
     """Test the _is_binary helper function."""
-    from custom_components.easylog_cloud.binary_sensor import _is_binary
+    from custom_components.easylog_cloud.labels import is_binary_reading as _is_binary
 
     # Test string values
     assert _is_binary({"value": "true"}) is True
@@ -114,7 +118,7 @@ def test_is_binary_function():
 
 def test_is_binary_exception_handling():
     """Test _is_binary function with exception handling."""
-    from custom_components.easylog_cloud.binary_sensor import _is_binary
+    from custom_components.easylog_cloud.labels import is_binary_reading as _is_binary
 
     # Test with data that causes exception when accessing .get()
     class MockData:
@@ -132,7 +136,7 @@ def test_device_class_guessing():
     )
 
     # Create a mock coordinator and device
-    mock_coordinator = type("MockCoordinator", (), {})()
+    mock_coordinator = MockCoordinator()
     mock_device = {"id": 1, "name": "Test Device"}
 
     # Test motion detection
@@ -178,58 +182,22 @@ def test_binary_sensor_is_on_property():
         EasylogCloudBinarySensor,
     )
 
-    # Create a mock coordinator
-    mock_coordinator = type("MockCoordinator", (), {})()
+    def _sensor(value):
+        device = {"id": 1, "name": "Test Device", "Test": {"value": value}}
+        coordinator = MockCoordinator([device])
+        return EasylogCloudBinarySensor(coordinator, device, "Test", {"value": value})
 
     # Test string values
-    mock_device_true = {"id": 1, "name": "Test Device", "Test": {"value": "true"}}
-    sensor_true = EasylogCloudBinarySensor(
-        mock_coordinator, mock_device_true, "Test", {"value": "true"}
-    )
-    assert sensor_true.is_on is True
-
-    mock_device_on = {"id": 1, "name": "Test Device", "Test": {"value": "on"}}
-    sensor_on = EasylogCloudBinarySensor(
-        mock_coordinator, mock_device_on, "Test", {"value": "on"}
-    )
-    assert sensor_on.is_on is True
-
-    mock_device_1 = {"id": 1, "name": "Test Device", "Test": {"value": "1"}}
-    sensor_1 = EasylogCloudBinarySensor(
-        mock_coordinator, mock_device_1, "Test", {"value": "1"}
-    )
-    assert sensor_1.is_on is True
-
-    mock_device_false = {"id": 1, "name": "Test Device", "Test": {"value": "false"}}
-    sensor_false = EasylogCloudBinarySensor(
-        mock_coordinator, mock_device_false, "Test", {"value": "false"}
-    )
-    assert sensor_false.is_on is False
-
-    mock_device_off = {"id": 1, "name": "Test Device", "Test": {"value": "off"}}
-    sensor_off = EasylogCloudBinarySensor(
-        mock_coordinator, mock_device_off, "Test", {"value": "off"}
-    )
-    assert sensor_off.is_on is False
-
-    mock_device_0 = {"id": 1, "name": "Test Device", "Test": {"value": "0"}}
-    sensor_0 = EasylogCloudBinarySensor(
-        mock_coordinator, mock_device_0, "Test", {"value": "0"}
-    )
-    assert sensor_0.is_on is False
+    assert _sensor("true").is_on is True
+    assert _sensor("on").is_on is True
+    assert _sensor("1").is_on is True
+    assert _sensor("false").is_on is False
+    assert _sensor("off").is_on is False
+    assert _sensor("0").is_on is False
 
     # Test numeric values
-    mock_device_num_true = {"id": 1, "name": "Test Device", "Test": {"value": 1}}
-    sensor_num_true = EasylogCloudBinarySensor(
-        mock_coordinator, mock_device_num_true, "Test", {"value": 1}
-    )
-    assert sensor_num_true.is_on is True
-
-    mock_device_num_false = {"id": 1, "name": "Test Device", "Test": {"value": 0}}
-    sensor_num_false = EasylogCloudBinarySensor(
-        mock_coordinator, mock_device_num_false, "Test", {"value": 0}
-    )
-    assert sensor_num_false.is_on is False
+    assert _sensor(1).is_on is True
+    assert _sensor(0).is_on is False
 
 
 def test_binary_sensor_device_info():
@@ -239,7 +207,7 @@ def test_binary_sensor_device_info():
     )
 
     # Create a mock coordinator
-    mock_coordinator = type("MockCoordinator", (), {})()
+    mock_coordinator = MockCoordinator()
     mock_device = {"id": 1, "name": "Test Device"}
 
     sensor = EasylogCloudBinarySensor(
@@ -266,7 +234,7 @@ async def test_binary_sensor_with_coordinator_updates(hass):
         }
     ]
 
-    mock_coordinator = type("MockCoordinator", (), {"data": mock_data})()
+    mock_coordinator = MockCoordinator(mock_data)
 
     mock_device = mock_data[0]
     sensor = EasylogCloudBinarySensor(
@@ -281,3 +249,29 @@ async def test_binary_sensor_with_coordinator_updates(hass):
 
     # Test updated state
     assert sensor.is_on is False
+
+    # A new snapshot replaces the device dict the entity was built from
+    mock_coordinator.data = [{**mock_data[0], "Motion": {"value": "true"}}]
+    assert sensor.is_on is True
+
+
+async def test_binary_sensor_follows_streamed_device_updates(hass):
+    """A binary sensor updates as soon as its device's status is streamed in."""
+    from custom_components.easylog_cloud.binary_sensor import EasylogCloudBinarySensor
+
+    coordinator = EasylogCloudCoordinator(hass, "test_user", "test_pass")
+    device = {"id": 1, "name": "Store", "model": "EL-WiFi-ALERT"}
+    coordinator.data = [{**device, "Door": {"value": "0", "unit": ""}}]
+    sensor = EasylogCloudBinarySensor(
+        coordinator, device, "Door", {"value": "0", "unit": ""}
+    )
+    sensor.hass = hass
+    sensor.entity_id = "binary_sensor.store_door"
+    await sensor.async_added_to_hass()
+
+    coordinator.async_update_device({**device, "Door": {"value": "1", "unit": ""}})
+    assert hass.states.get("binary_sensor.store_door").state == "on"
+
+    await sensor.async_remove()
+    assert coordinator._device_listeners == {}
+    await coordinator.async_shutdown()
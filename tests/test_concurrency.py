@@ -0,0 +1,224 @@
+"""Test Home Assistant EasyLog Cloud adaptive concurrency."""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from custom_components.easylog_cloud.concurrency import AimdConcurrency, RequestHedger
+from custom_components.easylog_cloud.ratelimit import (
+    PRIORITY_BACKGROUND,
+    PRIORITY_INTERACTIVE,
+    request_priority,
+)
+
+
+def test_additive_increase_and_ceiling():
+    """Healthy responses grow the limit by about one per round, up to the cap."""
+    aimd = AimdConcurrency(2, maximum=4)
+    for _ in range(3):
+        aimd.record(0.1, True)
+    assert aimd.limit == 3
+    for _ in range(20):
+        aimd.record(0.1, True)
+    assert aimd.limit == 4
+    assert AimdConcurrency(20, maximum=4).limit == 20
+
+
+def test_multiplicative_decrease_once_per_latency():
+    """Failures and latency spikes halve the limit once per average latency."""
+    aimd = AimdConcurrency(8)
+    aimd.record(1.0, True)
+    with patch(
+        "custom_components.easylog_cloud.concurrency.time.monotonic"
+    ) as monotonic:
+        monotonic.return_value = 100.0
+        aimd.record(0.5, False)
+        assert aimd.limit == 4
+        # A burst of failures within one latency counts once
+        aimd.record(0.5, False)
+        assert aimd.limit == 4
+
+        monotonic.return_value = 102.0
+        aimd.record(10.0, True)
+        assert aimd.limit == 2
+        monotonic.return_value = 110.0
+        aimd.record(10.0, False)
+        aimd.record(10.0, False)
+        assert aimd.limit == 1
+
+
+async def test_limits_parallel_requests():
+    """No more requests than the limit run at the same time."""
+    aimd = AimdConcurrency(2)
+    running = peak = 0
+
+    async def _request():
+        nonlocal running, peak
+        async with aimd:
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+    await asyncio.gather(*(_request() for _ in range(6)))
+    assert peak == 2
+
+
+async def test_waiters_are_served_in_order():
+    """Released and new slots go to the oldest waiters, cancelled ones skipped."""
+    aimd = AimdConcurrency(1, maximum=2)
+    order = []
+    release = asyncio.Event()
+
+    async def _request(name):
+        async with aimd:
+            order.append(name)
+            await release.wait()
+
+    first = asyncio.ensure_future(_request("first"))
+    await asyncio.sleep(0)
+    waiters = [asyncio.ensure_future(_request(name)) for name in "abc"]
+    await asyncio.sleep(0)
+    waiters[0].cancel()
+    await asyncio.sleep(0)
+    assert order == ["first"]
+
+    # A higher limit lets the next waiter in straight away
+    for _ in range(2):
+        aimd.record(0.01, True)
+    await asyncio.sleep(0)
+    assert order == ["first", "b"]
+
+    release.set()
+    await asyncio.gather(first, *waiters[1:])
+    assert order == ["first", "b", "c"]
+    assert aimd._in_flight == 0
+    assert not aimd._waiters
+
+
+async def test_interactive_requests_go_ahead_of_background_ones():
+    """A waiting refresh gets the next free slot before queued polls."""
+    aimd = AimdConcurrency(1)
+    order = []
+    release = asyncio.Event()
+
+    async def _request(name, priority):
+        request_priority.set(priority)
+        async with aimd:
+            order.append(name)
+            await release.wait()
+
+    requests = [
+        asyncio.ensure_future(_request(f"poll {i}", PRIORITY_BACKGROUND))
+        for i in range(3)
+    ]
+    await asyncio.sleep(0)
+    requests.append(asyncio.ensure_future(_request("refresh", PRIORITY_INTERACTIVE)))
+    await asyncio.sleep(0)
+
+    release.set()
+    await asyncio.gather(*requests)
+    assert order == ["poll 0", "refresh", "poll 1", "poll 2"]
+
+
+async def test_waiter_cancelled_after_wake_frees_its_slot():
+    """A waiter cancelled as its slot is handed over gives it to the next."""
+    aimd = AimdConcurrency(1)
+    await aimd.__aenter__()
+    waiter = asyncio.ensure_future(aimd.__aenter__())
+    follower = asyncio.ensure_future(aimd.__aenter__())
+    await asyncio.sleep(0)
+
+    await aimd.__aexit__(None, None, None)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    await asyncio.wait_for(follower, 1)
+    assert aimd._in_flight == 1
+
+
+async def test_drains_many_waiters_quickly():
+    """Each release wakes one waiter, so thousands of waiters drain fast."""
+    aimd = AimdConcurrency(4, maximum=4)
+
+    async def _request():
+        async with aimd:
+            pass
+
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    await asyncio.gather(*(_request() for _ in range(4000)))
+    assert loop.time() - start < 2
+
+
+def _warm_hedger(latency=0.01, samples=20):
+    hedger = RequestHedger()
+    hedger.enabled = True
+    hedger._latencies.extend([latency] * samples)
+    hedger._hedged.extend([False] * samples)
+    return hedger
+
+
+def test_hedge_delay():
+    """Hedging needs to be enabled, warmed up and within its volume cap."""
+    hedger = RequestHedger()
+    assert hedger.delay() is None
+    hedger.enabled = True
+    assert hedger.delay() is None
+
+    hedger = _warm_hedger()
+    hedger._latencies.extend([5.0, 5.0])
+    assert hedger.delay() == 5.0
+    hedger._latencies.extend([0.01] * 30)
+    assert hedger.delay() == 0.01
+
+    hedger._hedged.extend([True] * 6)
+    assert hedger.delay() is None
+
+
+async def test_slow_request_is_hedged():
+    """A request slower than the percentile races a hedge, the first wins."""
+    hedger = _warm_hedger()
+    slow_cancelled = asyncio.Event()
+
+    async def _slow():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            slow_cancelled.set()
+            raise
+
+    async def _fast():
+        return "hedge"
+
+    assert await hedger.async_run(_slow, _fast) == "hedge"
+    assert hedger.hedges == 1
+    await asyncio.wait_for(slow_cancelled.wait(), 1)
+
+    async def _quick():
+        return "primary"
+
+    assert await hedger.async_run(_quick, _fast) == "primary"
+    assert hedger.hedges == 1
+
+
+async def test_hedge_falls_back_when_one_request_fails():
+    """A failed request does not win the race; two failures raise."""
+    hedger = _warm_hedger()
+
+    async def _slow_fail():
+        await asyncio.sleep(0.05)
+        raise RuntimeError("primary")
+
+    async def _fail():
+        raise RuntimeError("hedge")
+
+    async def _slow_ok():
+        await asyncio.sleep(0.05)
+        return "primary"
+
+    assert await hedger.async_run(_slow_ok, _fail) == "primary"
+    hedger._hedged.clear()
+    with pytest.raises(RuntimeError):
+        await hedger.async_run(_slow_fail, _fail)
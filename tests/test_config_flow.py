@@ -5,11 +5,15 @@ from unittest.mock import AsyncMock, MagicMock, patch
 from homeassistant import config_entries
 from homeassistant.core import HomeAssistant
 from homeassistant.data_entry_flow import FlowResultType
+from pytest_homeassistant_custom_component.common import MockConfigEntry
 
 from custom_components.easylog_cloud.config_flow import EasylogCloudConfigFlow
 from custom_components.easylog_cloud.const import (
+    CONF_INCLUDE_DEVICES,
     CONF_PASSWORD,
+    CONF_POLL_INTERVAL,
     CONF_USERNAME,
+    DATA_VALIDATED_CLIENTS,
     DOMAIN,
 )
 
@@ -62,6 +66,7 @@ async def test_flow_user_valid_auth(hass: HomeAssistant) -> None:
         mock_instance.authenticate = AsyncMock()
         mock_instance.fetch_devices_page = AsyncMock(return_value="<html></html>")
         mock_instance._extract_devices_arr_from_html = MagicMock(return_value="test")
+        mock_instance.remember_devices = MagicMock()
         mock_instance._extract_device_list = MagicMock(
             return_value=[{"id": 1, "name": "Test Device"}]
         )
@@ -79,6 +84,11 @@ async def test_flow_user_valid_auth(hass: HomeAssistant) -> None:
         CONF_USERNAME: "test@example.com",
         CONF_PASSWORD: "test-pass",
     }
+    # The signed-in client and its device list are handed to the new entry
+    assert hass.data[DATA_VALIDATED_CLIENTS]["test@example.com"] is mock_instance
+    mock_instance.remember_devices.assert_called_once_with(
+        [{"id": 1, "name": "Test Device"}]
+    )
 
 
 async def test_flow_user_no_account_name(hass: HomeAssistant) -> None:
@@ -95,6 +105,7 @@ async def test_flow_user_no_account_name(hass: HomeAssistant) -> None:
         mock_instance.authenticate = AsyncMock()
         mock_instance.fetch_devices_page = AsyncMock(return_value="<html></html>")
         mock_instance._extract_devices_arr_from_html = MagicMock(return_value="test")
+        mock_instance.remember_devices = MagicMock()
         mock_instance._extract_device_list = MagicMock(
             return_value=[{"id": 1, "name": "Test Device"}]
         )
@@ -128,6 +139,7 @@ async def test_flow_user_no_devices(hass: HomeAssistant) -> None:
         mock_instance.authenticate = AsyncMock()
         mock_instance.fetch_devices_page = AsyncMock(return_value="<html></html>")
         mock_instance._extract_devices_arr_from_html = MagicMock(return_value="")
+        mock_instance.remember_devices = MagicMock()
         mock_instance._extract_device_list = MagicMock(return_value=[])
         mock_instance.account_name = "test_user"
         mock_api.return_value = mock_instance
@@ -212,6 +224,7 @@ async def test_flow_user_extract_device_list_failure(hass: HomeAssistant) -> Non
         mock_instance.authenticate = AsyncMock()
         mock_instance.fetch_devices_page = AsyncMock(return_value="<html></html>")
         mock_instance._extract_devices_arr_from_html = MagicMock(return_value="test")
+        mock_instance.remember_devices = MagicMock()
         mock_instance._extract_device_list = MagicMock(
             side_effect=Exception("Extract failed")
         )
@@ -239,6 +252,7 @@ async def test_test_credentials_success(hass):
         mock_instance.authenticate = AsyncMock()
         mock_instance.fetch_devices_page = AsyncMock(return_value="<html></html>")
         mock_instance._extract_devices_arr_from_html = MagicMock(return_value="test")
+        mock_instance.remember_devices = MagicMock()
         mock_instance._extract_device_list = MagicMock(
             return_value=[{"id": 1, "name": "Test Device"}]
         )
@@ -264,6 +278,7 @@ async def test_test_credentials_success_no_account_name(hass):
         mock_instance.authenticate = AsyncMock()
         mock_instance.fetch_devices_page = AsyncMock(return_value="<html></html>")
         mock_instance._extract_devices_arr_from_html = MagicMock(return_value="test")
+        mock_instance.remember_devices = MagicMock()
         mock_instance._extract_device_list = MagicMock(
             return_value=[{"id": 1, "name": "Test Device"}]
         )
@@ -321,6 +336,7 @@ async def test_flow_with_valid_credentials(hass: HomeAssistant) -> None:
         mock_instance.authenticate = AsyncMock()
         mock_instance.fetch_devices_page = AsyncMock(return_value="<html></html>")
         mock_instance._extract_devices_arr_from_html = MagicMock(return_value="test")
+        mock_instance.remember_devices = MagicMock()
         mock_instance._extract_device_list = MagicMock(
             return_value=[{"id": 1, "name": "Test Device"}]
         )
@@ -371,6 +387,7 @@ async def test_flow_with_no_account_name(hass: HomeAssistant) -> None:
         mock_instance.authenticate = AsyncMock()
         mock_instance.fetch_devices_page = AsyncMock(return_value="<html></html>")
         mock_instance._extract_devices_arr_from_html = MagicMock(return_value="test")
+        mock_instance.remember_devices = MagicMock()
         mock_instance._extract_device_list = MagicMock(
             return_value=[{"id": 1, "name": "Test Device"}]
         )
@@ -399,6 +416,7 @@ async def test_flow_with_no_devices(hass: HomeAssistant) -> None:
         mock_instance.authenticate = AsyncMock()
         mock_instance.fetch_devices_page = AsyncMock(return_value="<html></html>")
         mock_instance._extract_devices_arr_from_html = MagicMock(return_value="")
+        mock_instance.remember_devices = MagicMock()
         mock_instance._extract_device_list = MagicMock(return_value=[])
         mock_instance.account_name = "test_user"
         mock_api.return_value = mock_instance
@@ -476,6 +494,7 @@ async def test_flow_with_extract_device_list_failure(hass: HomeAssistant) -> Non
         mock_instance.authenticate = AsyncMock()
         mock_instance.fetch_devices_page = AsyncMock(return_value="<html></html>")
         mock_instance._extract_devices_arr_from_html = MagicMock(return_value="test")
+        mock_instance.remember_devices = MagicMock()
         mock_instance._extract_device_list = MagicMock(
             side_effect=Exception("Extract failed")
         )
@@ -488,3 +507,33 @@ async def test_flow_with_extract_device_list_failure(hass: HomeAssistant) -> Non
 
     assert result2["type"] == FlowResultType.FORM
     assert result2["errors"] == {"base": "auth"}
+
+
+async def test_options_flow(hass: HomeAssistant) -> None:
+    """Test the options flow offers discovered devices and stores the options."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={CONF_USERNAME: "test@example.com", CONF_PASSWORD: "test-pass"},
+        options={CONF_INCLUDE_DEVICES: ["99"]},
+    )
+    entry.add_to_hass(hass)
+    coordinator = MagicMock()
+    coordinator.api_client.discovered_devices = [{"id": 1, "name": "Office"}]
+    hass.data[DOMAIN] = {entry.entry_id: coordinator}
+
+    with patch("custom_components.easylog_cloud.async_setup_entry", return_value=True):
+        result = await hass.config_entries.options.async_init(entry.entry_id)
+
+        assert result["type"] == FlowResultType.FORM
+        assert result["step_id"] == "init"
+        include = result["data_schema"].schema[CONF_INCLUDE_DEVICES]
+        assert include.options == {"99": "Device 99", "1": "Office"}
+
+        result2 = await hass.config_entries.options.async_configure(
+            result["flow_id"],
+            user_input={CONF_POLL_INTERVAL: 120, CONF_INCLUDE_DEVICES: ["1"]},
+        )
+
+    assert result2["type"] == FlowResultType.CREATE_ENTRY
+    assert entry.options[CONF_POLL_INTERVAL] == 120
+    assert entry.options[CONF_INCLUDE_DEVICES] == ["1"]
@@ -1,10 +1,22 @@
 """Test Home Assistant EasyLog Cloud coordinator."""
 
+import asyncio
+from datetime import timedelta
+import time
 from unittest.mock import AsyncMock, MagicMock, patch
 
+from homeassistant.helpers.update_coordinator import UpdateFailed
+from homeassistant.util import dt as dt_util
 import pytest
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
 
+from custom_components.easylog_cloud.const import REFRESH_COOLDOWN, SESSION_MAX_AGE
 from custom_components.easylog_cloud.coordinator import EasylogCloudCoordinator
+from custom_components.easylog_cloud.ratelimit import (
+    PRIORITY_BACKGROUND,
+    PRIORITY_INTERACTIVE,
+    request_priority,
+)
 
 
 @pytest.fixture
@@ -343,3 +355,589 @@ async def test_async_update_data_exception_handling_line_46(hass, mock_session):
     # The exception should be caught and re-raised by the coordinator
     with pytest.raises(Exception, match="API error for line 46"):
         await coordinator._async_update_data()
+
+
+async def test_entity_plan_built_once_per_snapshot(hass, mock_session):
+    """The entity plan is cached until the coordinator data changes."""
+    coordinator = EasylogCloudCoordinator(hass, "test_user", "test_pass")
+    coordinator.data = [
+        {"id": 1, "name": "Dev", "model": "EL-IOT-CO2", "CO2": {"value": 400}}
+    ]
+
+    plan = coordinator.entity_plan
+    assert coordinator.entity_plan is plan
+    assert [e.label for e in plan.sensor] == ["CO2"]
+
+    coordinator.data = []
+    assert coordinator.entity_plan is not plan
+    assert coordinator.entity_plan.sensor == []
+
+
+async def test_register_platform_adds_new_entities_incrementally(hass, mock_session):
+    """Only entities for new devices and labels are handed to the platform."""
+    coordinator = EasylogCloudCoordinator(hass, "test_user", "test_pass")
+    coordinator.data = [
+        {"id": 1, "name": "Dev 1", "model": "EL-IOT-CO2", "CO2": {"value": 400}}
+    ]
+    added = []
+
+    unregister = coordinator.async_register_platform(
+        "sensor",
+        lambda planned: added.append([(e.device["id"], e.label) for e in planned]),
+    )
+    assert added == [[(1, "CO2")]]
+
+    # Same snapshot content again: nothing new
+    coordinator.async_set_updated_data(
+        [{"id": 1, "name": "Dev 1", "model": "EL-IOT-CO2", "CO2": {"value": 410}}]
+    )
+    assert len(added) == 1
+
+    # A new channel and a new device appear
+    coordinator.async_set_updated_data(
+        [
+            {
+                "id": 1,
+                "name": "Dev 1",
+                "model": "EL-IOT-CO2",
+                "CO2": {"value": 410},
+                "Temperature": {"value": 21.0},
+            },
+            {"id": 2, "name": "Dev 2", "model": "EL-WEM+", "VOC": {"value": 12}},
+        ]
+    )
+    assert added[1] == [(1, "Temperature"), (2, "VOC")]
+
+    # An empty (failed) snapshot is ignored
+    coordinator.async_set_updated_data([])
+    assert len(added) == 2
+
+    unregister()
+    assert coordinator._unsub_entity_sync is None
+    await coordinator.async_shutdown()
+
+
+async def test_vanished_device_is_retired(hass, mock_session):
+    """A device missing from several device lists is removed from the registry."""
+    from homeassistant.helpers import device_registry as dr
+    from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+    from custom_components.easylog_cloud.const import DEVICE_RETIRE_AFTER, DOMAIN
+
+    entry = MockConfigEntry(domain=DOMAIN, entry_id="retire")
+    entry.add_to_hass(hass)
+    dev_reg = dr.async_get(hass)
+    dev_reg.async_get_or_create(
+        config_entry_id=entry.entry_id, identifiers={(DOMAIN, 2)}
+    )
+
+    coordinator = EasylogCloudCoordinator(hass, "test_user", "test_pass")
+    api = coordinator.api_client
+    coordinator.config_entry = entry
+    dev_1 = {"id": 1, "name": "Dev 1", "model": "M", "CO2": {"value": 400}}
+    dev_2 = {"id": 2, "name": "Dev 2", "model": "M", "CO2": {"value": 500}}
+    coordinator.data = [dev_1, dev_2]
+    added = []
+    unregister = coordinator.async_register_platform("sensor", added.extend)
+    assert len(added) == 2
+
+    # Missing from snapshots, e.g. filtered out or unreadable, but still listed
+    api.remember_devices([{"id": 1}, {"id": 2}])
+    for _ in range(DEVICE_RETIRE_AFTER + 1):
+        coordinator.async_set_updated_data([dev_1])
+    assert coordinator._device_misses[2] == 0
+
+    # The same device list is only counted once
+    api.remember_devices([{"id": 1}])
+    for _ in range(DEVICE_RETIRE_AFTER + 1):
+        coordinator.async_set_updated_data([dev_1])
+    assert coordinator._device_misses[2] == 1
+
+    for _ in range(DEVICE_RETIRE_AFTER - 2):
+        api.remember_devices([{"id": 1}])
+        coordinator.async_set_updated_data([dev_1])
+    assert dev_reg.async_get_device({(DOMAIN, 2)}) is not None
+
+    api.remember_devices([{"id": 1}])
+    coordinator.async_set_updated_data([])
+    assert dev_reg.async_get_device({(DOMAIN, 2)}) is None
+    assert 2 not in coordinator._device_misses
+
+    # Without a config entry the device is only forgotten, and re-added later
+    coordinator.config_entry = None
+    api.remember_devices([{"id": 1}, {"id": 2}])
+    coordinator.async_set_updated_data([dev_1, dev_2])
+    assert added[-1].device["id"] == 2
+    for _ in range(DEVICE_RETIRE_AFTER):
+        api.remember_devices([{"id": 1}])
+        coordinator.async_set_updated_data([dev_1])
+    assert 2 not in coordinator._device_misses
+
+    unregister()
+    await coordinator.async_shutdown()
+
+
+async def test_poll_filter_tracks_disabled_entities(hass, mock_session):
+    """Devices and channels with only disabled entities are skipped live."""
+    from homeassistant import config_entries
+    from homeassistant.helpers import entity_registry as er
+    from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+    from custom_components.easylog_cloud.const import DOMAIN
+
+    entry = MockConfigEntry(domain=DOMAIN, entry_id="filter")
+    entry.add_to_hass(hass)
+    ent_reg = er.async_get(hass)
+    disabled = er.RegistryEntryDisabler.USER
+    ent_reg.async_get_or_create(
+        "sensor", DOMAIN, "1_co2", config_entry=entry, disabled_by=disabled
+    )
+    ent_reg.async_get_or_create("sensor", DOMAIN, "2_co2", config_entry=entry)
+    voc = ent_reg.async_get_or_create(
+        "sensor", DOMAIN, "2_voc", config_entry=entry, disabled_by=disabled
+    )
+    ent_reg.async_get_or_create("sensor", DOMAIN, "bogus", config_entry=entry)
+
+    config_entries.current_entry.set(entry)
+    coordinator = EasylogCloudCoordinator(hass, "test_user", "test_pass")
+    config_entries.current_entry.set(None)
+
+    assert coordinator.skip_devices == {1}
+    assert coordinator.skip_channels == {2: {"voc"}}
+
+    coordinator.api_client.async_get_devices_data = AsyncMock(return_value=[])
+    await coordinator._async_update_data()
+    coordinator.api_client.async_get_devices_data.assert_awaited_once_with(
+        skip_devices={1},
+        skip_channels={2: {"voc"}},
+        include_devices=set(),
+        on_device=None,
+    )
+
+    # Renaming does not touch the filter, enabling an entity does
+    ent_reg.async_update_entity(voc.entity_id, name="Renamed")
+    await hass.async_block_till_done()
+    assert coordinator.skip_channels == {2: {"voc"}}
+
+    ent_reg.async_update_entity(voc.entity_id, disabled_by=None)
+    await hass.async_block_till_done()
+    assert coordinator.skip_devices == {1}
+    assert coordinator.skip_channels == {}
+
+    await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_poll_filter_keeps_channels_of_either_platform(hass, mock_session):
+    """A channel stays polled while its sensor or binary sensor is enabled."""
+    from homeassistant import config_entries
+    from homeassistant.helpers import entity_registry as er
+    from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+    from custom_components.easylog_cloud.const import DOMAIN
+
+    entry = MockConfigEntry(domain=DOMAIN, entry_id="platforms")
+    entry.add_to_hass(hass)
+    ent_reg = er.async_get(hass)
+    disabled = er.RegistryEntryDisabler.USER
+    ent_reg.async_get_or_create(
+        "sensor", DOMAIN, "1_door", config_entry=entry, disabled_by=disabled
+    )
+    ent_reg.async_get_or_create("binary_sensor", DOMAIN, "1_door", config_entry=entry)
+    ent_reg.async_get_or_create(
+        "sensor", DOMAIN, "1_motion", config_entry=entry, disabled_by=disabled
+    )
+    ent_reg.async_get_or_create(
+        "binary_sensor", DOMAIN, "1_motion", config_entry=entry, disabled_by=disabled
+    )
+    ent_reg.async_get_or_create(
+        "sensor", DOMAIN, "2_door", config_entry=entry, disabled_by=disabled
+    )
+    ent_reg.async_get_or_create("binary_sensor", DOMAIN, "2_door", config_entry=entry)
+
+    config_entries.current_entry.set(entry)
+    coordinator = EasylogCloudCoordinator(hass, "test_user", "test_pass")
+    config_entries.current_entry.set(None)
+
+    assert coordinator.skip_devices == set()
+    assert coordinator.skip_channels == {1: {"motion"}}
+
+    await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_apply_options(hass, mock_session):
+    """Options set the poll interval, include list and client tuning."""
+    coordinator = EasylogCloudCoordinator(
+        hass,
+        "test_user",
+        "test_pass",
+        options={
+            "poll_interval": 120,
+            "fetch_concurrency": 8,
+            "include_devices": ["1", "2"],
+        },
+    )
+
+    assert coordinator.update_interval.total_seconds() == 120
+    assert coordinator.include_devices == {1, 2}
+    assert coordinator.api_client.fetch_concurrency == 8
+
+    coordinator.apply_options({})
+    assert coordinator.update_interval.total_seconds() == 60
+    assert coordinator.include_devices == set()
+
+
+async def test_failed_updates_back_off(hass, mock_session):
+    """Each failed cycle doubles the interval up to the cap, success resets it."""
+    coordinator = EasylogCloudCoordinator(
+        hass, "test_user", "test_pass", options={"max_backoff": 300}
+    )
+    coordinator.api_client.async_get_devices_data = AsyncMock(return_value=[])
+    coordinator.api_client.last_error = Exception("boom")
+
+    intervals = []
+    for _ in range(4):
+        with pytest.raises(UpdateFailed):
+            await coordinator._async_update_data()
+        intervals.append(coordinator.update_interval.total_seconds())
+    assert intervals == [120, 240, 300, 300]
+
+    coordinator.api_client.async_get_devices_data = AsyncMock(return_value=[{"id": 1}])
+    coordinator.api_client.last_error = None
+    assert await coordinator._async_update_data() == [{"id": 1}]
+    assert coordinator.update_interval.total_seconds() == 60
+
+
+async def test_scheduled_refresh_uses_background_lane(hass, mock_session):
+    """Timer driven polls run in the background lane of the rate limiter."""
+    coordinator = EasylogCloudCoordinator(hass, "test_user", "test_pass")
+    lanes = []
+
+    async def _update():
+        lanes.append(request_priority.get())
+        return []
+
+    coordinator._async_update_data = _update
+    await coordinator.async_refresh()
+    await coordinator._handle_refresh_interval(None)
+    await coordinator.async_shutdown()
+
+    assert lanes == [PRIORITY_INTERACTIVE, PRIORITY_BACKGROUND]
+    assert request_priority.get() == PRIORITY_INTERACTIVE
+
+
+async def test_sharded_mode_polls_devices_in_groups(hass, mock_session):
+    """Sharded mode discovers devices and polls them through group coordinators."""
+    coordinator = EasylogCloudCoordinator(
+        hass,
+        "test_user",
+        "test_pass",
+        options={"sharded": True, "shard_size": 2, "include_devices": [1, 2, 3]},
+    )
+    assert coordinator.update_interval.total_seconds() == 900
+    api = coordinator.api_client
+    api.async_discover_devices = AsyncMock(
+        return_value=[{"id": 1}, {"id": 2}, {"id": 3}, {"id": 4}]
+    )
+    api.async_get_devices_data = AsyncMock(
+        side_effect=lambda skip_channels, include_devices, on_device: [
+            {"id": device_id} for device_id in sorted(include_devices)
+        ]
+    )
+
+    await coordinator.async_refresh()
+
+    assert coordinator.data == [{"id": 1}, {"id": 2}, {"id": 3}]
+    assert len(coordinator.shards) == 2
+    first, second = coordinator.shards
+    assert first.device_ids == [1, 2]
+    assert coordinator.coordinator_for(3) is second
+    assert coordinator.coordinator_for(4) is coordinator
+    assert second.update_interval.total_seconds() == 60
+
+    coordinator.apply_options(
+        {
+            "poll_interval": 30,
+            "discovery_ttl": 0,
+            "include_devices": [1, 2, 3],
+            "refresh_cooldown": 3,
+        }
+    )
+    assert coordinator.update_interval.total_seconds() == 30
+    assert second.update_interval.total_seconds() == 30
+    assert second.refresh_debouncer.cooldown == 3
+
+    # A shard refresh is merged without polling the other shards, and
+    # without waking the listeners of the parent
+    api.async_get_devices_data.reset_mock()
+    api.async_get_devices_data.side_effect = None
+    api.async_get_devices_data.return_value = [{"id": 3, "value": 1}, {"id": 5}]
+    snapshot = coordinator.data
+    parent_updates = []
+    unsub = coordinator.async_add_listener(lambda: parent_updates.append(1))
+    await second.async_refresh()
+    unsub()
+    assert coordinator.data is snapshot
+    assert coordinator.data == [{"id": 1}, {"id": 2}, {"id": 3, "value": 1}]
+    assert parent_updates == []
+    api.async_get_devices_data.assert_awaited_once_with(
+        skip_channels={}, include_devices={3}, on_device=None
+    )
+
+    # Vanished devices leave their shard, empty shards are stopped
+    api.async_discover_devices.return_value = [{"id": 1}]
+    shutdown = AsyncMock(wraps=second.async_shutdown)
+    with patch.object(second, "async_shutdown", shutdown):
+        await coordinator.async_refresh()
+    shutdown.assert_awaited_once()
+    assert coordinator.shards == [first]
+    assert first.device_ids == [1]
+    assert coordinator.data == [{"id": 1}, {"id": 2}]
+
+    await coordinator.async_shutdown()
+    assert first._shutdown_requested
+
+
+async def test_sharded_mode_failures(hass, mock_session):
+    """Discovery errors fail the parent, poll errors only their shard."""
+    coordinator = EasylogCloudCoordinator(
+        hass, "test_user", "test_pass", options={"sharded": True}
+    )
+    api = coordinator.api_client
+    api.async_discover_devices = AsyncMock(side_effect=Exception("boom"))
+    with pytest.raises(UpdateFailed, match="discovering"):
+        await coordinator._async_update_data()
+
+    api.async_discover_devices = AsyncMock(return_value=[{"id": 1}, {"id": 2}])
+    api.async_get_devices_data = AsyncMock(return_value=[])
+    api.last_error = Exception("down")
+    coordinator.skip_devices = {1}
+    await coordinator.async_refresh()
+
+    skipped, failing = coordinator.shards
+    assert skipped.last_update_success and skipped.data == []
+    assert not failing.last_update_success
+    api.async_get_devices_data.assert_awaited_once_with(
+        skip_channels={}, include_devices={2}, on_device=None
+    )
+
+    lanes = []
+
+    async def _update():
+        lanes.append(request_priority.get())
+        return []
+
+    failing._async_update_data = _update
+    failing._async_unsub_refresh()
+    await failing._handle_refresh_interval(None)
+    assert lanes == [PRIORITY_BACKGROUND]
+    await coordinator.async_shutdown()
+
+
+async def test_streamed_device_updates_only_its_entities(hass, mock_session):
+    """A streamed device replaces its entry and notifies only its listeners."""
+    coordinator = EasylogCloudCoordinator(
+        hass, "test_user", "test_pass", options={"stream_updates": True}
+    )
+    coordinator.api_client.async_get_devices_data = AsyncMock(return_value=[])
+    await coordinator._async_update_data()
+    assert (
+        coordinator.api_client.async_get_devices_data.call_args.kwargs["on_device"]
+        == coordinator._async_device_updated
+    )
+
+    # Nothing to update before the first snapshot
+    coordinator._async_device_updated({"id": 1})
+
+    coordinator.data = snapshot = [{"id": 1, "v": 0}, {"id": 2, "v": 0}]
+    calls = []
+    unsubs = [
+        coordinator.async_add_device_listener(
+            device_id, lambda d=device_id: calls.append(d)
+        )
+        for device_id in (1, 1, 2)
+    ]
+    unsubs.append(coordinator.async_add_listener(lambda: calls.append(None)))
+
+    coordinator._async_device_updated({"id": 1, "v": 1})
+    coordinator._async_device_updated({"id": 3, "v": 1})
+
+    assert calls == [1, 1]
+    assert coordinator.data == [{"id": 1, "v": 1}, {"id": 2, "v": 0}]
+    assert coordinator.data is snapshot
+    assert coordinator.device_index(2) == 1
+    for unsub in unsubs:
+        unsub()
+    assert coordinator._device_listeners == {}
+
+
+async def test_streamed_device_updates_reach_shards(hass, mock_session):
+    """In sharded mode a streamed device lands in the snapshot of its shard."""
+    coordinator = EasylogCloudCoordinator(
+        hass,
+        "test_user",
+        "test_pass",
+        options={"sharded": True, "stream_updates": True},
+    )
+    api = coordinator.api_client
+    api.async_discover_devices = AsyncMock(return_value=[{"id": 1}])
+    api.async_get_devices_data = AsyncMock(return_value=[{"id": 1, "v": 0}])
+    await coordinator.async_refresh()
+
+    shard = coordinator.coordinator_for(1)
+    assert api.async_get_devices_data.call_args.kwargs["on_device"] == (
+        coordinator._async_device_updated
+    )
+    coordinator._async_device_updated({"id": 1, "v": 1})
+    assert shard.data == [{"id": 1, "v": 1}]
+    await coordinator.async_shutdown()
+
+
+async def test_manual_refresh_bursts_are_debounced(hass, mock_session):
+    """A burst of refresh requests runs one cycle now and at most one later."""
+    coordinator = EasylogCloudCoordinator(hass, "test_user", "test_pass")
+    coordinator.api_client.async_get_devices_data = AsyncMock(return_value=[])
+
+    for _ in range(5):
+        await coordinator.async_request_refresh()
+
+    assert coordinator.refresh_debouncer.cooldown == REFRESH_COOLDOWN
+    coordinator.api_client.async_get_devices_data.assert_awaited_once()
+    await coordinator.async_shutdown()
+
+
+async def test_refresh_requests_during_a_cycle_wait_for_the_cooldown(
+    hass, mock_session
+):
+    """Requests made while a cycle runs fold into one cycle after the cooldown."""
+    coordinator = EasylogCloudCoordinator(
+        hass, "test_user", "test_pass", options={"refresh_cooldown": 0.05}
+    )
+    assert coordinator.refresh_debouncer.cooldown == 0.05
+    release = asyncio.Event()
+    cycles = []
+
+    async def _poll(**kwargs):
+        cycles.append(coordinator.updating)
+        await release.wait()
+        return []
+
+    coordinator.api_client.async_get_devices_data = _poll
+    cycle = asyncio.ensure_future(coordinator.async_refresh())
+    await asyncio.sleep(0)
+    for _ in range(3):
+        await coordinator.async_request_refresh()
+    assert cycles == [True]
+
+    release.set()
+    await cycle
+    assert not coordinator.updating
+    await asyncio.sleep(0.1)
+    await hass.async_block_till_done()
+    assert cycles == [True, True]
+    await coordinator.async_shutdown()
+
+
+async def test_refresh_devices_merges_into_snapshot(hass, mock_session):
+    """Devices refreshed on request replace their entries in the snapshot."""
+    coordinator = EasylogCloudCoordinator(hass, "test_user", "test_pass")
+    coordinator.data = [{"id": 1, "v": 0}, {"id": 2, "v": 0}]
+    coordinator.skip_channels = {2: {"voc"}}
+    coordinator.api_client.async_refresh_devices = AsyncMock(
+        return_value=[{"id": 2, "v": 1}]
+    )
+
+    await coordinator.async_refresh_devices({2})
+
+    coordinator.api_client.async_refresh_devices.assert_awaited_once_with(
+        {2}, {2: {"voc"}}
+    )
+    assert coordinator.data == [{"id": 1, "v": 0}, {"id": 2, "v": 1}]
+
+
+async def test_prewarm_runs_ahead_of_scheduled_polls(hass, mock_session):
+    """A pre-warm is scheduled before each poll and runs in the background."""
+    coordinator = EasylogCloudCoordinator(hass, "test_user", "test_pass")
+    coordinator.api_client.async_get_devices_data = AsyncMock(return_value=[])
+    lanes = []
+    coordinator.api_client.async_prewarm = AsyncMock(
+        side_effect=lambda lead: lanes.append(request_priority.get())
+    )
+    unsub = coordinator.async_add_listener(lambda: None)
+    await coordinator.async_refresh()
+    assert coordinator._unsub_prewarm is not None
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=56))
+    await hass.async_block_till_done()
+    coordinator.api_client.async_prewarm.assert_awaited_once_with(5)
+    assert lanes == [PRIORITY_BACKGROUND]
+    assert coordinator._unsub_prewarm is None
+
+    # Nothing to pre-warm for polls closer than twice the lead
+    coordinator.apply_options({"poll_interval": 10})
+    await coordinator.async_refresh()
+    assert coordinator._unsub_prewarm is None
+
+    coordinator.apply_options({})
+    await coordinator.async_refresh()
+    unsub()
+    assert coordinator._unsub_prewarm is None
+    await coordinator.async_shutdown()
+
+
+async def test_session_is_renewed_before_it_expires(hass, mock_session):
+    """The shared login is renewed from its own age, also by shard polls."""
+    coordinator = EasylogCloudCoordinator(
+        hass, "test_user", "test_pass", options={"sharded": True}
+    )
+    api = coordinator.api_client
+    api.async_discover_devices = AsyncMock(return_value=[{"id": 1}])
+
+    async def _poll(skip_channels, include_devices, on_device):
+        api._authenticated_at = time.monotonic()
+        return [{"id": 1}]
+
+    api.async_get_devices_data = AsyncMock(side_effect=_poll)
+    lanes = []
+
+    async def _prewarm(lead):
+        lanes.append(request_priority.get())
+        api._authenticated_at = time.monotonic()
+
+    api.async_prewarm = AsyncMock(side_effect=_prewarm)
+    unsub = coordinator.async_add_listener(lambda: None)
+    await coordinator.async_refresh()
+
+    # The shard signed in, the renewal is timed from that login
+    assert api.session_expires_in == pytest.approx(SESSION_MAX_AGE, abs=1)
+    assert coordinator._unsub_session_renewal is not None
+    async_fire_time_changed(
+        hass, dt_util.utcnow() + timedelta(seconds=SESSION_MAX_AGE - 4)
+    )
+    await hass.async_block_till_done()
+    api.async_prewarm.assert_any_await(5)
+    assert PRIORITY_BACKGROUND in lanes
+    assert coordinator._unsub_session_renewal is not None
+
+    # Polls rarer than a session do not keep it alive in between
+    coordinator.apply_options({"sharded": True, "poll_interval": SESSION_MAX_AGE})
+    await coordinator.shards[0].async_refresh()
+    assert coordinator._unsub_session_renewal is None
+
+    # Nor is a login kept that is about to expire or gone
+    coordinator.apply_options({"sharded": True})
+    api._authenticated_at = time.monotonic() - SESSION_MAX_AGE
+    coordinator._schedule_session_renewal()
+    assert coordinator._unsub_session_renewal is None
+    assert api.session_expires_in < 0
+    api._authenticated_at = None
+    coordinator._schedule_session_renewal()
+    assert coordinator._unsub_session_renewal is None
+    assert api.session_expires_in is None
+
+    api._authenticated_at = time.monotonic()
+    coordinator._schedule_session_renewal()
+    unsub()
+    assert coordinator._unsub_session_renewal is None
+    coordinator._schedule_session_renewal()
+    await coordinator.async_shutdown()
+    assert coordinator._unsub_session_renewal is None
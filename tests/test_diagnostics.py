@@ -0,0 +1,48 @@
+"""Test Home Assistant EasyLog Cloud diagnostics."""
+
+from unittest.mock import patch
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.easylog_cloud.const import DOMAIN
+from custom_components.easylog_cloud.coordinator import EasylogCloudCoordinator
+from custom_components.easylog_cloud.diagnostics import (
+    async_get_config_entry_diagnostics,
+)
+
+from .const import MOCK_CONFIG
+
+
+async def test_config_entry_diagnostics(hass):
+    """Diagnostics redact credentials and report the fetch concurrency."""
+    entry = MockConfigEntry(
+        domain=DOMAIN, data=MOCK_CONFIG, options={"fetch_concurrency": 6}
+    )
+    with patch("custom_components.easylog_cloud.api.async_get_clientsession"):
+        coordinator = EasylogCloudCoordinator(
+            hass, "test_user", "test_pass", options=entry.options
+        )
+    coordinator.data = [{"id": 1, "name": "Office"}]
+    hass.data[DOMAIN] = {entry.entry_id: coordinator}
+
+    diagnostics = await async_get_config_entry_diagnostics(hass, entry)
+
+    assert diagnostics["entry"]["data"] == {
+        "username": "**REDACTED**",
+        "password": "**REDACTED**",
+    }
+    assert diagnostics["entry"]["options"] == {"fetch_concurrency": 6}
+    assert diagnostics["polling"]["devices"] == 1
+    assert diagnostics["polling"]["update_interval"] == 60
+    assert diagnostics["polling"]["shards"] == 0
+    assert diagnostics["status_fetch"] == {
+        "concurrency": 6,
+        "max_concurrency": 16,
+        "average_latency": None,
+        "hedging": False,
+        "hedge_delay": None,
+        "hedged_requests": 0,
+        "cancelled_by_watchdog": 0,
+        "cycle_budget": 45,
+        "carried_over": 0,
+    }
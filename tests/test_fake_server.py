@@ -0,0 +1,120 @@
+"""Drive the client and coordinator end to end against a local stand-in."""
+
+import asyncio
+from unittest.mock import patch
+
+import aiohttp
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.easylog_cloud import async_setup_entry, async_unload_entry
+from custom_components.easylog_cloud.api import HAEasylogCloudApiClient
+from custom_components.easylog_cloud.const import (
+    DATA_DEVICE_STATUS,
+    DATA_RATE_LIMITER,
+    DATA_VALIDATED_CLIENTS,
+    DOMAIN,
+)
+from custom_components.easylog_cloud.ratelimit import RateLimiter
+
+from .const import MOCK_CONFIG
+from .fake_easylog import DEVICES, LOGIN, STATUS, FakeEasylogServer
+
+
+@pytest.fixture
+async def http_session(socket_enabled):
+    """A plain aiohttp session, like the one Home Assistant shares."""
+    session = aiohttp.ClientSession()
+    yield session
+    await session.close()
+
+
+async def test_entry_polls_thousands_of_devices(hass, http_session):
+    """A full cycle over 2,000 devices needs one login and one device page.
+
+    The entry is set up like Home Assistant does it, so the client comes
+    from the registry with the shared rate limiter and status cache.
+    """
+    username, password = MOCK_CONFIG["username"], MOCK_CONFIG["password"]
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data=MOCK_CONFIG,
+        options={"fetch_concurrency": 16, "account_budget": 0},
+    )
+    # The limiter of the live site would take minutes over 2,000 requests
+    limiter = hass.data[DATA_RATE_LIMITER] = RateLimiter(rate=100_000, burst=100)
+    async with FakeEasylogServer(
+        2000, username=username, password=password, latency={STATUS: 0.001}
+    ) as server:
+        # The client the config flow validated, adopted by the registry
+        hass.data[DATA_VALIDATED_CLIENTS] = {
+            username: HAEasylogCloudApiClient(
+                hass, username, password, server.transport(http_session)
+            )
+        }
+        with patch.object(limiter, "async_acquire", wraps=limiter.async_acquire):
+            with patch.object(
+                hass.config_entries, "async_forward_entry_setups", return_value=True
+            ):
+                assert await async_setup_entry(hass, entry)
+
+            coordinator = hass.data[DOMAIN][entry.entry_id]
+            assert coordinator.last_update_success
+            assert len(coordinator.data) == 2000
+            assert coordinator.data[0]["CO2"]["value"] is not None
+            assert server.requests == {LOGIN: 2, DEVICES: 1, STATUS: 2000}
+            assert limiter.async_acquire.await_count == sum(server.requests.values())
+        assert coordinator.api_client.status_cache is hass.data[DATA_DEVICE_STATUS]
+        assert len(hass.data[DATA_DEVICE_STATUS]._results) == 2000
+
+        with patch.object(
+            hass.config_entries, "async_unload_platforms", return_value=True
+        ):
+            assert await async_unload_entry(hass, entry)
+        await coordinator.async_shutdown()
+
+
+async def test_xml_status_and_server_errors(hass, http_session):
+    """XML-wrapped statuses decode, failing devices drop out of the cycle."""
+    async with FakeEasylogServer(
+        50, xml_status=True, error_rate={STATUS: 0.2}, seed=1
+    ) as server:
+        api = HAEasylogCloudApiClient(
+            hass, "test_user", "test_pass", server.transport(http_session)
+        )
+
+        devices = await api.async_get_devices_data()
+
+        assert api.last_error is None
+        assert 25 < len(devices) < 50
+        assert all(device["Humidity"]["value"] is not None for device in devices)
+
+
+async def test_expired_session_signs_in_with_cached_form_tokens(hass, http_session):
+    """Sessions the server expires are renewed, with cached tokens if possible."""
+    async with FakeEasylogServer(5, session_ttl=0.2) as server:
+        api = HAEasylogCloudApiClient(
+            hass, "test_user", "test_pass", server.transport(http_session)
+        )
+        await api.async_get_devices_data()
+        assert server.requests[LOGIN] == 2
+
+        # The server drops the session long before the client would
+        await asyncio.sleep(0.2)
+        devices = await api.async_get_devices_data()
+        assert api.last_error is None
+        assert len(devices) == 5
+        assert all(device["CO2"]["value"] is not None for device in devices)
+        assert server.requests[LOGIN] == 3
+        assert not api.quarantine.quarantined
+
+        # A new view state (e.g. a deployment) invalidates the cached tokens
+        server.session_ttl = None
+        server.expire_sessions()
+        server.viewstate = "changed"
+        api.discovery_ttl = 0
+        devices = await api.async_get_devices_data()
+        assert len(devices) == 5
+        assert all(device["CO2"]["value"] is not None for device in devices)
+        assert server.requests[LOGIN] == 6
+        assert server.requests[DEVICES] == 3
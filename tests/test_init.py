@@ -1,6 +1,6 @@
 """Test Home Assistant EasyLog Cloud setup process."""
 
-from unittest.mock import patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 from homeassistant.exceptions import ConfigEntryNotReady
 import pytest
@@ -11,8 +11,10 @@ from custom_components.easylog_cloud import (
     async_reload_entry,
     async_setup_entry,
     async_unload_entry,
+    async_update_options,
 )
 from custom_components.easylog_cloud.const import (
+    DATA_VALIDATED_CLIENTS,
     DOMAIN,
 )
 
@@ -98,3 +100,52 @@ async def test_async_setup(hass):
 
     assert result is True
     assert DOMAIN in hass.data
+
+
+async def test_update_options_applies_to_coordinator(hass):
+    """Changed options are pushed to the running coordinator."""
+    config_entry = MockConfigEntry(
+        domain=DOMAIN, data=MOCK_CONFIG, options={"poll_interval": 30}
+    )
+    coordinator = MagicMock(sharded=False, shard_size=1)
+    hass.data[DOMAIN] = {config_entry.entry_id: coordinator}
+
+    await async_update_options(hass, config_entry)
+
+    coordinator.apply_options.assert_called_once_with({"poll_interval": 30})
+
+
+async def test_update_options_reloads_when_sharding_changes(hass):
+    """Turning sharded mode on rebuilds the coordinators through a reload."""
+    config_entry = MockConfigEntry(
+        domain=DOMAIN, data=MOCK_CONFIG, options={"sharded": True}
+    )
+    coordinator = MagicMock(sharded=False, shard_size=1)
+    hass.data[DOMAIN] = {config_entry.entry_id: coordinator}
+
+    with patch.object(hass.config_entries, "async_reload") as reload:
+        await async_update_options(hass, config_entry)
+
+    reload.assert_awaited_once_with(config_entry.entry_id)
+    coordinator.apply_options.assert_not_called()
+
+
+async def test_setup_entry_reuses_validated_client(hass, bypass_get_data):
+    """The client validated by the config flow is adopted by the coordinator."""
+    config_entry = MockConfigEntry(domain=DOMAIN, data=MOCK_CONFIG, entry_id="test")
+    api_client = MagicMock()
+    api_client.last_error = None
+    api_client.async_get_devices_data = AsyncMock(return_value=[])
+    hass.data[DATA_VALIDATED_CLIENTS] = {MOCK_CONFIG["username"]: api_client}
+
+    with patch(
+        "homeassistant.config_entries.ConfigEntries.async_forward_entry_setups",
+        return_value=True,
+    ):
+        assert await async_setup_entry(hass, config_entry)
+
+    coordinator = hass.data[DOMAIN][config_entry.entry_id]
+    assert coordinator.api_client is api_client
+    api_client.apply_options.assert_called_once()
+    assert hass.data[DATA_VALIDATED_CLIENTS] == {}
+    await coordinator.async_shutdown()
@@ -0,0 +1,81 @@
+"""Test Home Assistant EasyLog Cloud label metadata registry."""
+
+from datetime import datetime, timezone
+
+from homeassistant.components.binary_sensor import BinarySensorDeviceClass
+from homeassistant.components.sensor import SensorDeviceClass, SensorStateClass
+from homeassistant.helpers.entity import EntityCategory
+
+from custom_components.easylog_cloud.labels import get_label_metadata, to_binary_state
+
+
+def test_label_metadata_is_cached():
+    """The same metadata object is returned for repeated lookups."""
+    assert get_label_metadata("Temperature") is get_label_metadata("Temperature")
+
+
+def test_numeric_label_detection():
+    """VOC, particulate and air quality labels are numeric measurements."""
+    assert get_label_metadata("VOC Level").numeric is True
+    assert get_label_metadata("PM2.5").numeric is True
+    assert get_label_metadata("Air Quality Index").numeric is True
+    assert get_label_metadata("Temperature").numeric is False
+
+
+def test_label_metadata_classification():
+    """Labels resolve to the expected device class, state class and category."""
+    temp = get_label_metadata("Temperature")
+    assert temp.device_class == SensorDeviceClass.TEMPERATURE
+    assert temp.state_class is None
+    assert temp.entity_category is None
+
+    voc = get_label_metadata("VOC")
+    assert voc.device_class is None
+    assert voc.state_class == SensorStateClass.MEASUREMENT
+    assert voc.numeric is True
+
+    signal = get_label_metadata("WiFi Signal")
+    assert signal.device_class == SensorDeviceClass.SIGNAL_STRENGTH
+    assert signal.entity_category == EntityCategory.DIAGNOSTIC
+
+    assert get_label_metadata("Door").binary_device_class == (
+        BinarySensorDeviceClass.DOOR
+    )
+    assert get_label_metadata("Firmware Version").binary_device_class is None
+
+
+def test_label_metadata_native_unit():
+    """Units are only kept for classified labels and humidity is normalised."""
+    assert get_label_metadata("Humidity").native_unit("%RH") == "%"
+    assert get_label_metadata("Humidity").native_unit("%") == "%"
+    assert get_label_metadata("PM10").native_unit("µg/m³") == "µg/m³"
+    assert get_label_metadata("SSID").native_unit("") is None
+
+
+def test_label_metadata_converters():
+    """Each label binds the converter matching its type."""
+    passthrough = get_label_metadata("SSID").converter
+    assert passthrough("MyWiFi") == "MyWiFi"
+    assert passthrough("unknown") is None
+
+    numeric = get_label_metadata("Air Quality").converter
+    assert numeric("12") == 12.0
+    assert numeric(None) is None
+    assert numeric("unknown") is None
+    assert numeric("n/a") is None
+
+    timestamp = get_label_metadata("Last Updated").converter
+    now = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    assert timestamp(now) is now
+    assert timestamp("2024-01-01T00:00:00") == now
+    assert timestamp("unknown") is None
+    assert timestamp("not a date") is None
+    assert timestamp(None) is None
+
+
+def test_to_binary_state():
+    """Binary readings are coerced from strings and numbers."""
+    assert to_binary_state("ON") is True
+    assert to_binary_state("off") is False
+    assert to_binary_state(1) is True
+    assert to_binary_state(None) is False
@@ -0,0 +1,67 @@
+"""Test Home Assistant EasyLog Cloud entity plan."""
+
+from custom_components.easylog_cloud.const import BINARY_SENSOR, SENSOR
+from custom_components.easylog_cloud.plan import (
+    build_entity_plan,
+    label_platforms,
+    parse_unique_id,
+    unique_id,
+)
+
+
+def test_label_platforms():
+    """Labels are sorted by platform from their name only."""
+    assert label_platforms("Temperature") == (SENSOR,)
+    assert label_platforms("Fan Switch") == (SENSOR,)
+    assert label_platforms("Door Contact") == (SENSOR, BINARY_SENSOR)
+    assert label_platforms("Motion") == (SENSOR, BINARY_SENSOR)
+    # Levels and measurements stay sensors whatever they read
+    assert label_platforms("Alarm") == (SENSOR,)
+    assert label_platforms("Power") == (SENSOR,)
+    assert label_platforms("Battery") == (SENSOR,)
+    assert label_platforms("Window Temp") == (SENSOR,)
+
+
+def test_build_entity_plan():
+    """A snapshot is walked once into per-platform entity lists."""
+    devices = [
+        {
+            "id": 1,
+            "name": "Dev 1",
+            "model": "EL-IOT-CO2",
+            "CO2": {"value": 400, "unit": "ppm"},
+            "Motion": {"value": "true", "unit": ""},
+        },
+        {
+            "id": 2,
+            "name": "Dev 2",
+            "model": "EL-WEM+",
+            "Relay Switch": {"value": "on", "unit": ""},
+        },
+    ]
+
+    plan = build_entity_plan(devices)
+
+    assert [(e.device["id"], e.label) for e in plan.sensor] == [
+        (1, "CO2"),
+        (1, "Motion"),
+        (2, "Relay Switch"),
+    ]
+    assert [(e.device["id"], e.label) for e in plan.binary_sensor] == [(1, "Motion")]
+    assert plan.switch == []
+    assert plan.devices == {1: devices[0], 2: devices[1]}
+
+
+def test_build_entity_plan_empty():
+    """No snapshot yields an empty plan."""
+    plan = build_entity_plan(None)
+
+    assert plan.sensor == [] and plan.binary_sensor == [] and plan.switch == []
+    assert plan.devices == {}
+
+
+def test_unique_id_round_trip():
+    """Unique ids are built from and parsed back into device id and label key."""
+    assert unique_id(12, "Wi-Fi Signal") == "12_wi-fi_signal"
+    assert parse_unique_id("12_wi-fi_signal") == (12, "wi-fi_signal")
+    assert parse_unique_id("not_an_id") is None
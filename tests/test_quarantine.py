@@ -0,0 +1,51 @@
+"""Test Home Assistant EasyLog Cloud device quarantine."""
+
+from datetime import timedelta
+from unittest.mock import patch
+
+from homeassistant.util import dt as dt_util
+
+from custom_components.easylog_cloud.const import (
+    QUARANTINE_AFTER,
+    QUARANTINE_INTERVAL,
+    QUARANTINE_OFFLINE_AFTER,
+)
+from custom_components.easylog_cloud.quarantine import DeviceQuarantine
+
+MONOTONIC = "custom_components.easylog_cloud.quarantine.time.monotonic"
+
+
+def test_failing_device_is_quarantined_and_released():
+    """Consecutive failures move a device to the slow lane until it reports."""
+    quarantine = DeviceQuarantine()
+    with patch(MONOTONIC, return_value=1000.0) as monotonic:
+        for _ in range(QUARANTINE_AFTER - 1):
+            quarantine.record(1, False)
+        assert quarantine.is_due(1)
+        assert quarantine.quarantined == set()
+
+        quarantine.record(1, False)
+        assert quarantine.quarantined == {1}
+        assert not quarantine.is_due(1)
+
+        monotonic.return_value = 1000.0 + QUARANTINE_INTERVAL
+        assert quarantine.is_due(1)
+        quarantine.record(1, False)
+        assert not quarantine.is_due(1)
+
+        quarantine.record(1, True, dt_util.utcnow())
+        assert quarantine.quarantined == set()
+        assert quarantine.is_due(1)
+
+
+def test_offline_device_is_quarantined_at_once():
+    """A device whose last communication is too old is quarantined directly."""
+    quarantine = DeviceQuarantine()
+    stale = dt_util.utcnow() - timedelta(seconds=QUARANTINE_OFFLINE_AFTER + 60)
+
+    quarantine.record(1, True, stale)
+    assert quarantine.quarantined == {1}
+
+    # A healthy device that was never quarantined stays untouched
+    quarantine.record(2, True)
+    assert quarantine.quarantined == {1}
@@ -0,0 +1,134 @@
+"""Test Home Assistant EasyLog Cloud rate limiter."""
+
+import asyncio
+from datetime import timedelta
+from unittest.mock import patch
+
+from homeassistant.util import dt as dt_util
+import pytest
+
+from custom_components.easylog_cloud.const import DEFAULT_RETRY_AFTER
+from custom_components.easylog_cloud.ratelimit import (
+    PRIORITY_BACKGROUND,
+    PRIORITY_INTERACTIVE,
+    RateLimitedError,
+    RateLimiter,
+    parse_retry_after,
+    request_priority,
+)
+
+
+def test_parse_retry_after():
+    """Retry-After accepts seconds and HTTP dates, with a fallback."""
+    assert parse_retry_after("12") == 12
+    assert parse_retry_after("-3") == 0
+    assert parse_retry_after(None) == DEFAULT_RETRY_AFTER
+    assert parse_retry_after("soon") == DEFAULT_RETRY_AFTER
+    retry_at = dt_util.utcnow() + timedelta(seconds=30)
+    date = retry_at.strftime("%a, %d %b %Y %H:%M:%S GMT")
+    assert 25 < parse_retry_after(date) <= 30
+    assert str(RateLimitedError(5)) == "Rate limited by EasyLog Cloud, retry in 5s"
+
+
+async def test_burst_then_rate():
+    """The bucket allows a burst and then refills at the configured rate."""
+    limiter = RateLimiter(rate=100, burst=2, account_budget=100)
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    for _ in range(4):
+        await limiter.async_acquire("a")
+    assert 0.015 <= loop.time() - start < 0.5
+
+
+async def test_interactive_lane_goes_first():
+    """Waiting interactive requests are served before background ones."""
+    limiter = RateLimiter(rate=50, burst=1, account_budget=100)
+    await limiter.async_acquire("a")
+    order = []
+
+    async def _request(name, priority):
+        await limiter.async_acquire("a", priority)
+        order.append(name)
+
+    background = asyncio.ensure_future(_request("background", PRIORITY_BACKGROUND))
+    await asyncio.sleep(0)
+    token = request_priority.set(PRIORITY_INTERACTIVE)
+    interactive = asyncio.ensure_future(_request("interactive", None))
+    request_priority.reset(token)
+    await asyncio.gather(background, interactive)
+    assert order == ["interactive", "background"]
+
+
+async def test_account_budget_does_not_block_others():
+    """An account out of budget waits without holding up other accounts."""
+    limiter = RateLimiter(rate=1000, burst=10, account_budget=1)
+    await limiter.async_acquire("busy")
+
+    blocked = asyncio.ensure_future(limiter.async_acquire("busy"))
+    await asyncio.sleep(0)
+    await asyncio.wait_for(limiter.async_acquire("idle"), 1)
+    assert not blocked.done()
+
+    with patch(
+        "custom_components.easylog_cloud.ratelimit.time.monotonic",
+        return_value=limiter._sent["busy"][0] + 61,
+    ):
+        limiter._unpark("busy")
+        await asyncio.wait_for(blocked, 1)
+
+
+async def test_account_budget_per_request():
+    """A request's own budget overrides the limiter's, 0 being no limit."""
+    limiter = RateLimiter(rate=1000, burst=10, account_budget=1)
+    for _ in range(3):
+        await asyncio.wait_for(limiter.async_acquire("a", budget=0), 1)
+    blocked = asyncio.ensure_future(limiter.async_acquire("a", budget=3))
+    await asyncio.sleep(0)
+    assert not blocked.done()
+    assert len(limiter._parked["a"]) == 1
+    blocked.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await blocked
+    limiter._unpark("a")
+    assert limiter._queue == []
+
+
+async def test_many_waiters_are_served_in_order():
+    """Thousands of waiters are woken one at a time, in arrival order."""
+    limiter = RateLimiter(rate=100_000, burst=1, account_budget=0)
+    order = []
+
+    async def _request(index):
+        await limiter.async_acquire("a")
+        order.append(index)
+
+    await asyncio.wait_for(
+        asyncio.gather(*(_request(index) for index in range(2_000))), 5
+    )
+    assert order == list(range(2_000))
+    assert limiter._queue == []
+
+
+async def test_pause_holds_all_requests():
+    """A Retry-After pause delays every request."""
+    limiter = RateLimiter(rate=1000, burst=10, account_budget=100)
+    limiter.pause(0.05)
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    await limiter.async_acquire("a")
+    assert loop.time() - start >= 0.04
+
+
+async def test_cancelled_waiter_leaves_the_queue():
+    """A cancelled request frees its place for the next one."""
+    limiter = RateLimiter(rate=20, burst=1, account_budget=100)
+    await limiter.async_acquire("a")
+    first = asyncio.ensure_future(limiter.async_acquire("a", PRIORITY_INTERACTIVE))
+    await asyncio.sleep(0)
+    second = asyncio.ensure_future(limiter.async_acquire("a"))
+    await asyncio.sleep(0)
+    first.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await first
+    await asyncio.wait_for(second, 1)
+    assert limiter._queue == []
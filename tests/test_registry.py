@@ -0,0 +1,148 @@
+"""Test Home Assistant EasyLog Cloud shared client registry."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from custom_components.easylog_cloud.const import (
+    DATA_CLIENTS,
+    DATA_DEVICE_STATUS,
+    DATA_RATE_LIMITER,
+    DATA_VALIDATED_CLIENTS,
+    SHARED_RESULT_WINDOW,
+)
+from custom_components.easylog_cloud.registry import (
+    DeviceStatusCache,
+    async_acquire_client,
+    async_release_client,
+)
+
+
+async def test_client_is_shared_per_account(hass):
+    """Entries of the same account share one client until the last releases."""
+    validated = MagicMock()
+    hass.data[DATA_VALIDATED_CLIENTS] = {"User@example.com": validated}
+
+    first = async_acquire_client(hass, "User@example.com", "secret")
+    assert first is validated
+    assert first.result_window == 0
+
+    second = async_acquire_client(hass, "user@example.com ", "secret")
+    assert second is first
+    assert first.result_window == SHARED_RESULT_WINDOW
+
+    other = async_acquire_client(hass, "other@example.com", "secret")
+    assert other is not first
+    assert other.status_cache is first.status_cache
+    assert other.rate_limiter is first.rate_limiter
+
+    async_release_client(hass, "user@example.com")
+    assert first.result_window == 0
+    async_release_client(hass, "User@example.com")
+    assert "user@example.com" not in hass.data[DATA_CLIENTS]
+
+    # Releasing an unknown account is a no-op
+    async_release_client(hass, "user@example.com")
+    assert "other@example.com" in hass.data[DATA_CLIENTS]
+    async_release_client(hass, "other@example.com")
+    assert DATA_DEVICE_STATUS not in hass.data
+    assert DATA_RATE_LIMITER not in hass.data
+
+
+async def test_device_status_cache_shares_across_clients():
+    """A status fetched by one client is reused by the others in the window."""
+    cache = DeviceStatusCache(window=30)
+    first, second = object(), object()
+    fetch = AsyncMock(return_value={"id": 1})
+
+    assert await cache.async_fetch(first, 1, fetch) == {"id": 1}
+    assert await cache.async_fetch(second, 1, fetch) == {"id": 1}
+    fetch.assert_awaited_once()
+
+    # The client that fetched it polls again on its next cycle
+    await cache.async_fetch(first, 1, fetch)
+    assert fetch.await_count == 2
+
+    cache.window = 0
+    await cache.async_fetch(second, 1, fetch)
+    assert fetch.await_count == 3
+
+
+async def test_device_status_cache_joins_inflight_fetch():
+    """Waiting clients share an in-flight fetch and retry when it fails."""
+    cache = DeviceStatusCache(window=0)
+    first, second = object(), object()
+    release = asyncio.Event()
+
+    async def _slow(result):
+        await release.wait()
+        return result
+
+    own = AsyncMock(return_value={"id": 1, "via": "second"})
+    joined = asyncio.ensure_future(
+        cache.async_fetch(first, 1, lambda: _slow({"id": 1}))
+    )
+    await asyncio.sleep(0)
+    waiting = asyncio.ensure_future(cache.async_fetch(second, 1, own))
+    await asyncio.sleep(0)
+    release.set()
+    assert await joined == await waiting == {"id": 1}
+    own.assert_not_awaited()
+
+    # A failed or empty shared fetch falls back to the waiting client's session
+    for outcome in (None, Exception("boom")):
+        release.clear()
+
+        async def _failing(outcome=outcome):
+            await release.wait()
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        failing = asyncio.ensure_future(cache.async_fetch(first, 2, _failing))
+        await asyncio.sleep(0)
+        waiting = asyncio.ensure_future(cache.async_fetch(second, 2, own))
+        await asyncio.sleep(0)
+        release.set()
+        assert await waiting == {"id": 1, "via": "second"}
+        if outcome is None:
+            assert await failing is None
+        else:
+            with pytest.raises(Exception):
+                await failing
+    assert own.await_count == 2
+
+
+async def test_device_status_cache_cancels_abandoned_fetch():
+    """A fetch is cancelled once every client waiting for it is cancelled."""
+    cache = DeviceStatusCache(window=0)
+    first, second = object(), object()
+    started = asyncio.Event()
+    cancelled = asyncio.Event()
+
+    async def _hang():
+        started.set()
+        try:
+            await asyncio.sleep(10)
+        finally:
+            cancelled.set()
+
+    owner = asyncio.ensure_future(cache.async_fetch(first, 1, _hang))
+    await started.wait()
+    joined = asyncio.ensure_future(cache.async_fetch(second, 1, _hang))
+    await asyncio.sleep(0)
+
+    owner.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await owner
+    await asyncio.sleep(0)
+    assert not cancelled.is_set()
+
+    joined.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await joined
+    await asyncio.wait_for(cancelled.wait(), 1)
+    await asyncio.sleep(0)
+    assert cache._inflight == {}
+    assert cache._waiters == {}
@@ -7,10 +7,23 @@ from homeassistant.helpers.entity import EntityCategory
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
 from custom_components.easylog_cloud.const import DOMAIN
+from custom_components.easylog_cloud.coordinator import EasylogCloudCoordinator
 
 from .const import MOCK_CONFIG
 
 
+class MockCoordinator:
+    """Coordinator stand-in holding a snapshot, looked up by device id."""
+
+    def __init__(self, data=None):
+        self.data = data
+
+    def device_index(self, device_id):
+        return next(
+            (i for i, d in enumerate(self.data or []) if d["id"] == device_id), None
+        )
+
+
 async def test_sensor_setup(hass):
     """Test sensor setup."""
     from custom_components.easylog_cloud.sensor import async_setup_entry
@@ -40,9 +53,9 @@ async def test_sensor_setup(hass):
 
     # Set up the entry with mocked data
     hass.data.setdefault(DOMAIN, {})
-    hass.data[DOMAIN][config_entry.entry_id] = type(
-        "MockCoordinator", (), {"data": mock_data}
-    )()
+    coordinator = EasylogCloudCoordinator(hass, "test_user", "test_pass")
+    coordinator.data = mock_data
+    hass.data[DOMAIN][config_entry.entry_id] = coordinator
 
     # Track added entities
     added_entities = []
@@ -52,6 +65,7 @@ async def test_sensor_setup(hass):
 
     # Test setup
     await async_setup_entry(hass, config_entry, mock_add_entities)
+    await coordinator.async_shutdown()
 
     # Verify that all sensors were added (excluding id, name, model)
     assert len(added_entities) == 11
@@ -134,7 +148,7 @@ def test_device_class_guessing():
     from custom_components.easylog_cloud.sensor import EasylogCloudSensor
 
     # Create a mock coordinator and device
-    mock_coordinator = type("MockCoordinator", (), {})()
+    mock_coordinator = MockCoordinator()
     mock_device = {"id": 1, "name": "Test Device"}
 
     # Test temperature detection
@@ -185,7 +199,7 @@ def test_state_class_guessing():
     from custom_components.easylog_cloud.sensor import EasylogCloudSensor
 
     # Create a mock coordinator and device
-    mock_coordinator = type("MockCoordinator", (), {})()
+    mock_coordinator = MockCoordinator()
     mock_device = {"id": 1, "name": "Test Device"}
 
     # Test numeric sensors (should have measurement state class)
@@ -217,39 +231,6 @@ def test_state_class_guessing():
     assert regular_sensor._attr_state_class is None
 
 
-def test_numeric_sensor_detection():
-    """Test numeric sensor detection logic."""
-    from custom_components.easylog_cloud.sensor import EasylogCloudSensor
-
-    # Create a mock coordinator and device
-    mock_coordinator = type("MockCoordinator", (), {})()
-    mock_device = {"id": 1, "name": "Test Device"}
-
-    # Test VOC detection
-    voc_sensor = EasylogCloudSensor(
-        mock_coordinator, mock_device, "VOC Level", {"value": 150}
-    )
-    assert voc_sensor._is_numeric_sensor("VOC Level") is True
-
-    # Test particulate detection
-    pm25_sensor = EasylogCloudSensor(
-        mock_coordinator, mock_device, "PM2.5", {"value": 10}
-    )
-    assert pm25_sensor._is_numeric_sensor("PM2.5") is True
-
-    # Test air quality detection
-    aqi_sensor = EasylogCloudSensor(
-        mock_coordinator, mock_device, "Air Quality Index", {"value": 50}
-    )
-    assert aqi_sensor._is_numeric_sensor("Air Quality Index") is True
-
-    # Test regular sensor
-    temp_sensor = EasylogCloudSensor(
-        mock_coordinator, mock_device, "Temperature", {"value": 25.5}
-    )
-    assert temp_sensor._is_numeric_sensor("Temperature") is False
-
-
 def test_sensor_native_value_property():
     """Test the native_value property of sensors."""
     from custom_components.easylog_cloud.sensor import EasylogCloudSensor
@@ -269,7 +250,7 @@ def test_sensor_native_value_property():
         }
     ]
 
-    mock_coordinator = type("MockCoordinator", (), {"data": mock_data})()
+    mock_coordinator = MockCoordinator(mock_data)
 
     mock_device = mock_data[0]
 
@@ -345,7 +326,7 @@ def test_sensor_device_info():
         }
     ]
 
-    mock_coordinator = type("MockCoordinator", (), {"data": mock_data})()
+    mock_coordinator = MockCoordinator(mock_data)
 
     mock_device = mock_data[0]
     sensor = EasylogCloudSensor(
@@ -376,7 +357,7 @@ def test_humidity_unit_conversion():
     from custom_components.easylog_cloud.sensor import EasylogCloudSensor
 
     # Create a mock coordinator and device
-    mock_coordinator = type("MockCoordinator", (), {})()
+    mock_coordinator = MockCoordinator()
     mock_device = {"id": 1, "name": "Test Device"}
 
     # Test %RH unit conversion
@@ -403,7 +384,7 @@ def test_diagnostic_entity_categories():
     from custom_components.easylog_cloud.sensor import EasylogCloudSensor
 
     # Create a mock coordinator and device
-    mock_coordinator = type("MockCoordinator", (), {})()
+    mock_coordinator = MockCoordinator()
     mock_device = {"id": 1, "name": "Test Device"}
 
     # Test diagnostic sensors
@@ -456,7 +437,7 @@ async def test_sensor_with_coordinator_updates(hass):
         }
     ]
 
-    mock_coordinator = type("MockCoordinator", (), {"data": mock_data})()
+    mock_coordinator = MockCoordinator(mock_data)
 
     mock_device = mock_data[0]
     sensor = EasylogCloudSensor(
@@ -478,20 +459,16 @@ def test_sensor_native_value_timestamp_parsing():
     from custom_components.easylog_cloud.sensor import EasylogCloudSensor
 
     # Create a mock coordinator with timestamp data
-    mock_coordinator = type(
-        "MockCoordinator",
-        (),
-        {
-            "data": [
-                {
-                    "id": 1,
-                    "name": "Test Device",
-                    "model": "Test Model",
-                    "Last Updated": {"value": "2024-01-01T12:00:00", "unit": ""},
-                }
-            ]
-        },
-    )()
+    mock_coordinator = MockCoordinator(
+        [
+            {
+                "id": 1,
+                "name": "Test Device",
+                "model": "Test Model",
+                "Last Updated": {"value": "2024-01-01T12:00:00", "unit": ""},
+            }
+        ]
+    )
 
     mock_device = {"id": 1, "name": "Test Device"}
 
@@ -528,20 +505,16 @@ def test_sensor_native_value_numeric_sensor():
     from custom_components.easylog_cloud.sensor import EasylogCloudSensor
 
     # Create a mock coordinator with VOC data
-    mock_coordinator = type(
-        "MockCoordinator",
-        (),
-        {
-            "data": [
-                {
-                    "id": 1,
-                    "name": "Test Device",
-                    "model": "Test Model",
-                    "VOC": {"value": "150.5", "unit": "ppb"},
-                }
-            ]
-        },
-    )()
+    mock_coordinator = MockCoordinator(
+        [
+            {
+                "id": 1,
+                "name": "Test Device",
+                "model": "Test Model",
+                "VOC": {"value": "150.5", "unit": "ppb"},
+            }
+        ]
+    )
 
     mock_device = {"id": 1, "name": "Test Device"}
 
@@ -563,20 +536,16 @@ def test_sensor_native_value_exception_handling():
     from custom_components.easylog_cloud.sensor import EasylogCloudSensor
 
     # Create a mock coordinator with data that will cause exception
-    mock_coordinator = type(
-        "MockCoordinator",
-        (),
-        {
-            "data": [
-                {
-                    "id": 1,
-                    "name": "Test Device",
-                    "model": "Test Model",
-                    "Temperature": {"value": 25.5, "unit": "°C"},
-                }
-            ]
-        },
-    )()
+    mock_coordinator = MockCoordinator(
+        [
+            {
+                "id": 1,
+                "name": "Test Device",
+                "model": "Test Model",
+                "Temperature": {"value": 25.5, "unit": "°C"},
+            }
+        ]
+    )
 
     mock_device = {"id": 1, "name": "Test Device"}
 
@@ -604,20 +573,16 @@ def test_sensor_native_value_device_not_found():
     from custom_components.easylog_cloud.sensor import EasylogCloudSensor
 
     # Create a mock coordinator with different device ID
-    mock_coordinator = type(
-        "MockCoordinator",
-        (),
-        {
-            "data": [
-                {
-                    "id": 999,  # Different ID
-                    "name": "Other Device",
-                    "model": "Other Model",
-                    "Temperature": {"value": 25.5, "unit": "°C"},
-                }
-            ]
-        },
-    )()
+    mock_coordinator = MockCoordinator(
+        [
+            {
+                "id": 999,  # Different ID
+                "name": "Other Device",
+                "model": "Other Model",
+                "Temperature": {"value": 25.5, "unit": "°C"},
+            }
+        ]
+    )
 
     mock_device = {"id": 1, "name": "Test Device"}
 
@@ -635,20 +600,16 @@ def test_sensor_native_value_label_not_found():
     from custom_components.easylog_cloud.sensor import EasylogCloudSensor
 
     # Create a mock coordinator with device but missing the specific label
-    mock_coordinator = type(
-        "MockCoordinator",
-        (),
-        {
-            "data": [
-                {
-                    "id": 1,
-                    "name": "Test Device",
-                    "model": "Test Model",
-                    "Humidity": {"value": 60, "unit": "%"},  # Different label
-                }
-            ]
-        },
-    )()
+    mock_coordinator = MockCoordinator(
+        [
+            {
+                "id": 1,
+                "name": "Test Device",
+                "model": "Test Model",
+                "Humidity": {"value": 60, "unit": "%"},  # Different label
+            }
+        ]
+    )
 
     mock_device = {"id": 1, "name": "Test Device"}
 
@@ -666,19 +627,15 @@ def test_sensor_device_info_fallback():
     from custom_components.easylog_cloud.sensor import EasylogCloudSensor
 
     # Create a mock coordinator with different device ID
-    mock_coordinator = type(
-        "MockCoordinator",
-        (),
-        {
-            "data": [
-                {
-                    "id": 999,  # Different ID
-                    "name": "Other Device",
-                    "model": "Other Model",
-                }
-            ]
-        },
-    )()
+    mock_coordinator = MockCoordinator(
+        [
+            {
+                "id": 999,  # Different ID
+                "name": "Other Device",
+                "model": "Other Model",
+            }
+        ]
+    )
 
     mock_device = {"id": 1, "name": "Test Device"}
 
@@ -701,20 +658,16 @@ def test_sensor_native_value_exception_in_value_access():
     from custom_components.easylog_cloud.sensor import EasylogCloudSensor
 
     # Create a mock coordinator with data that will cause exception
-    mock_coordinator = type(
-        "MockCoordinator",
-        (),
-        {
-            "data": [
-                {
-                    "id": 1,
-                    "name": "Test Device",
-                    "model": "Test Model",
-                    "Temperature": {"value": 25.5, "unit": "°C"},
-                }
-            ]
-        },
-    )()
+    mock_coordinator = MockCoordinator(
+        [
+            {
+                "id": 1,
+                "name": "Test Device",
+                "model": "Test Model",
+                "Temperature": {"value": 25.5, "unit": "°C"},
+            }
+        ]
+    )
 
     mock_device = {"id": 1, "name": "Test Device"}
 
@@ -843,23 +796,19 @@ def test_sensor_native_value_timestamp_parsing_failure_specific():
     from custom_components.easylog_cloud.sensor import EasylogCloudSensor
 
     # Create a mock coordinator with device data
-    mock_coordinator = type(
-        "MockCoordinator",
-        (),
-        {
-            "data": [
-                {
-                    "id": 1,
-                    "name": "Test Device",
-                    "model": "EL-USB-TC",
-                    "Last Updated": {
-                        "value": "completely invalid timestamp",
-                        "unit": "",
-                    },
-                }
-            ]
-        },
-    )()
+    mock_coordinator = MockCoordinator(
+        [
+            {
+                "id": 1,
+                "name": "Test Device",
+                "model": "EL-USB-TC",
+                "Last Updated": {
+                    "value": "completely invalid timestamp",
+                    "unit": "",
+                },
+            }
+        ]
+    )
 
     # Create sensor for Last Updated with invalid timestamp
     sensor = EasylogCloudSensor(
@@ -882,20 +831,16 @@ def test_sensor_native_value_numeric_sensor_float_conversion_specific():
     from custom_components.easylog_cloud.sensor import EasylogCloudSensor
 
     # Create a mock coordinator with device data
-    mock_coordinator = type(
-        "MockCoordinator",
-        (),
-        {
-            "data": [
-                {
-                    "id": 1,
-                    "name": "Test Device",
-                    "model": "EL-USB-TC",
-                    "VOC": {"value": "42.7", "unit": "ppm"},
-                }
-            ]
-        },
-    )()
+    mock_coordinator = MockCoordinator(
+        [
+            {
+                "id": 1,
+                "name": "Test Device",
+                "model": "EL-USB-TC",
+                "VOC": {"value": "42.7", "unit": "ppm"},
+            }
+        ]
+    )
 
     # Create sensor for VOC (numeric sensor)
     sensor = EasylogCloudSensor(
@@ -917,20 +862,16 @@ def test_sensor_native_value_numeric_sensor_conversion_failure_specific():
     from custom_components.easylog_cloud.sensor import EasylogCloudSensor
 
     # Create a mock coordinator with device data
-    mock_coordinator = type(
-        "MockCoordinator",
-        (),
-        {
-            "data": [
-                {
-                    "id": 1,
-                    "name": "Test Device",
-                    "model": "EL-USB-TC",
-                    "PM2.5": {"value": "not a number at all", "unit": "µg/m³"},
-                }
-            ]
-        },
-    )()
+    mock_coordinator = MockCoordinator(
+        [
+            {
+                "id": 1,
+                "name": "Test Device",
+                "model": "EL-USB-TC",
+                "PM2.5": {"value": "not a number at all", "unit": "µg/m³"},
+            }
+        ]
+    )
 
     # Create sensor for PM2.5 (numeric sensor)
     sensor = EasylogCloudSensor(
@@ -954,20 +895,16 @@ def test_sensor_native_value_timestamp_parsing_failure_line_104():
     from custom_components.easylog_cloud.sensor import EasylogCloudSensor
 
     # Create a mock coordinator with device data
-    mock_coordinator = type(
-        "MockCoordinator",
-        (),
-        {
-            "data": [
-                {
-                    "id": 1,
-                    "name": "Test Device",
-                    "model": "EL-USB-TC",
-                    "Last Updated": {"value": "invalid timestamp format", "unit": ""},
-                }
-            ]
-        },
-    )()
+    mock_coordinator = MockCoordinator(
+        [
+            {
+                "id": 1,
+                "name": "Test Device",
+                "model": "EL-USB-TC",
+                "Last Updated": {"value": "invalid timestamp format", "unit": ""},
+            }
+        ]
+    )
 
     # Create sensor for Last Updated with invalid timestamp
     sensor = EasylogCloudSensor(
@@ -990,20 +927,16 @@ def test_sensor_native_value_numeric_sensor_float_conversion_lines_115_116():
     from custom_components.easylog_cloud.sensor import EasylogCloudSensor
 
     # Create a mock coordinator with device data
-    mock_coordinator = type(
-        "MockCoordinator",
-        (),
-        {
-            "data": [
-                {
-                    "id": 1,
-                    "name": "Test Device",
-                    "model": "EL-USB-TC",
-                    "PM2.5": {"value": "15.3", "unit": "µg/m³"},
-                }
-            ]
-        },
-    )()
+    mock_coordinator = MockCoordinator(
+        [
+            {
+                "id": 1,
+                "name": "Test Device",
+                "model": "EL-USB-TC",
+                "PM2.5": {"value": "15.3", "unit": "µg/m³"},
+            }
+        ]
+    )
 
     # Create sensor for PM2.5 (numeric sensor)
     sensor = EasylogCloudSensor(
@@ -1025,20 +958,16 @@ def test_sensor_native_value_numeric_sensor_conversion_failure_lines_115_116():
     from custom_components.easylog_cloud.sensor import EasylogCloudSensor
 
     # Create a mock coordinator with device data
-    mock_coordinator = type(
-        "MockCoordinator",
-        (),
-        {
-            "data": [
-                {
-                    "id": 1,
-                    "name": "Test Device",
-                    "model": "EL-USB-TC",
-                    "PM2.5": {"value": "definitely not a number", "unit": "µg/m³"},
-                }
-            ]
-        },
-    )()
+    mock_coordinator = MockCoordinator(
+        [
+            {
+                "id": 1,
+                "name": "Test Device",
+                "model": "EL-USB-TC",
+                "PM2.5": {"value": "definitely not a number", "unit": "µg/m³"},
+            }
+        ]
+    )
 
     # Create sensor for PM2.5 (numeric sensor)
     sensor = EasylogCloudSensor(
@@ -1053,3 +982,27 @@ def test_sensor_native_value_numeric_sensor_conversion_failure_lines_115_116():
 
     # Should return None when numeric conversion fails
     assert value is None
+
+
+async def test_sensor_follows_streamed_device_updates(hass):
+    """A sensor updates as soon as its device's status is streamed in."""
+    from custom_components.easylog_cloud.sensor import EasylogCloudSensor
+
+    coordinator = EasylogCloudCoordinator(hass, "test_user", "test_pass")
+    device = {"id": 1, "name": "Fridge", "model": "EL-WiFi-T"}
+    coordinator.data = [{**device, "Temperature": {"value": 4.5, "unit": "°C"}}]
+    sensor = EasylogCloudSensor(
+        coordinator, device, "Temperature", {"value": 4.5, "unit": "°C"}
+    )
+    sensor.hass = hass
+    sensor.entity_id = "sensor.fridge_temperature"
+    await sensor.async_added_to_hass()
+
+    coordinator.async_update_device(
+        {**device, "Temperature": {"value": 6.0, "unit": "°C"}}
+    )
+    assert hass.states.get("sensor.fridge_temperature").state == "6.0"
+
+    await sensor.async_remove()
+    assert coordinator._device_listeners == {}
+    await coordinator.async_shutdown()
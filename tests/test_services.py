@@ -0,0 +1,81 @@
+"""Test Home Assistant EasyLog Cloud services."""
+
+from unittest.mock import AsyncMock, MagicMock
+
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import device_registry as dr, entity_registry as er
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.easylog_cloud.const import DOMAIN, SERVICE_REFRESH_DEVICE
+from custom_components.easylog_cloud.ratelimit import (
+    PRIORITY_BACKGROUND,
+    PRIORITY_INTERACTIVE,
+    request_priority,
+)
+from custom_components.easylog_cloud.services import async_setup_services
+
+from .const import MOCK_CONFIG
+
+
+@pytest.fixture
+def coordinator(hass):
+    """Register the service for one loaded entry with a mocked coordinator."""
+    entry = MockConfigEntry(domain=DOMAIN, data=MOCK_CONFIG, entry_id="test")
+    entry.add_to_hass(hass)
+    coordinator = MagicMock()
+    coordinator.api_client.discovered_devices = [{"id": 9}]
+    coordinator.async_refresh_devices = AsyncMock()
+    hass.data[DOMAIN] = {entry.entry_id: coordinator}
+    async_setup_services(hass)
+    return coordinator
+
+
+async def test_refresh_device_resolves_devices_and_entities(hass, coordinator):
+    """Registry devices, EasyLog ids and entities are refreshed per entry."""
+    device = dr.async_get(hass).async_get_or_create(
+        config_entry_id="test", identifiers={(DOMAIN, 5)}
+    )
+    ent_reg = er.async_get(hass)
+    entity = ent_reg.async_get_or_create(
+        "sensor",
+        DOMAIN,
+        "7_temperature",
+        config_entry=hass.config_entries.async_get_entry("test"),
+    )
+    other = ent_reg.async_get_or_create("sensor", "other", "8_temperature")
+    lanes = []
+    coordinator.async_refresh_devices.side_effect = lambda ids: lanes.append(
+        request_priority.get()
+    )
+
+    token = request_priority.set(PRIORITY_BACKGROUND)
+    try:
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_REFRESH_DEVICE,
+            {
+                "device_id": [device.id, "9", "10", "not-a-device"],
+                "entity_id": [entity.entity_id, other.entity_id, "sensor.unknown"],
+            },
+            blocking=True,
+        )
+    finally:
+        request_priority.reset(token)
+
+    coordinator.async_refresh_devices.assert_awaited_once_with({5, 7, 9})
+    assert lanes == [PRIORITY_INTERACTIVE]
+
+
+async def test_refresh_device_errors(hass, coordinator):
+    """Unknown targets and failed refreshes are reported to the caller."""
+    with pytest.raises(HomeAssistantError, match="No EasyLog Cloud device"):
+        await hass.services.async_call(
+            DOMAIN, SERVICE_REFRESH_DEVICE, {"device_id": "10"}, blocking=True
+        )
+
+    coordinator.async_refresh_devices.side_effect = Exception("boom")
+    with pytest.raises(HomeAssistantError, match="boom"):
+        await hass.services.async_call(
+            DOMAIN, SERVICE_REFRESH_DEVICE, {"device_id": "9"}, blocking=True
+        )
@@ -5,6 +5,7 @@ from pytest_homeassistant_custom_component.common import MockConfigEntry
 from custom_components.easylog_cloud.const import (
     DOMAIN,
 )
+from custom_components.easylog_cloud.coordinator import EasylogCloudCoordinator
 
 from .const import MOCK_CONFIG
 
@@ -26,14 +27,15 @@ async def test_switch_services(hass):
 
     # Set up the entry with mocked data
     hass.data.setdefault(DOMAIN, {})
-    hass.data[DOMAIN][config_entry.entry_id] = type(
-        "MockCoordinator", (), {"data": mock_data}
-    )()
+    coordinator = EasylogCloudCoordinator(hass, "test_user", "test_pass")
+    coordinator.data = mock_data
+    hass.data[DOMAIN][config_entry.entry_id] = coordinator
 
     # Test that the switch setup works
     from custom_components.easylog_cloud.switch import async_setup_entry
 
     await async_setup_entry(hass, config_entry, lambda entities: None)
+    await coordinator.async_shutdown()
 
 
 async def test_switch_turn_on_off(hass):
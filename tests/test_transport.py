@@ -0,0 +1,150 @@
+"""Test the offline transports of the EasyLog Cloud API client."""
+
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+import aiohttp
+import pytest
+
+from custom_components.easylog_cloud.api import HAEasylogCloudApiClient
+from custom_components.easylog_cloud.transport import (
+    REDACTED,
+    FakeTransport,
+    RecordingTransport,
+    ReplayTransport,
+    TransportResponse,
+    _Transport,
+)
+
+BASE = "https://www.easylogcloud.com/"
+STATUS_URL = BASE + "devicedata.asmx/currentStatus?index=1&sensorId=1"
+LOGIN_PAGE = (
+    '<input name="__VIEWSTATE" value="vs" />'
+    '<input name="__VIEWSTATEGENERATOR" value="gen" />'
+)
+DEVICE_FIELDS = ["1", "'x'", "'EL-IOT-CO2'", "'x'", "'Office'"] + ["'x'"] * 30
+DEVICES_PAGE = (
+    "<span id='username'>Acme</span><script>var devicesArr = [new Device("
+    + ", ".join(DEVICE_FIELDS)
+    + ", [new Channel('CO2', '400', 'ppm')])];</script>"
+)
+STATUS = {
+    "d": {
+        "sensorName": "Office",
+        "channels": {"channelDetails": {"channelLabel": "CO2", "reading": "415"}},
+    }
+}
+
+
+def _easylog(method, url, **kwargs):
+    """Answer like easylogcloud.com for an account with one device."""
+    if url == BASE:
+        if method == "POST":
+            return TransportResponse(
+                body="Devices",
+                headers={"Set-Cookie": ".ASPXAUTH=ticket; path=/; HttpOnly"},
+                cookies={".ASPXAUTH": "ticket"},
+            )
+        return TransportResponse(body=LOGIN_PAGE)
+    if url.endswith("devices.aspx"):
+        return TransportResponse(body=DEVICES_PAGE)
+    return TransportResponse(
+        body=json.dumps(STATUS), headers={"Content-Type": "application/json"}
+    )
+
+
+async def test_client_runs_against_fake_transport(hass):
+    """The client can sign in, discover and poll without any network."""
+    transport = FakeTransport(_easylog, latency=lambda method, url: 0.01)
+    api = HAEasylogCloudApiClient(hass, "test_user", "test_pass", transport)
+
+    devices = await api.async_get_devices_data()
+
+    assert api.last_error is None
+    assert api.account_name == "Acme"
+    assert devices[0]["name"] == "Office"
+    assert devices[0]["CO2"] == {"value": 415, "unit": ""}
+    assert transport.requests == [
+        ("GET", BASE),
+        ("POST", BASE),
+        ("GET", BASE + "devices.aspx"),
+        ("GET", STATUS_URL),
+    ]
+
+
+def _live_session():
+    """A session whose requests answer like easylogcloud.com."""
+    session = MagicMock()
+
+    def _request(method, url, **kwargs):
+        answer = _easylog(method, url)
+        resp = MagicMock(status=answer.status, headers=answer.headers)
+        resp.text = AsyncMock(return_value=answer.body)
+        resp.cookies = {
+            name: MagicMock(value=value) for name, value in answer.cookies.items()
+        }
+        context = MagicMock()
+        context.__aenter__ = AsyncMock(return_value=resp)
+        context.__aexit__ = AsyncMock(return_value=None)
+        return context
+
+    session.request = _request
+    return session
+
+
+async def test_record_and_replay(hass, tmp_path):
+    """Recorded responses replay in order and repeat the last one."""
+    recorder = RecordingTransport(_live_session())
+    api = HAEasylogCloudApiClient(hass, "test_user", "test_pass", recorder)
+    recorded = await api.async_get_devices_data()
+    assert len(recorder.interactions) == 4
+    assert "test_pass" not in json.dumps(recorder.interactions)
+    # The login cookie is not written to the cassette, by default
+    assert "ticket" not in json.dumps(recorder.interactions)
+    login = recorder.interactions[1]
+    assert login["cookies"] == {".ASPXAUTH": REDACTED}
+    assert login["headers"]["Set-Cookie"] == REDACTED
+
+    cassette = tmp_path / "cassette.json"
+    recorder.save(cassette)
+    replay = ReplayTransport.from_file(cassette)
+    api = HAEasylogCloudApiClient(hass, "test_user", "test_pass", replay)
+    assert await api.async_get_devices_data() == recorded
+
+    async with replay.get(STATUS_URL) as resp:
+        assert await resp.json() == STATUS
+    with pytest.raises(aiohttp.ClientError, match="No recorded response"):
+        await replay.get(BASE + "unknown")
+
+
+async def test_recording_keeps_cookies_on_request(hass):
+    """Cookies are only recorded as they are when asked for."""
+    recorder = RecordingTransport(_live_session(), redact_cookies=False)
+    api = HAEasylogCloudApiClient(hass, "test_user", "test_pass", recorder)
+    await api.async_get_devices_data()
+    assert recorder.interactions[1]["cookies"] == {".ASPXAUTH": "ticket"}
+
+
+async def test_transport_response_mimics_aiohttp():
+    """Non-JSON bodies refuse to decode as JSON, as with aiohttp."""
+    response = TransportResponse(body="<string/>", headers={"Content-Type": "text/xml"})
+    with pytest.raises(ValueError):
+        await response.json()
+    async with response as entered:
+        assert await entered.text() == "<string/>"
+
+
+async def test_transport_subclasses_answer_requests():
+    """Subclasses only answer _async_request, and must do so to be created."""
+
+    class _Incomplete(_Transport):
+        pass
+
+    with pytest.raises(TypeError):
+        _Incomplete()
+
+    class _NoContent(_Transport):
+        async def _async_request(self, method, url, **kwargs):
+            return TransportResponse(204)
+
+    assert (await _NoContent().head(BASE)).status == 204